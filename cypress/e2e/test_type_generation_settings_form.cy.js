@@ -64,7 +64,8 @@ context("Type Generation Settings", () => {
 		).as("generate_all");
 		cy.findByRole("button", { name: /generate all/i }).click();
 		cy.wait("@generate_all");
-		cy.findByText(/success/i);
+		// The result is shown once the queued export has finished
+		cy.findByText(/generated types for \d+ doctypes/i, { timeout: 60000 });
 	});
 });
 
@@ -2,15 +2,25 @@ import click
 import frappe
 from frappe.commands import pass_context
 
-from frappe_types.frappe_types.type_generator import (
-	generate_types_for_doctype,
-	generate_types_for_module,
-)
+# Bench imports the commands of every installed app on each invocation, so the
+# type generator (and the DocType controllers it pulls in) is only imported
+# inside the commands themselves. See frappe_types/tests/test_commands.py.
 
 
 @click.command("generate-types-for-doctype")
 @click.option("--app", prompt="App Name")
-@click.option("--doctype", prompt="Doctype Name")
+@click.option(
+	"--doctype",
+	"doctypes",
+	multiple=True,
+	help="DocType name, glob pattern (e.g. 'Sales *') or regular expression prefixed with 're:'. "
+	"Can be given several times",
+)
+@click.option(
+	"--doctype_file",
+	type=click.Path(exists=True, dir_okay=False),
+	help="File with one DocType name or pattern per line",
+)
 @click.option(
 	"--generate_child_tables",
 	default=False,
@@ -25,18 +35,60 @@ from frappe_types.frappe_types.type_generator import (
 	prompt="Do you want to generate types for custom fields too if exists?",
 	help="It will generate Types for custom fields includes in the doctype",
 )
+@click.option(
+	"--link_depth",
+	default=0,
+	type=click.IntRange(min=0),
+	help="Also generate the DocTypes of configured apps their Link and Table fields point to, "
+	"up to this many links away",
+)
+@click.option("--quiet", default=False, is_flag=True, help="Only print warnings and the summary of failures")
+@click.option("--verbose", default=False, is_flag=True, help="Also print a message for every DocType")
 @pass_context
-def generate_types_file_from_doctype(context, app, doctype, generate_child_tables, custom_fields):
-	"""Generate types file from doctype"""
+def generate_types_file_from_doctype(
+	context, app, doctypes, doctype_file, generate_child_tables, custom_fields, link_depth, quiet, verbose
+):
+	"""Generate types files from one or more doctypes"""
 	if not app:
 		click.echo("Please provide an app with --app")
 		return
-	print(f"Generating types file for {doctype} in {app}")
+
+	import re
+	from pathlib import Path
+
+	from frappe_types.frappe_types.metrics import record_run
+	from frappe_types.frappe_types.reporting import configure_logging, get_logger
+	from frappe_types.frappe_types.selection import read_selectors, resolve_doctypes
+	from frappe_types.frappe_types.type_generator import TypeGenerator
+
+	selectors = list(doctypes)
+	if doctype_file:
+		selectors.extend(read_selectors(Path(doctype_file)))
+	if not selectors:
+		selectors.append(click.prompt("Doctype Name"))
+
+	configure_logging(quiet=quiet, verbose=verbose)
+	logger = get_logger()
+	logger.info("Generating types files for %s in %s", ", ".join(selectors), app)
 
 	for site in context.sites:
 		frappe.connect(site=site)
 		try:
-			generate_types_for_doctype(doctype, app, generate_child_tables, custom_fields)
+			try:
+				names, unmatched = resolve_doctypes(selectors)
+			except re.error as e:
+				raise click.BadParameter(f"invalid regular expression: {e}", param_hint="--doctype") from e
+			for selector in unmatched:
+				logger.warning("No DocType matches %s", selector)
+
+			generator = TypeGenerator(
+				app,
+				generate_child_tables=generate_child_tables,
+				custom_fields=custom_fields,
+			)
+			generator.generate_many(names, link_depth=link_depth)
+			generator.report.summary()
+			record_run("doctype", generator.report)
 		finally:
 			frappe.destroy()
 	if not context.sites:
@@ -53,22 +105,167 @@ def generate_types_file_from_doctype(context, app, doctype, generate_child_table
 	prompt="Do you want to generate types for child tables too?",
 	help="It will generate Types for child tables includes in the doctype",
 )
+@click.option(
+	"--custom_fields",
+	default=False,
+	is_flag=True,
+	help="It will generate Types for custom fields and property setters of the module's doctypes",
+)
+@click.option(
+	"--prune",
+	default=False,
+	is_flag=True,
+	help="Delete previously generated files of deleted or renamed doctypes, and empty module folders",
+)
+@click.option("--quiet", default=False, is_flag=True, help="Only print warnings and the summary of failures")
+@click.option("--verbose", default=False, is_flag=True, help="Also print a message for every DocType")
 @pass_context
-def generate_types_file_from_module(context, app, module, generate_child_tables):
+def generate_types_file_from_module(
+	context, app, module, generate_child_tables, custom_fields, prune, quiet, verbose
+):
 	"""Generate types file from module"""
 	if not app:
 		click.echo("Please provide an app with --app")
 		return
-	print(f"Generating types file for {module} in {app}")
+
+	from frappe_types.frappe_types.reporting import configure_logging, get_logger
+	from frappe_types.frappe_types.type_generator import generate_types_for_module
+
+	configure_logging(quiet=quiet, verbose=verbose)
+	get_logger().info("Generating types file for %s in %s", module, app)
+
+	for site in context.sites:
+		frappe.connect(site=site)
+		try:
+			generate_types_for_module(module, app, generate_child_tables, custom_fields, prune)
+		finally:
+			frappe.destroy()
+	if not context.sites:
+		raise frappe.SiteNotSpecifiedError
+
+
+@click.command("generate-types-for-all-apps")
+@click.option(
+	"--generate_child_tables",
+	default=False,
+	is_flag=True,
+	help="It will generate Types for child tables includes in the doctypes",
+)
+@click.option(
+	"--custom_fields",
+	default=False,
+	is_flag=True,
+	help="It will generate Types for custom fields and property setters of the doctypes",
+)
+@click.option(
+	"--prune",
+	default=False,
+	is_flag=True,
+	help="Delete previously generated files of deleted or renamed doctypes, and empty module folders",
+)
+@click.option(
+	"--resume",
+	default=False,
+	is_flag=True,
+	help="Continue the last export from its checkpoints, retrying the doctypes that failed first",
+)
+@click.option("--quiet", default=False, is_flag=True, help="Only print warnings and the summary of failures")
+@click.option("--verbose", default=False, is_flag=True, help="Also print a message for every DocType")
+@pass_context
+def generate_types_file_for_all_apps(
+	context, generate_child_tables, custom_fields, prune, resume, quiet, verbose
+):
+	"""Generate types files for all apps in Type Generation Settings"""
+	from frappe_types.frappe_types.export_job import get_export_status, run_export_all_apps_now
+	from frappe_types.frappe_types.reporting import configure_logging, get_logger
+
+	configure_logging(quiet=quiet, verbose=verbose)
+	get_logger().info("Generating types files for all apps")
 
 	for site in context.sites:
 		frappe.connect(site=site)
 		try:
-			generate_types_for_module(module, app, generate_child_tables)
+			# Run in the foreground, unlike the "Generate All" button: without a worker, the
+			# queued job would run in a thread that dies with this command, holding the lock.
+			# The lock is still taken, so that only one export runs at a time per bench
+			report = run_export_all_apps_now(
+				resume=resume,
+				generate_child_tables=generate_child_tables,
+				custom_fields=custom_fields,
+				prune=prune,
+				base_output_path="",
+			)
+			if report is None:
+				state = ((get_export_status() or {}).get("state") or "running").lower()
+				raise click.ClickException(
+					f"An export of all apps is already {state}, try again once it has finished"
+				)
 		finally:
 			frappe.destroy()
 	if not context.sites:
 		raise frappe.SiteNotSpecifiedError
 
 
-commands = [generate_types_file_from_doctype, generate_types_file_from_module]
+@click.command("export-type-schema")
+@click.option(
+	"--output",
+	default="frappe-types-schema.jsonl.gz",
+	help="File the schema snapshot is written to",
+)
+@pass_context
+def export_type_schema(context, output):
+	"""Export the schema of the apps in Type Generation Settings, with the site's customizations,
+	so that types can be generated without a connection to the site"""
+	from pathlib import Path
+
+	from frappe_types.frappe_types.snapshot import export_schema
+
+	if not context.sites:
+		raise frappe.SiteNotSpecifiedError
+
+	site = context.sites[0]
+	frappe.connect(site=site)
+	try:
+		count = export_schema(Path(output).absolute())
+	finally:
+		frappe.destroy()
+	click.echo(f"Exported the schema of {count} DocTypes from {site} to {output}")
+
+
+@click.command("generate-types-from-schema")
+@click.argument("schema_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+	"--base_output_path",
+	default=None,
+	help="Base path the app folders are resolved against, instead of the bench's apps folder",
+)
+@click.option("--quiet", default=False, is_flag=True, help="Only print warnings and the summary of failures")
+@click.option("--verbose", default=False, is_flag=True, help="Also print a message for every DocType")
+def generate_types_from_schema(schema_file, base_output_path, quiet, verbose):
+	"""Generate types files from a schema snapshot exported by export-type-schema, without a site"""
+	from pathlib import Path
+
+	from frappe_types.frappe_types.metrics import record_run
+	from frappe_types.frappe_types.reporting import configure_logging, get_logger
+	from frappe_types.frappe_types.snapshot import generate_from_snapshot
+
+	configure_logging(quiet=quiet, verbose=verbose)
+	get_logger().info("Generating types files from %s", schema_file)
+
+	# Only the bench configuration is loaded, there is no site to connect to
+	frappe.init(site="")
+	try:
+		report = generate_from_snapshot(Path(schema_file), base_output_path=base_output_path)
+		report.summary()
+		record_run("snapshot", report)
+	finally:
+		frappe.destroy()
+
+
+commands = [
+	generate_types_file_from_doctype,
+	generate_types_file_from_module,
+	generate_types_file_for_all_apps,
+	export_type_schema,
+	generate_types_from_schema,
+]
@@ -0,0 +1,222 @@
+"""TypeScript signatures of the whitelisted methods of an app, found with `ast`.
+
+The app's Python files are parsed, never imported. Results are cached per
+file, keyed by its size and mtime, then by a hash of its content, so a rescan
+of an unchanged app only costs a ``stat`` per file.
+"""
+
+import ast
+import hashlib
+import json
+import os
+from pathlib import Path
+
+CACHE_VERSION = 1
+
+# Folders of an app that never hold whitelisted methods called by frontends
+SKIPPED_DIRS = {"__pycache__", "node_modules", "public", "templates", "tests", "patches"}
+
+BASIC_TYPES = {
+	"str": "string",
+	"int": "number",
+	"float": "number",
+	"bool": "boolean",
+	"bytes": "string",
+	"None": "null",
+	"dict": "Record<string, any>",
+	"_dict": "Record<string, any>",
+	"list": "any[]",
+	"tuple": "any[]",
+	"set": "any[]",
+	"Any": "any",
+	"object": "any",
+}
+ARRAY_TYPES = {"list", "List", "tuple", "Tuple", "set", "Set", "Sequence", "Iterable"}
+RECORD_TYPES = {"dict", "Dict", "Mapping"}
+
+
+class WhitelistScanner:
+	"""Find the whitelisted functions of the app at *app_path*.
+
+	Parameters
+	----------
+	app_name: str
+	    Name of the app, the first part of the dotted path of its methods.
+	app_path: Path
+	    The app's Python package, e.g. ``apps/frappe_types/frappe_types``.
+	cache_path: Path
+	    JSON file holding the methods found in each file by earlier scans.
+	"""
+
+	def __init__(self, app_name: str, app_path: Path, cache_path: Path) -> None:
+		self.app_name = app_name
+		self.app_path = app_path
+		self.cache_path = cache_path
+		self.cache: dict[str, dict] = self._load_cache()
+		# Number of files parsed by the last scan, the others came from the cache
+		self.parsed = 0
+
+	def scan(self) -> list[dict]:
+		"""Return the whitelisted methods of the app, sorted by dotted path."""
+		self.parsed = 0
+		cache: dict[str, dict] = {}
+		for path in self._iter_python_files():
+			key = path.relative_to(self.app_path).as_posix()
+			cache[key] = self._scan_file(path, self.cache.get(key))
+
+		# Files deleted since the last scan are dropped along with their methods
+		self.cache = cache
+		methods = [method for entry in cache.values() for method in entry["methods"]]
+		return sorted(methods, key=lambda method: method["method"])
+
+	def save(self):
+		self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+		content = {"version": CACHE_VERSION, "files": self.cache}
+		tmp_path = self.cache_path.with_suffix(".tmp")
+		tmp_path.write_text(json.dumps(content, sort_keys=True))
+		os.replace(tmp_path, self.cache_path)
+
+	def _scan_file(self, path: Path, cached: dict | None) -> dict:
+		stat = path.stat()
+		if cached and cached["mtime"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+			return cached
+
+		source = path.read_bytes()
+		digest = hashlib.sha256(source).hexdigest()
+		if cached and cached["hash"] == digest:
+			return {**cached, "mtime": stat.st_mtime_ns, "size": stat.st_size}
+
+		self.parsed += 1
+		try:
+			tree = ast.parse(source, filename=str(path))
+		except (SyntaxError, ValueError):
+			methods = []
+		else:
+			methods = find_whitelisted_methods(tree, self._get_module_path(path))
+		return {"mtime": stat.st_mtime_ns, "size": stat.st_size, "hash": digest, "methods": methods}
+
+	def _iter_python_files(self):
+		for root, dirs, files in os.walk(self.app_path):
+			dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIRS and not d.startswith("."))
+			for name in sorted(files):
+				if name.endswith(".py"):
+					yield Path(root) / name
+
+	def _get_module_path(self, path: Path) -> str:
+		parts = path.relative_to(self.app_path).with_suffix("").parts
+		if parts[-1] == "__init__":
+			parts = parts[:-1]
+		return ".".join((self.app_name, *parts))
+
+	def _load_cache(self) -> dict[str, dict]:
+		try:
+			content = json.loads(self.cache_path.read_text())
+		except (OSError, ValueError):
+			return {}
+		if content.get("version") != CACHE_VERSION:
+			return {}
+		return content.get("files", {})
+
+
+def find_whitelisted_methods(tree: ast.Module, module_path: str) -> list[dict]:
+	"""Return the module-level functions of *tree* decorated with ``frappe.whitelist``."""
+	methods = []
+	for node in tree.body:
+		if not isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+			continue
+		if not any(_is_whitelist_decorator(decorator) for decorator in node.decorator_list):
+			continue
+
+		methods.append(
+			{
+				"method": f"{module_path}.{node.name}",
+				"args": _get_arguments(node.args),
+				"returns": annotation_to_ts(node.returns),
+			}
+		)
+	return methods
+
+
+def annotation_to_ts(node: ast.expr | None) -> str:
+	"""Return the TypeScript type of a Python annotation, ``any`` when unknown."""
+	if node is None:
+		return "any"
+
+	if isinstance(node, ast.Constant):
+		if node.value is None:
+			return "null"
+		if isinstance(node.value, str):
+			# Forward reference, e.g. "list[str]"
+			try:
+				return annotation_to_ts(ast.parse(node.value, mode="eval").body)
+			except SyntaxError:
+				return "any"
+		return "any"
+
+	if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+		return _union([annotation_to_ts(node.left), annotation_to_ts(node.right)])
+
+	if isinstance(node, ast.Subscript):
+		name = _get_name(node.value)
+		args = node.slice.elts if isinstance(node.slice, ast.Tuple) else [node.slice]
+		if name == "Optional":
+			return _union([annotation_to_ts(args[0]), "null"])
+		if name == "Union":
+			return _union([annotation_to_ts(arg) for arg in args])
+		if name == "Literal":
+			return _union([json.dumps(arg.value) for arg in args if isinstance(arg, ast.Constant)])
+		if name in ARRAY_TYPES:
+			item_type = annotation_to_ts(args[0]) if len(args) == 1 else "any"
+			return f"({item_type})[]" if " | " in item_type else f"{item_type}[]"
+		if name in RECORD_TYPES and len(args) == 2:
+			return f"Record<string, {annotation_to_ts(args[1])}>"
+		return BASIC_TYPES.get(name, "any")
+
+	return BASIC_TYPES.get(_get_name(node), "any")
+
+
+def render_api_types(methods: list[dict]) -> str:
+	"""Render the `WhitelistedMethods` interface mapping dotted paths to signatures."""
+	lines = ["declare global {\n  interface WhitelistedMethods {"]
+	for method in methods:
+		args = "; ".join(
+			f"{name}{'?' if optional else ''}: {ts_type}" for name, ts_type, optional in method["args"]
+		)
+		args = f"{{ {args} }}" if args else "{}"
+		lines.append(f'    "{method["method"]}": {{ args: {args}; returns: {method["returns"]} }};')
+	lines.append("  }\n}\n")
+	lines.append("export {};\n")
+	return "\n".join(lines)
+
+
+def _is_whitelist_decorator(node: ast.expr) -> bool:
+	if isinstance(node, ast.Call):
+		node = node.func
+	return _get_name(node) == "whitelist"
+
+
+def _get_arguments(args: ast.arguments) -> list[list]:
+	"""Return ``[name, ts_type, optional]`` for every argument a client can pass."""
+	positional = [*args.posonlyargs, *args.args]
+	first_default = len(positional) - len(args.defaults)
+	arguments = [
+		[arg.arg, annotation_to_ts(arg.annotation), i >= first_default] for i, arg in enumerate(positional)
+	]
+	arguments.extend(
+		[arg.arg, annotation_to_ts(arg.annotation), default is not None]
+		for arg, default in zip(args.kwonlyargs, args.kw_defaults, strict=True)
+	)
+	return arguments
+
+
+def _get_name(node: ast.expr) -> str | None:
+	if isinstance(node, ast.Name):
+		return node.id
+	if isinstance(node, ast.Attribute):
+		return node.attr
+	return None
+
+
+def _union(types: list[str]) -> str:
+	unique = list(dict.fromkeys(part for ts_type in types for part in ts_type.split(" | ")))
+	return "any" if "any" in unique else " | ".join(unique)
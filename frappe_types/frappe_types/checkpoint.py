@@ -0,0 +1,77 @@
+"""Checkpoints of an export of all apps, so that an interrupted export can resume.
+
+Progress is appended to a JSON lines log after every generated DocType and
+completed module: appending keeps each checkpoint cheap on large benches, and
+a line cut short by a crash is simply ignored when the log is read back.
+"""
+
+import json
+from pathlib import Path
+
+
+class AppCheckpoint:
+	def __init__(self) -> None:
+		# Modules whose DocTypes were all processed
+		self.modules: set[str] = set()
+		# DocTypeMap entries of the generated DocTypes, by DocType name
+		self.entries: dict[str, tuple[str, str, str]] = {}
+		self.failed: set[str] = set()
+
+
+class ExportCheckpoint:
+	def __init__(self, path: Path) -> None:
+		self.path = path
+		self.apps: dict[str, AppCheckpoint] = {}
+
+	def load(self) -> bool:
+		"""Read the checkpoints of the last export. Returns whether there were any."""
+		self.apps = {}
+		if not self.path.exists():
+			return False
+
+		content = self.path.read_text()
+		if not content.endswith("\n"):
+			# Drop the line cut short by a crash, so that new checkpoints start on a line of their own
+			content = content[: content.rfind("\n") + 1]
+			self.path.write_text(content)
+
+		for line in content.splitlines():
+			try:
+				event = json.loads(line)
+			except ValueError:
+				continue
+			self._apply(event)
+		return bool(self.apps)
+
+	def reset(self):
+		self.apps = {}
+		self.path.unlink(missing_ok=True)
+
+	def get_app(self, app_name: str) -> AppCheckpoint:
+		return self.apps.setdefault(app_name, AppCheckpoint())
+
+	def add_doctype(self, app_name: str, entry: tuple[str, str, str]):
+		self._append({"app": app_name, "doctype": list(entry)})
+
+	def add_failure(self, app_name: str, doctype: str):
+		self._append({"app": app_name, "failed": doctype})
+
+	def add_module(self, app_name: str, module: str):
+		self._append({"app": app_name, "module": module})
+
+	def _append(self, event: dict):
+		self._apply(event)
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		with self.path.open("a") as f:
+			f.write(json.dumps(event) + "\n")
+
+	def _apply(self, event: dict):
+		app = self.get_app(event["app"])
+		if "doctype" in event:
+			entry = tuple(event["doctype"])
+			app.entries[entry[0]] = entry
+			app.failed.discard(entry[0])
+		elif "failed" in event:
+			app.failed.add(event["failed"])
+		elif "module" in event:
+			app.modules.add(event["module"])
@@ -12,6 +12,7 @@ frappe.ui.form.on("Type Generation Settings", {
 		update_app_path_visibility(frm);
 
 		create_generate_all_button(frm);
+		show_running_export(frm);
 	},
 	export_to_root: function (frm) {
 		update_app_path_visibility(frm);
@@ -53,18 +54,65 @@ const filter_apps_dropdown = async (frm, cdt, cdn) => {
 };
 
 const create_generate_all_button = (frm) => {
-	frm.add_custom_button(__("Generate All"), function () {
-		frappe.call({
+	frm.add_custom_button(__("Generate All"), async function () {
+		const { message: status } = await frappe.call({
 			method: "frappe_types.frappe_types.type_generator.export_all_apps",
-			callback: function (r) {
-				if (r.message) {
-					frappe.show_alert({
-						title: __("Success"),
-						message: r.message,
-						indicator: "green",
-					});
-				}
-			},
 		});
+		if (status) {
+			poll_export_status(frm, status.job_id);
+		}
 	});
 };
+
+const show_running_export = async (frm) => {
+	const { message: status } = await frappe.call({
+		method: "frappe_types.frappe_types.type_generator.get_export_status",
+	});
+	if (status && (status.state === "Queued" || status.state === "Running")) {
+		poll_export_status(frm, status.job_id);
+	}
+};
+
+// Seconds between two requests for the status of a running export
+const EXPORT_POLL_INTERVAL = 2;
+
+const poll_export_status = async (frm, job_id) => {
+	const { message: status } = await frappe.call({
+		method: "frappe_types.frappe_types.type_generator.get_export_status",
+	});
+	if (!status || status.job_id !== job_id) {
+		frm.dashboard.hide_progress();
+		return;
+	}
+
+	if (status.state === "Queued" || status.state === "Running") {
+		const percent = status.total ? (status.done / status.total) * 100 : 0;
+		const message = status.current_app
+			? __("{0} of {1} DocTypes, generating {2}", [
+					status.done,
+					status.total,
+					status.current_app,
+			  ])
+			: __("{0} of {1} DocTypes", [status.done, status.total]);
+		frm.dashboard.show_progress(__("Generating Types"), percent, message);
+		setTimeout(() => poll_export_status(frm, job_id), EXPORT_POLL_INTERVAL * 1000);
+		return;
+	}
+
+	frm.dashboard.hide_progress();
+	if (status.state === "Finished") {
+		frappe.show_alert({
+			message: __("Generated types for {0} DocTypes in {1}s", [status.done, status.elapsed]),
+			indicator: "green",
+		});
+	} else {
+		const failures = status.failures
+			.map((f) => `<li>${frappe.utils.escape_html(f.name)}: ${frappe.utils.escape_html(f.error)}</li>`)
+			.join("");
+		frappe.msgprint({
+			title: __("Type generation failed"),
+			message: `<ul>${failures}</ul>`,
+			indicator: "red",
+		});
+	}
+};
@@ -1,9 +1,11 @@
 # Copyright (c) 2022, Nikhil Kothari and contributors
 # For license information, please see license.txt
 
-# import frappe
 from frappe.model.document import Document
 
+from frappe_types.frappe_types.hook_guards import clear_configured_apps_cache
+
 
 class TypeGenerationSettings(Document):
-	pass
+	def on_update(self):
+		clear_configured_apps_cache()
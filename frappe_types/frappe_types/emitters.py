@@ -0,0 +1,180 @@
+"""Declaration files of other languages, rendered alongside the TypeScript ones.
+
+The generator loads each DocType once, resolves its child tables and renders
+its TypeScript interface; every emitter enabled for the app (see the options
+of its row in Type Generation Settings) then renders the same schema record
+into a file next to the `.d.ts` one. An additional language only costs its
+rendering time, never another database read.
+"""
+
+import keyword
+import re
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+# Same field types as the TypeScript interfaces leave out
+IGNORED_FIELD_TYPES = {
+	"Section Break",
+	"Column Break",
+	"HTML",
+	"Button",
+	"Fold",
+	"Heading",
+	"Tab Break",
+	"Break",
+}
+
+# Python types of the other field types, `Any` for the unknown ones
+PYTHON_TYPES = {
+	"Check": "Literal[0, 1]",
+	"Int": "int",
+	"Float": "float",
+	"Currency": "float",
+	"Percent": "float",
+}
+# Field types declared as `string` in the TypeScript interfaces
+PYTHON_STRING_TYPES = {
+	"Data",
+	"Small Text",
+	"Text Editor",
+	"Text",
+	"Code",
+	"Link",
+	"Dynamic Link",
+	"Read Only",
+	"Password",
+	"Attach Image",
+	"Attach",
+	"HTML Editor",
+	"Image",
+	"Duration",
+	"Date",
+	"Datetime",
+	"Time",
+	"Phone",
+	"Color",
+	"Long Text",
+	"Markdown Editor",
+}
+
+TS_IMPORT_PATTERN = re.compile(r"import \{ (\w+) \} from '(.+)'")
+
+
+class Emitter(ABC):
+	"""Renders the declarations of DocTypes in one language.
+
+	``render`` returns the import lines and declaration block of a DocType,
+	``join`` assembles them into a file, so that bundles are rendered like
+	single DocTypes.
+	"""
+
+	# Option of App Type Generation Paths that enables the emitter
+	option: str
+	# Replaces the `.d.ts` suffix of the TypeScript file
+	suffix: str
+
+	def get_path(self, ts_path: Path) -> Path:
+		"""Return the file rendered next to the TypeScript declaration file *ts_path*."""
+		return ts_path.with_name(ts_path.name.removesuffix(".d.ts") + self.suffix)
+
+	@abstractmethod
+	def render(
+		self, schema: dict, table_fields: dict[str, tuple[str, str | None]], directory: Path
+	) -> tuple[list[str], str]:
+		"""Return the import lines and declaration block of the DocType *schema*, whose
+		child table fields resolve to *table_fields*, rendered into *directory*."""
+
+	@abstractmethod
+	def join(self, import_lines: list[str], blocks: list[str]) -> str:
+		"""Return the content of a file declaring *blocks*."""
+
+
+class PythonStubEmitter(Emitter):
+	"""`TypedDict` stubs (``.pyi``), e.g. for the `as_dict()` of documents."""
+
+	option = "python_types"
+	suffix = ".pyi"
+
+	header = "from typing import Any, Literal, TypedDict\n\nfrom typing_extensions import NotRequired\n"
+
+	def get_path(self, ts_path: Path) -> Path:
+		# Module bundles (`<Module>/index.d.ts`) are the packages of their folder
+		if ts_path.name == "index.d.ts":
+			return ts_path.with_name("__init__.pyi")
+		return super().get_path(ts_path)
+
+	def render(
+		self, schema: dict, table_fields: dict[str, tuple[str, str | None]], directory: Path
+	) -> tuple[list[str], str]:
+		import_lines: set[str] = set()
+		fields = [("name", "int" if schema.get("naming_rule") == "Autoincrement" else "str")]
+		for field in schema["fields"]:
+			if field.fieldtype in IGNORED_FIELD_TYPES:
+				continue
+
+			if field.fieldname in table_fields:
+				field_type, import_line = self._get_table_type(*table_fields[field.fieldname], directory)
+				if import_line:
+					import_lines.add(import_line)
+			else:
+				field_type = self._get_field_type(field)
+			fields.append((field.fieldname, field_type if field.reqd else f"NotRequired[{field_type}]"))
+
+		class_name = schema["name"].replace(" ", "")
+		if all(name.isidentifier() and not keyword.iskeyword(name) for name, _ in fields):
+			lines = [f"class {class_name}(TypedDict):"]
+			lines.extend(f"    {name}: {field_type}" for name, field_type in fields)
+		else:
+			# Keywords (e.g. a field named `from`) are only valid keys in the functional syntax
+			lines = [f'{class_name} = TypedDict("{class_name}", {{']
+			lines.extend(f'    "{name}": {field_type},' for name, field_type in fields)
+			lines.append("})")
+		return sorted(import_lines), "\n".join(lines)
+
+	def join(self, import_lines: list[str], blocks: list[str]) -> str:
+		# Child tables are imported after the typing modules, in a block of their own
+		imports = "".join(sorted(set(import_lines)))
+		header = f"{self.header}\n{imports}" if imports else self.header
+		return f"{header}\n\n" + "\n\n\n".join(blocks) + "\n"
+
+	def _get_field_type(self, field) -> str:
+		if field.fieldtype == "Select":
+			if not field.options:
+				return "str"
+			options = ", ".join(f'"{option}"' for option in field.options.split("\n"))
+			return f"Literal[{options}]"
+
+		if field.fieldtype in PYTHON_STRING_TYPES:
+			return "str"
+		return PYTHON_TYPES.get(field.fieldtype, "Any")
+
+	def _get_table_type(self, ts_type: str, ts_import: str | None, directory: Path) -> tuple[str, str | None]:
+		"""Translate the TypeScript type and import of a child table field."""
+		if not ts_type.endswith("[]"):
+			return "list[dict[str, Any]]", None
+
+		class_name = ts_type[:-2]
+		if not ts_import:
+			# Declared in the same file
+			return f"list[{class_name}]", None
+
+		import_path = TS_IMPORT_PATTERN.match(ts_import).group(2)
+		# The child table may only have been generated before this emitter was enabled
+		if not self.get_path(directory / f"{import_path}.d.ts").exists():
+			return "list[dict[str, Any]]", None
+		return f"list[{class_name}]", f"from {to_python_import(import_path)} import {class_name}\n"
+
+
+def to_python_import(import_path: str) -> str:
+	"""Return the relative module of a TypeScript import path, e.g. ``..Module.Child``
+	for ``../Module/Child``."""
+	parts = import_path.split("/")
+	dots = "."
+	while parts and parts[0] in {".", ".."}:
+		dots += "." if parts.pop(0) == ".." else ""
+	if parts and parts[-1] == "index":
+		parts.pop()
+	return dots + ".".join(parts)
+
+
+EMITTERS: dict[str, Emitter] = {emitter.option: emitter for emitter in (PythonStubEmitter(),)}
@@ -0,0 +1,117 @@
+"""HTTP endpoints serving the generated types to clients without access to the
+bench filesystem, e.g. remote dev containers and frontend dev servers.
+
+Responses carry a strong ETag derived from their content, and requests whose
+``If-None-Match`` matches it get an empty ``304 Not Modified``, so polling
+clients only transfer what changed.
+"""
+
+import hashlib
+import io
+import os
+import zipfile
+from pathlib import Path
+
+import frappe
+from werkzeug.wrappers import Response
+
+from .type_generator import TypeGenerator
+
+TYPESCRIPT_MIMETYPE = "application/typescript"
+# Fixed timestamp of archive entries, so that identical trees give identical archives
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+@frappe.whitelist(methods=["GET"])
+def get_doctype_types(doctype: str):
+	"""Return the declaration file of *doctype* (its bundle, with bundled layouts)."""
+	frappe.only_for("System Manager")
+	module = frappe.db.get_value("DocType", doctype, "module")
+	app_name = module and frappe.db.get_value("Module Def", module, "app_name")
+	if not app_name:
+		raise frappe.DoesNotExistError(frappe._("DocType {0} not found").format(doctype))
+
+	path = TypeGenerator(app_name).get_declaration_file(doctype, module)
+	if not path:
+		raise frappe.DoesNotExistError(frappe._("No types are generated for app {0}").format(app_name))
+	return _file_response(path)
+
+
+@frappe.whitelist(methods=["GET"])
+def get_doctype_map(app_name: str):
+	"""Return the `DocTypeMap.d.ts` that *app_name* is part of."""
+	frappe.only_for("System Manager")
+	map_path = TypeGenerator(app_name).paths.get_doctype_map_path(app_name)
+	if not map_path:
+		raise frappe.DoesNotExistError(frappe._("No types are generated for app {0}").format(app_name))
+	return _file_response(map_path / "DocTypeMap.d.ts")
+
+
+@frappe.whitelist(methods=["GET"])
+def get_app_types(app_name: str):
+	"""Return a zip archive of the `types` directory of *app_name*."""
+	frappe.only_for("System Manager")
+	types_path = TypeGenerator(app_name).paths.get_types_path(app_name)
+	if not types_path:
+		raise frappe.DoesNotExistError(frappe._("No types are generated for app {0}").format(app_name))
+
+	files = _list_files(types_path)
+	digest = hashlib.sha256()
+	for relative_path, path in files:
+		digest.update(relative_path.encode() + b"\0" + path.read_bytes() + b"\0")
+
+	etag = digest.hexdigest()
+	if _is_not_modified(etag):
+		return _not_modified(etag)
+
+	archive = io.BytesIO()
+	with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_file:
+		for relative_path, path in files:
+			zip_file.writestr(zipfile.ZipInfo(relative_path, ZIP_DATE_TIME), path.read_bytes())
+
+	response = _response(archive.getvalue(), "application/zip", etag)
+	response.headers["Content-Disposition"] = f'attachment; filename="{app_name}-types.zip"'
+	return response
+
+
+def _file_response(path: Path) -> Response:
+	if not path.is_file():
+		raise frappe.DoesNotExistError(frappe._("{0} has not been generated yet").format(path.name))
+
+	content = path.read_bytes()
+	etag = hashlib.sha256(content).hexdigest()
+	if _is_not_modified(etag):
+		return _not_modified(etag)
+	return _response(content, TYPESCRIPT_MIMETYPE, etag)
+
+
+def _response(content: bytes, mimetype: str, etag: str) -> Response:
+	response = Response(content, mimetype=mimetype)
+	response.set_etag(etag)
+	# Cached copies must be revalidated, which costs a 304 when nothing changed
+	response.headers["Cache-Control"] = "no-cache"
+	return response
+
+
+def _not_modified(etag: str) -> Response:
+	response = Response(status=304)
+	response.set_etag(etag)
+	response.headers["Cache-Control"] = "no-cache"
+	return response
+
+
+def _is_not_modified(etag: str) -> bool:
+	request = frappe.request
+	return bool(request and request.if_none_match.contains_weak(etag))
+
+
+def _list_files(types_path: Path) -> list[tuple[str, Path]]:
+	"""Return every file of *types_path* (following the links to core app packages),
+	sorted by path relative to it."""
+	files = []
+	for root, dirs, filenames in os.walk(types_path, followlinks=True):
+		dirs.sort()
+		for filename in filenames:
+			path = Path(root) / filename
+			files.append((path.relative_to(types_path).as_posix(), path))
+	return sorted(files)
@@ -0,0 +1,205 @@
+"""Export of all apps as a background job, one at a time per bench.
+
+The export runs in the ``long`` queue. On benches without a worker listening
+to it (e.g. a dev bench started without ``bench worker``), it runs in a thread
+of the current process instead. Its status and progress are kept in the
+bench's redis cache, where ``get_export_status`` reads them from.
+
+Exports run from bench commands take the same lock and publish the same
+status, but run in the foreground (see `run_export_all_apps_now`).
+"""
+
+import threading
+import time
+
+import frappe
+
+from .metrics import record_run
+from .reporting import GenerationReport, get_logger
+from .type_generator import TypeGenerator
+
+EXPORT_QUEUE = "long"
+# Held while an export is queued or running; shared by every site of the bench
+EXPORT_LOCK_KEY = "frappe_types:export_all_apps:lock"
+EXPORT_STATUS_KEY = "frappe_types:export_all_apps:status"
+# The lock expires unless the export reports progress, so that a killed job
+# doesn't prevent further exports
+EXPORT_LOCK_TTL = 10 * 60
+EXPORT_STATUS_TTL = 24 * 60 * 60
+# Longest an export may run in a worker before it is killed
+EXPORT_JOB_TIMEOUT = 2 * 60 * 60
+
+
+class ExportJobReport(GenerationReport):
+	"""Generation report that publishes its progress to the export's status."""
+
+	# Minimum number of seconds between two status updates
+	PUBLISH_INTERVAL = 1.0
+
+	def __init__(self, status: dict) -> None:
+		super().__init__()
+		self.status = status
+		self._last_publish = 0.0
+
+	def add_total(self, count: int):
+		super().add_total(count)
+		self.publish()
+
+	def advance(self, count: int = 1):
+		super().advance(count)
+		self.publish()
+
+	def set_current(self, name: str | None):
+		super().set_current(name)
+		self.publish(force=True)
+
+	def publish(self, state: str = "Running", force: bool = False):
+		now = time.monotonic()
+		if not force and now - self._last_publish < self.PUBLISH_INTERVAL:
+			return
+		self._last_publish = now
+
+		self.status.update(
+			state=state,
+			done=self.done,
+			total=self.total,
+			current_app=self.current,
+			failures=[{"name": name, "error": error} for name, error in self.failures],
+			elapsed=round(self.elapsed, 1),
+		)
+		_set_status(self.status)
+		# Keep the lock for as long as the export makes progress
+		frappe.cache.expire(_lock_key(), EXPORT_LOCK_TTL)
+
+
+def enqueue_export_all_apps(resume: bool = False, **generator_kwargs) -> dict:
+	"""Queue an export of all apps, unless one is already queued or running.
+
+	Returns the status of the new export, or of the one already in progress.
+	"""
+	status = _start_export()
+	if not status:
+		return get_export_status()
+
+	job_id = status["job_id"]
+	try:
+		if _has_workers():
+			frappe.enqueue(
+				run_export_all_apps,
+				queue=EXPORT_QUEUE,
+				timeout=EXPORT_JOB_TIMEOUT,
+				job_id=f"frappe_types_export_all_apps::{job_id}",
+				enqueue_after_commit=True,
+				export_id=job_id,
+				generator_kwargs=generator_kwargs,
+				resume=resume,
+			)
+		else:
+			_start_local_worker(job_id, generator_kwargs, resume)
+	except Exception:
+		_release_lock(job_id)
+		raise
+
+	return status
+
+
+def run_export_all_apps_now(resume: bool = False, **generator_kwargs) -> GenerationReport | None:
+	"""Run an export of all apps in this process, unless one is already queued or running.
+
+	Returns the report of the export, or None if another export holds the lock.
+	"""
+	status = _start_export()
+	if not status:
+		return None
+	return run_export_all_apps(status["job_id"], generator_kwargs, resume)
+
+
+def run_export_all_apps(export_id: str, generator_kwargs: dict, resume: bool = False) -> GenerationReport:
+	"""Run a queued export, publishing its progress until it finishes."""
+	status = get_export_status() or {"job_id": export_id}
+	report = ExportJobReport(status)
+	try:
+		report.publish(force=True)
+		generator = TypeGenerator(app_name="", report=report, **generator_kwargs)
+		generator.export_all_apps(resume=resume)
+		report.set_current(None)
+		report.summary()
+		report.publish("Failed" if report.failures else "Finished", force=True)
+	except Exception as e:
+		report.add_failure("All Apps", e)
+		report.publish("Failed", force=True)
+		raise
+	finally:
+		record_run("all_apps", report)
+		_release_lock(export_id)
+	return report
+
+
+def get_export_status() -> dict | None:
+	return frappe.cache.get_value(EXPORT_STATUS_KEY, shared=True)
+
+
+def _start_export() -> dict | None:
+	"""Take the export lock and publish the status of a new export, None if the lock is held."""
+	job_id = frappe.generate_hash(length=12)
+	if not frappe.cache.set(_lock_key(), job_id, nx=True, ex=EXPORT_LOCK_TTL):
+		return None
+
+	status = {
+		"job_id": job_id,
+		"site": frappe.local.site,
+		"user": frappe.session.user,
+		"state": "Queued",
+		"done": 0,
+		"total": 0,
+		"current_app": None,
+		"failures": [],
+		"elapsed": 0.0,
+	}
+	_set_status(status)
+	return status
+
+
+def _start_local_worker(job_id: str, generator_kwargs: dict, resume: bool):
+	"""Run the export in a thread with its own connection to the current site."""
+	site, sites_path, user = frappe.local.site, frappe.local.sites_path, frappe.session.user
+	get_logger().info("No worker for the %s queue, exporting types in process", EXPORT_QUEUE)
+
+	def run():
+		frappe.init(site=site, sites_path=sites_path)
+		try:
+			frappe.connect()
+			frappe.set_user(user)
+			run_export_all_apps(job_id, generator_kwargs, resume)
+		finally:
+			frappe.destroy()
+
+	threading.Thread(target=run, name=f"frappe-types-export-{job_id}", daemon=True).start()
+
+
+def _has_workers() -> bool:
+	if frappe.conf.get("frappe_types_export_in_process"):
+		return False
+
+	from frappe.utils.background_jobs import get_workers
+
+	try:
+		return bool(get_workers(queue=EXPORT_QUEUE))
+	except Exception:
+		# Redis queue not reachable
+		return False
+
+
+def _set_status(status: dict):
+	frappe.cache.set_value(EXPORT_STATUS_KEY, status, expires_in_sec=EXPORT_STATUS_TTL, shared=True)
+
+
+def _lock_key() -> str:
+	return frappe.cache.make_key(EXPORT_LOCK_KEY, shared=True)
+
+
+def _release_lock(job_id: str):
+	lock_key = _lock_key()
+	held_by = frappe.cache.get(lock_key)
+	if held_by and held_by.decode() == job_id:
+		frappe.cache.delete(lock_key)
@@ -0,0 +1,60 @@
+"""Cheap checks run by the document hooks before anything else.
+
+Every DocType save of every site goes through the hooks, while types can only
+be generated on sites in developer mode, for the apps in Type Generation
+Settings. The checks are ordered cheapest first (flags, site config, the
+cached set of configured apps), so that on other sites the hooks return
+without touching the database.
+"""
+
+import frappe
+
+# Apps of Type Generation Settings, cleared whenever the settings are saved
+CONFIGURED_APPS_CACHE_KEY = "frappe_types:configured_apps"
+
+
+def is_generation_enabled() -> bool:
+	"""Return whether the hooks can generate types at all on this site right now."""
+	flags = frappe.flags
+	if (
+		flags.type_generator_disable_update
+		or flags.in_patch
+		or flags.in_migrate
+		or flags.in_install
+		or flags.in_setup_wizard
+	):
+		return False
+
+	conf = frappe.conf
+	return bool(conf.get("developer_mode")) and not conf.get("frappe_types_pause_generation")
+
+
+def is_configured_module(module: str | None) -> bool:
+	"""Return whether *module* belongs to an app of Type Generation Settings."""
+	if not module:
+		return False
+
+	configured_apps = get_configured_apps()
+	if not configured_apps:
+		return False
+
+	# Standard modules are mapped from the apps' modules.txt, custom ones only exist in the database
+	module_apps = getattr(frappe.local, "module_app", None) or {}
+	app_name = module_apps.get(frappe.scrub(module)) or frappe.db.get_value("Module Def", module, "app_name")
+	return app_name in configured_apps
+
+
+def get_configured_apps() -> set[str]:
+	apps = frappe.cache.get_value(
+		CONFIGURED_APPS_CACHE_KEY,
+		generator=lambda: frappe.get_all(
+			"App Type Generation Paths",
+			filters={"parent": "Type Generation Settings"},
+			pluck="app_name",
+		),
+	)
+	return set(apps or [])
+
+
+def clear_configured_apps_cache():
+	frappe.cache.delete_value(CONFIGURED_APPS_CACHE_KEY)
@@ -0,0 +1,150 @@
+"""Latency histograms of the document hooks, to check what type generation adds to saves.
+
+Each worker counts the durations of the hooks it runs in buckets, and adds
+them to the site's histogram in redis at most every ``FLUSH_INTERVAL``
+seconds, so that timing a hook does not cost a round trip on every save.
+"""
+
+import bisect
+import functools
+import threading
+import time
+
+import frappe
+
+from .reporting import get_logger
+
+# Upper bounds of the buckets, in seconds (from 10µs to 5s)
+LATENCY_BUCKETS = (
+	0.00001,
+	0.000025,
+	0.00005,
+	0.0001,
+	0.00025,
+	0.0005,
+	0.001,
+	0.0025,
+	0.005,
+	0.01,
+	0.025,
+	0.05,
+	0.1,
+	0.25,
+	0.5,
+	1.0,
+	2.5,
+	5.0,
+)
+FLUSH_INTERVAL = 10
+HOOK_LATENCY_KEY = "frappe_types:hook_latency"
+
+
+class LatencyHistogram:
+	def __init__(self) -> None:
+		# One count per bucket, the last one for durations above every bound
+		self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+		self.sum = 0.0
+		self.count = 0
+
+	def observe(self, seconds: float):
+		self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+		self.sum += seconds
+		self.count += 1
+
+	def as_dict(self) -> dict:
+		"""Return the cumulative count of each bucket, like Prometheus histograms."""
+		cumulative = 0
+		buckets = []
+		for bound, count in zip([*LATENCY_BUCKETS, "+Inf"], self.counts, strict=True):
+			cumulative += count
+			buckets.append([bound, cumulative])
+		return {"buckets": buckets, "sum": self.sum, "count": self.count}
+
+
+# Observations not flushed to redis yet, by (site, hook)
+_pending: dict[tuple[str, str], LatencyHistogram] = {}
+_last_flush: dict[str, float] = {}
+_pending_lock = threading.Lock()
+
+
+def timed_hook(hook: str):
+	"""Record the duration of every call of the decorated document hook."""
+
+	def decorator(fn):
+		@functools.wraps(fn)
+		def wrapper(*args, **kwargs):
+			start = time.perf_counter()
+			try:
+				return fn(*args, **kwargs)
+			finally:
+				observe_hook(hook, time.perf_counter() - start)
+
+		return wrapper
+
+	return decorator
+
+
+def observe_hook(hook: str, seconds: float):
+	site = frappe.local.site
+	with _pending_lock:
+		histogram = _pending.get((site, hook))
+		if histogram is None:
+			histogram = _pending[(site, hook)] = LatencyHistogram()
+		histogram.observe(seconds)
+
+		now = time.monotonic()
+		if now - _last_flush.get(site, 0.0) < FLUSH_INTERVAL:
+			return
+		_last_flush[site] = now
+	flush_hook_latency()
+
+
+def flush_hook_latency():
+	"""Add the observations of this worker for the current site to the site's histograms."""
+	site = frappe.local.site
+	with _pending_lock:
+		histograms = {hook: _pending.pop((s, hook)) for s, hook in list(_pending) if s == site}
+	if not histograms:
+		return
+
+	# Timing must never make a save fail
+	try:
+		key = frappe.cache.make_key(HOOK_LATENCY_KEY)
+		pipeline = frappe.cache.pipeline()
+		for hook, histogram in histograms.items():
+			for index, count in enumerate(histogram.counts):
+				if count:
+					pipeline.hincrby(key, f"{hook}:{index}", count)
+			pipeline.hincrbyfloat(key, f"{hook}:sum", histogram.sum)
+			pipeline.hincrby(key, f"{hook}:count", histogram.count)
+		pipeline.execute()
+	except Exception:
+		get_logger().debug("Could not save the latency of the hooks", exc_info=True)
+
+
+def get_hook_latency() -> dict[str, LatencyHistogram]:
+	"""Return the latency histogram of each hook on the current site."""
+	flush_hook_latency()
+	# Read through a pipeline, RedisWrapper.hgetall expects pickled values
+	pipeline = frappe.cache.pipeline()
+	pipeline.hgetall(frappe.cache.make_key(HOOK_LATENCY_KEY))
+	(fields,) = pipeline.execute()
+
+	histograms: dict[str, LatencyHistogram] = {}
+	for field, value in fields.items():
+		hook, _, name = frappe.safe_decode(field).rpartition(":")
+		histogram = histograms.setdefault(hook, LatencyHistogram())
+		if name == "sum":
+			histogram.sum = float(value)
+		elif name == "count":
+			histogram.count = int(value)
+		else:
+			histogram.counts[int(name)] = int(value)
+	return histograms
+
+
+@frappe.whitelist(methods=["GET"])
+def get_hook_latency_histogram():
+	"""Return the latency histogram of each document hook of frappe-types, in seconds."""
+	frappe.only_for("System Manager")
+	return {hook: histogram.as_dict() for hook, histogram in sorted(get_hook_latency().items())}
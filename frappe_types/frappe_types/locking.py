@@ -0,0 +1,142 @@
+"""Advisory file locks shared by concurrent generators.
+
+Web workers, bench commands and background jobs can generate the same files
+at the same moment. Writes into a `types` directory are serialized by a lock
+per output root. Generations of the same declaration file are serialized by
+one of ``LOCK_STRIPES`` striped locks, which records the stamp (see
+`get_stamp`) of the last generation, so that a process that waited for the
+generation of an identical schema reuses its output instead of redoing it
+(`FileLock.generated_since` / `FileLock.mark_generated`). Only generations
+that finish while a process waits are reused, never those of earlier runs.
+
+Locks are `fcntl.flock` locks on files in ``<bench>/.frappe-types/locks``,
+released by the OS if the holder dies. They are reentrant within a thread and
+exclusive between threads. Where `fcntl` is not available (Windows), only the
+threads of a process are serialized.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import weakref
+from pathlib import Path
+
+try:
+	import fcntl
+except ImportError:  # pragma: no cover - Windows
+	fcntl = None
+
+LOCKS_DIR = Path(".frappe-types") / "locks"
+# Locks shared by the declaration files, whatever their number
+LOCK_STRIPES = 256
+
+_locks: "weakref.WeakValueDictionary[Path, FileLock]" = weakref.WeakValueDictionary()
+_locks_guard = threading.Lock()
+
+
+def get_lock(bench_root: Path, name: str) -> "FileLock":
+	"""Return the lock called *name* (e.g. an output path) of the bench at *bench_root*.
+
+	Every holder of a lock in this process gets the same `FileLock` object.
+	"""
+	digest = hashlib.sha1(name.encode()).hexdigest()
+	path = bench_root / LOCKS_DIR / f"{digest}.lock"
+	with _locks_guard:
+		lock = _locks.get(path)
+		if lock is None:
+			lock = _locks[path] = FileLock(path)
+		return lock
+
+
+def get_striped_lock(bench_root: Path, name: str) -> "FileLock":
+	"""Return the lock of the stripe *name* hashes to, shared with other names.
+
+	Unlike `get_lock`, the number of lock files stays bounded however many
+	names (e.g. declaration files) are locked.
+	"""
+	digest = hashlib.sha1(name.encode()).hexdigest()
+	return get_lock(bench_root, f"stripe:{int(digest, 16) % LOCK_STRIPES}")
+
+
+def get_stamp(path: Path, *keys: str) -> str:
+	"""Return the stamp of a generation of *path* from *keys* (e.g. a render key and
+	the enabled emitters). It includes the path, as striped locks are shared."""
+	return " ".join([*keys, str(path)])
+
+
+class FileLock:
+	"""An exclusive lock on *path*, which can also hold a short value (e.g. a schema key).
+
+	The file is only open while the lock is held, so that thousands of locks
+	(one per declaration file) do not keep as many file descriptors open.
+	"""
+
+	def __init__(self, path: Path) -> None:
+		self.path = path
+		self._thread_lock = threading.RLock()
+		self._depth = 0
+		self._fd: int | None = None
+
+	def acquire(self):
+		self._thread_lock.acquire()
+		if self._depth == 0:
+			try:
+				self._fd = self._open()
+				if fcntl:
+					fcntl.flock(self._fd, fcntl.LOCK_EX)
+			except BaseException:
+				self._close()
+				self._thread_lock.release()
+				raise
+		self._depth += 1
+
+	def release(self):
+		self._depth -= 1
+		if self._depth == 0:
+			self._close()
+		self._thread_lock.release()
+
+	def __enter__(self) -> "FileLock":
+		self.acquire()
+		return self
+
+	def __exit__(self, *exc_info):
+		self.release()
+
+	def read_value(self) -> str:
+		"""Return the value stored by the last holder, if any. The lock must be held."""
+		os.lseek(self._fd, 0, os.SEEK_SET)
+		return os.read(self._fd, 4096).decode()
+
+	def write_value(self, value: str):
+		"""Store *value* for the next holders. The lock must be held."""
+		os.ftruncate(self._fd, 0)
+		os.lseek(self._fd, 0, os.SEEK_SET)
+		os.write(self._fd, value.encode())
+
+	def generated_since(self, stamp: str, since: int) -> bool:
+		"""Return whether another holder marked *stamp* as generated after *since*
+		(`time.time_ns()`), i.e. while the caller waited for the lock. The lock must be held."""
+		generated_at, _, value = self.read_value().partition(" ")
+		if not generated_at.isdigit() or int(generated_at) < since:
+			return False
+		return value == stamp
+
+	def mark_generated(self, stamp: str):
+		"""Record that *stamp* was generated, for the holders waiting for the lock.
+		The lock must be held."""
+		self.write_value(f"{time.time_ns()} {stamp}")
+
+	def _open(self) -> int:
+		try:
+			return os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+		except FileNotFoundError:
+			self.path.parent.mkdir(parents=True, exist_ok=True)
+			return os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+	def _close(self):
+		# Closing the file releases the flock
+		if self._fd is not None:
+			os.close(self._fd)
+			self._fd = None
@@ -0,0 +1,151 @@
+"""Manifest of the declaration files generated into a `types` directory.
+
+Each `types` directory keeps a `.frappe-types-manifest.json` that maps every
+file written by frappe-types (relative to the directory) to the DocTypes it
+declares. Files of deleted or renamed DocTypes can then be pruned without
+touching anything frappe-types did not generate.
+
+The additional output targets of an app hold copies of its `types` directory,
+manifest included, so files removed from the directory are removed from them too.
+
+Several processes can write into the same `types` directory, so a manifest is
+saved by merging its changes into the records saved since it was loaded.
+"""
+
+import json
+from contextlib import nullcontext
+from pathlib import Path
+
+from .locking import FileLock
+from .utils import create_file
+
+MANIFEST_FILE = ".frappe-types-manifest.json"
+MANIFEST_VERSION = 1
+
+# Generated files that do not keep an otherwise empty module directory alive
+AUXILIARY_FILES = {"tsconfig.json", "tsconfig.tsbuildinfo"}
+
+
+class Manifest:
+	def __init__(
+		self, types_dir: Path, additional_dirs: list[Path] | None = None, lock: FileLock | None = None
+	) -> None:
+		self.types_dir = types_dir
+		# Copies of the `types` directory in the additional output targets
+		self.additional_dirs = additional_dirs or []
+		# Lock of the `types` directory, held while saving
+		self.lock = lock
+		self.path = types_dir / MANIFEST_FILE
+		self.files: dict[str, list[str]] = self._load()
+		# Files written (or found unchanged) during the current run
+		self.produced: set[str] = set()
+		# Files recorded (or removed, None) since the manifest was loaded
+		self._changes: dict[str, list[str] | None] = {}
+
+	def record(self, file_path: Path, doctypes: list[str]):
+		key = self.get_key(file_path)
+		self.files[key] = self._changes[key] = sorted(doctypes)
+		self.produced.add(key)
+
+	def get_key(self, file_path: Path) -> str:
+		return file_path.relative_to(self.types_dir).as_posix()
+
+	def mark_produced(self, doctypes: set[str]):
+		"""Count the files declaring any of *doctypes* as produced by this run."""
+		self.produced.update(key for key, declared in self.files.items() if doctypes.intersection(declared))
+
+	def expand(self, key: str, files: dict[str, list[str]]):
+		"""Replace the record of the linked folder / file *key* by the records of the
+		*files* it holds, as listed in the manifest of the package it was linked to."""
+		produced = key in self.produced
+		self.files.pop(key, None)
+		self._changes[key] = None
+		self.produced.discard(key)
+		for file_key, doctypes in files.items():
+			if file_key == key or file_key.startswith(f"{key}/"):
+				self.files[file_key] = self._changes[file_key] = doctypes
+				if produced:
+					self.produced.add(file_key)
+
+	def find(self, doctype: str) -> list[str]:
+		"""Return the files declaring *doctype*."""
+		return [key for key, doctypes in self.files.items() if doctype in doctypes]
+
+	def remove_files(self, keys: list[str]) -> list[str]:
+		"""Delete the given files, then the module directories they leave empty."""
+		parents = set()
+		for key in keys:
+			self.files.pop(key, None)
+			self._changes[key] = None
+			self.produced.discard(key)
+			for types_dir in (self.types_dir, *self.additional_dirs):
+				file_path = types_dir / key
+				file_path.unlink(missing_ok=True)
+				if file_path.parent != types_dir:
+					parents.add(file_path.parent)
+
+		for directory in parents:
+			self._remove_if_empty(directory)
+
+		return keys
+
+	def prune(self, scope: str | None = None, keep: set[str] | None = None) -> list[str]:
+		"""Delete the files recorded by earlier runs that this run did not produce.
+
+		When *scope* is given, only files inside that directory (relative to the
+		`types` directory, e.g. a module folder) are considered. Files declaring
+		any DocType in *keep* (e.g. DocTypes that failed to render) are kept.
+		"""
+		keep = keep or set()
+		orphans = [
+			key
+			for key, doctypes in self.files.items()
+			if key not in self.produced
+			and (scope is None or key.startswith(f"{scope}/"))
+			and not keep.intersection(doctypes)
+		]
+		return self.remove_files(orphans)
+
+	def save(self) -> bool:
+		with self.lock or nullcontext():
+			# Keep the files recorded by other processes since this manifest was loaded
+			files = self._load()
+			for key, doctypes in self._changes.items():
+				if doctypes is None:
+					files.pop(key, None)
+				else:
+					files[key] = doctypes
+			self.files = files
+			self._changes = {}
+
+			content = {"version": MANIFEST_VERSION, "files": dict(sorted(self.files.items()))}
+			content = json.dumps(content, indent="\t") + "\n"
+			written = create_file(self.path, content)
+			for types_dir in self.additional_dirs:
+				written |= create_file(types_dir / MANIFEST_FILE, content)
+		return written
+
+	def _load(self) -> dict[str, list[str]]:
+		if not self.path.exists():
+			return {}
+
+		try:
+			content = json.loads(self.path.read_text())
+		except ValueError:
+			return {}
+
+		if content.get("version") != MANIFEST_VERSION:
+			return {}
+		return content.get("files", {})
+
+	def _remove_if_empty(self, directory: Path):
+		if not directory.is_dir():
+			return
+
+		entries = list(directory.iterdir())
+		if any(entry.name not in AUXILIARY_FILES for entry in entries):
+			return
+
+		for entry in entries:
+			entry.unlink()
+		directory.rmdir()
@@ -0,0 +1,168 @@
+"""Generation statistics in the Prometheus text format, e.g. for node_exporter's
+textfile collector.
+
+When ``frappe_types_metrics_file`` is set in *site_config* / *common_site_config*
+(e.g. ``/var/lib/node_exporter/textfile/frappe_types.prom``), every generation
+run adds its statistics to the counters of that file, labelled with the site
+and the kind of run. The file is rewritten atomically, under a lock shared by
+every process updating it, so the counters are cumulative across runs.
+"""
+
+import os
+import re
+import time
+from pathlib import Path
+
+import frappe
+
+from .locking import FileLock
+from .reporting import GenerationReport, get_logger
+
+METRICS_FILE_CONF = "frappe_types_metrics_file"
+
+# Metric families: name → (type, help)
+METRICS = {
+	"frappe_types_runs_total": ("counter", "Generation runs."),
+	"frappe_types_run_duration_seconds_total": ("counter", "Time spent in generation runs."),
+	"frappe_types_doctypes_processed_total": ("counter", "DocTypes processed by generation runs."),
+	"frappe_types_doctypes_rendered_total": ("counter", "DocType interfaces rendered."),
+	"frappe_types_files_written_total": ("counter", "Generated files created or changed."),
+	"frappe_types_files_unchanged_total": ("counter", "Generated files that were already up to date."),
+	"frappe_types_failures_total": ("counter", "DocTypes and modules that could not be generated."),
+	"frappe_types_phase_seconds_total": ("counter", "Time spent in each phase of generation runs."),
+	"frappe_types_last_run_duration_seconds": ("gauge", "Duration of the last generation run."),
+	"frappe_types_last_run_failures": ("gauge", "Failures of the last generation run."),
+	"frappe_types_last_run_timestamp_seconds": (
+		"gauge",
+		"End of the last generation run, as a Unix timestamp.",
+	),
+	"frappe_types_hook_duration_seconds": ("histogram", "Duration of the document hooks of frappe-types."),
+}
+HOOK_HISTOGRAM = "frappe_types_hook_duration_seconds"
+
+SAMPLE_PATTERN = re.compile(r"^(\w+)(\{.*\})?\s+(\S+)$")
+
+
+def record_run(run: str, report: GenerationReport):
+	"""Add the statistics of a finished run (e.g. ``all_apps``, ``hook``) to the metrics file, if any."""
+	path = frappe.conf.get(METRICS_FILE_CONF)
+	if not path:
+		return
+
+	try:
+		MetricsFile(Path(path).expanduser()).add_run(run, report, frappe.local.site or "")
+	except Exception:
+		get_logger().warning("Could not update the metrics file %s", path, exc_info=True)
+
+
+class MetricsFile:
+	def __init__(self, path: Path) -> None:
+		self.path = path
+		# node_exporter only collects `*.prom` files, so the lock next to it is ignored
+		self.lock = FileLock(path.with_name(f".{path.name}.lock"))
+
+	def add_run(self, run: str, report: GenerationReport, site: str):
+		labels = {"site": site, "run": run}
+		counters = {
+			"frappe_types_runs_total": 1,
+			"frappe_types_run_duration_seconds_total": report.elapsed,
+			"frappe_types_doctypes_processed_total": report.done,
+			"frappe_types_doctypes_rendered_total": report.counters.get("doctypes_rendered", 0),
+			"frappe_types_files_written_total": report.counters.get("files_written", 0),
+			"frappe_types_files_unchanged_total": report.counters.get("files_unchanged", 0),
+			"frappe_types_failures_total": len(report.failures),
+		}
+		gauges = {
+			"frappe_types_last_run_duration_seconds": report.elapsed,
+			"frappe_types_last_run_failures": len(report.failures),
+			"frappe_types_last_run_timestamp_seconds": time.time(),
+		}
+		hook_latency = self._get_hook_latency()
+
+		with self.lock:
+			samples = self.read()
+			for name, value in counters.items():
+				series = format_series(name, labels)
+				samples[series] = samples.get(series, 0) + value
+			for phase, seconds in report.timings.items():
+				series = format_series("frappe_types_phase_seconds_total", {**labels, "phase": phase})
+				samples[series] = samples.get(series, 0) + seconds
+			for name, value in gauges.items():
+				samples[format_series(name, labels)] = value
+			# Already cumulative, kept in the site's cache
+			for hook, histogram in hook_latency.items():
+				hook_labels = {"site": site, "hook": hook}
+				for bound, count in histogram["buckets"]:
+					le = bound if isinstance(bound, str) else repr(float(bound))
+					bucket_labels = {**hook_labels, "le": le}
+					samples[format_series(f"{HOOK_HISTOGRAM}_bucket", bucket_labels)] = count
+				samples[format_series(f"{HOOK_HISTOGRAM}_sum", hook_labels)] = histogram["sum"]
+				samples[format_series(f"{HOOK_HISTOGRAM}_count", hook_labels)] = histogram["count"]
+			self.write(samples)
+
+	def read(self) -> dict[str, float]:
+		"""Return the value of every series in the file, keyed by series (name and labels)."""
+		if not self.path.exists():
+			return {}
+
+		samples = {}
+		for line in self.path.read_text().splitlines():
+			match = SAMPLE_PATTERN.match(line)
+			if match and _get_family(match.group(1)):
+				try:
+					samples[match.group(1) + (match.group(2) or "")] = float(match.group(3))
+				except ValueError:
+					continue
+		return samples
+
+	def write(self, samples: dict[str, float]):
+		lines = []
+		for family, (metric_type, help_text) in METRICS.items():
+			series = sorted(name for name in samples if _get_family(name.partition("{")[0]) == family)
+			if not series:
+				continue
+			lines.append(f"# HELP {family} {help_text}")
+			lines.append(f"# TYPE {family} {metric_type}")
+			lines.extend(f"{name} {_format_value(samples[name])}" for name in series)
+
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+		try:
+			tmp_path.write_text("\n".join(lines) + "\n")
+			os.replace(tmp_path, self.path)
+		finally:
+			tmp_path.unlink(missing_ok=True)
+
+	def _get_hook_latency(self) -> dict[str, dict]:
+		# Imported here, the histograms are only available with a site (and its cache)
+		from .latency import get_hook_latency
+
+		try:
+			return {hook: histogram.as_dict() for hook, histogram in get_hook_latency().items()}
+		except Exception:
+			get_logger().debug("Could not read the latency of the hooks", exc_info=True)
+			return {}
+
+
+def format_series(name: str, labels: dict[str, str]) -> str:
+	label_pairs = ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items())
+	return f"{name}{{{label_pairs}}}"
+
+
+def _get_family(name: str) -> str | None:
+	"""Return the metric family of the series *name*, e.g. of a histogram's ``_bucket`` series."""
+	if name in METRICS:
+		return name
+	for suffix in ("_bucket", "_sum", "_count"):
+		family = name.removesuffix(suffix)
+		if family != name and METRICS.get(family, ("",))[0] == "histogram":
+			return family
+	return None
+
+
+def _escape_label(value: str) -> str:
+	return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+	return str(int(value)) if float(value).is_integer() else repr(float(value))
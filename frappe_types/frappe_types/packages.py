@@ -0,0 +1,205 @@
+"""Prebuilt type packages of the core apps (frappe, erpnext).
+
+The DocTypes of a core app are the same on every site running a given version
+of it, so their declarations are generated once per app version and commit,
+into a cache shared by the whole bench (``frappe_types_package_cache_dir`` in
+*common_site_config*, ``<bench>/.frappe-types/packages`` by default). Exports
+then symlink the package's module folders into the output instead of
+rendering close to a thousand DocTypes again.
+
+Linked folders are never written through: generating a core app's types the
+usual way (hooks, custom fields) first replaces its links by copies.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from collections.abc import Callable
+from pathlib import Path
+
+import frappe
+
+from frappe_types import __version__
+
+from .manifest import Manifest
+from .paths import OutputPathResolver
+from .render_cache import RENDER_FORMAT_VERSION
+from .reporting import get_logger
+from .utils import to_ts_type
+
+CORE_APPS = frozenset({"frappe", "erpnext"})
+PACKAGE_FILE = "package.json"
+
+
+class CorePackage:
+	"""The types of a core app at one version, in the package cache."""
+
+	def __init__(self, app_name: str, key: str, cache_dir: Path) -> None:
+		self.app_name = app_name
+		self.key = key
+		self.path = cache_dir / app_name / key
+		self.types_path = self.path / "types"
+
+	@classmethod
+	def for_app(cls, app_name: str, options: dict, cache_dir: Path) -> "CorePackage | None":
+		"""Return the package of the installed version of *app_name*, or None when
+		its sources have local changes, which no version key can account for."""
+		commit = get_app_commit(app_name)
+		if commit and commit.endswith("-dirty"):
+			return None
+
+		# Output options and the generator version change the package's contents
+		options_key = json.dumps(
+			{**options, "generator": f"{__version__}/{RENDER_FORMAT_VERSION}"}, sort_keys=True
+		)
+		key = "-".join(
+			(
+				get_app_version(app_name),
+				(commit or "nogit")[:12],
+				hashlib.sha256(options_key.encode()).hexdigest()[:12],
+			)
+		)
+		return cls(app_name, key, cache_dir)
+
+	def exists(self) -> bool:
+		# The package file is written last, so a package without it is incomplete
+		return (self.path / PACKAGE_FILE).exists()
+
+	def get_entries(self) -> list[tuple[str, str, str]]:
+		"""Return the DocTypeMap entries of the package."""
+		content = json.loads((self.path / PACKAGE_FILE).read_text())
+		return [tuple(entry) for entry in content["doctypes"]]
+
+	def get_contents(self, modules: list[str] | None = None) -> dict[str, list[str]]:
+		"""Return the top-level folders / files of the package's `types` directory,
+		with the DocTypes each of them declares.
+
+		With *modules*, only the folders of those modules and the app's own bundle
+		files are returned, leaving out the child tables of other apps generated
+		into the package (e.g. frappe's `Core` in the erpnext package).
+		"""
+		own = {to_ts_type(module) for module in modules or []}
+		contents: dict[str, set[str]] = {}
+		for key, doctypes in Manifest(self.types_path).files.items():
+			name = key.split("/")[0]
+			if modules is not None and name not in own and name.split(".")[0] != self.app_name:
+				continue
+			contents.setdefault(name, set()).update(doctypes)
+		return {name: sorted(doctypes) for name, doctypes in sorted(contents.items())}
+
+	def build(self, build_types: Callable[[Path], list | None]) -> bool:
+		"""Build the package with *build_types*, which generates the app's types into
+		the given directory and returns their DocTypeMap entries (None on failure).
+
+		The package is built next to its final location and moved there once
+		complete, so that benches sharing the cache never see half a package.
+		"""
+		tmp_path = self.path.with_name(f".{self.key}.tmp-{os.getpid()}")
+		shutil.rmtree(tmp_path, ignore_errors=True)
+		try:
+			entries = build_types(tmp_path / "types")
+			if entries is None:
+				return False
+
+			content = {
+				"app": self.app_name,
+				"key": self.key,
+				"doctypes": sorted({tuple(entry) for entry in entries}),
+			}
+			(tmp_path / PACKAGE_FILE).write_text(json.dumps(content, indent="\t") + "\n")
+			try:
+				os.rename(tmp_path, self.path)
+			except OSError:
+				# Built by another bench in the meantime
+				if not self.exists():
+					raise
+			return True
+		finally:
+			shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+class PackagePathResolver(OutputPathResolver):
+	"""Resolve the output of every app into the `types` directory of a package."""
+
+	def __init__(self, types_path: Path) -> None:
+		super().__init__({}, "", "")
+		self.types_path = types_path
+
+	def get_doctype_map_path(self, app_name: str) -> Path | None:
+		return self.get_types_path(app_name)
+
+	def _resolve_types_path(self, app_name: str) -> Path | None:
+		return self.ensure_dir(self.types_path)
+
+
+def link_package_entry(source: Path, target: Path) -> bool:
+	"""Symlink *target* to *source*, copying it where symlinks are not supported.
+
+	Returns False if *target* exists and is not a link, e.g. a folder with files
+	frappe-types did not generate.
+	"""
+	if target.is_symlink():
+		if Path(os.readlink(target)) == source:
+			return True
+		target.unlink()
+	elif target.exists():
+		get_logger().warning("Not linking %s, which holds files not generated by frappe-types", target)
+		return False
+
+	try:
+		os.symlink(source, target, target_is_directory=source.is_dir())
+	except OSError:
+		if source.is_dir():
+			shutil.copytree(source, target)
+		else:
+			shutil.copyfile(source, target)
+	return True
+
+
+def unlink_package_entry(target: Path) -> Path | None:
+	"""Replace the symlink *target* to a package entry by a copy of that entry, so
+	that it can be written to without changing the package.
+
+	Returns the `types` directory of the package *target* pointed to, or None if
+	*target* is not a link.
+	"""
+	if not target.is_symlink():
+		return None
+
+	source = target.resolve()
+	tmp_path = target.with_name(f".{target.name}.tmp-{os.getpid()}")
+	shutil.rmtree(tmp_path, ignore_errors=True)
+	if source.is_dir():
+		shutil.copytree(source, tmp_path)
+	else:
+		shutil.copyfile(source, tmp_path)
+	# A directory cannot replace a link by renaming
+	target.unlink()
+	os.rename(tmp_path, target)
+	return source.parent
+
+
+def get_app_version(app_name: str) -> str:
+	try:
+		return str(frappe.get_attr(f"{app_name}.__version__"))
+	except Exception:
+		return "0"
+
+
+def get_app_commit(app_name: str) -> str | None:
+	"""Return the commit the app's sources are at, suffixed with ``-dirty`` when
+	they have local changes, or None if the app is not a git checkout."""
+	try:
+		app_path = frappe.get_app_path(app_name)
+		result = subprocess.run(
+			["git", "describe", "--always", "--dirty", "--abbrev=40", "--exclude=*"],
+			cwd=app_path,
+			capture_output=True,
+			text=True,
+			check=True,
+		)
+	except Exception:
+		return None
+	return result.stdout.strip() or None
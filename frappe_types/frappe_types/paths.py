@@ -0,0 +1,147 @@
+import os
+from pathlib import Path
+
+from .reporting import get_logger
+from .utils import get_bench_root_path, to_ts_type
+
+
+class OutputPathResolver:
+	"""Resolve the output directories of a generation run.
+
+	The bench root and the ``types`` directory of every app are resolved once,
+	and each directory is created at most once, so that generating thousands
+	of DocTypes does not repeat the same lookups, ``stat`` and ``mkdir`` calls.
+
+	Apps can have additional output targets (e.g. one per frontend), listed in
+	the *Additional App Paths* of their row: each gets a copy of every file
+	written to the app's ``types`` directory.
+
+	Parameters
+	----------
+	settings: dict
+	    Type Generation Settings, as loaded by the generator.
+	base_output_path: str
+	    Base path the app folders are resolved against.
+	app_name: str
+	    App of the generator, used for the root output folder.
+	"""
+
+	def __init__(self, settings: dict, base_output_path: str, app_name: str) -> None:
+		self.settings = settings
+		self.base_output_path = base_output_path
+		self.app_name = app_name
+		self._bench_root: Path | None = None
+		self._types_paths: dict[str, Path | None] = {}
+		# `types` directory of an app → `types` directories of its additional targets
+		self._additional_targets: dict[Path, list[Path]] = {}
+		self._created_dirs: set[Path] = set()
+
+	@property
+	def bench_root(self) -> Path:
+		if self._bench_root is None:
+			self._bench_root = get_bench_root_path()
+		return self._bench_root
+
+	def ensure_dir(self, path: Path) -> Path:
+		"""Create *path* (and its parents) unless it was already created in this run."""
+		if path not in self._created_dirs:
+			path.mkdir(parents=True, exist_ok=True)
+			self._created_dirs.add(path)
+		return path
+
+	def get_types_path(self, app_name: str) -> Path | None:
+		"""Return the `types` directory holding the module folders of *app_name*."""
+		if app_name not in self._types_paths:
+			self._types_paths[app_name] = self._resolve_types_path(app_name)
+		return self._types_paths[app_name]
+
+	def get_additional_targets(self, types_path: Path) -> list[Path]:
+		"""Return the `types` directories that receive a copy of *types_path*."""
+		return self._additional_targets.get(types_path, [])
+
+	def get_target_paths(self, path: Path) -> list[Path]:
+		"""Return *path*, followed by its copy in every additional target of the
+		`types` directory it is in."""
+		for types_path, targets in self._additional_targets.items():
+			if targets and path.is_relative_to(types_path):
+				relative_path = path.relative_to(types_path)
+				return [
+					path,
+					*(self.ensure_dir((target / relative_path).parent) / path.name for target in targets),
+				]
+		return [path]
+
+	def get_owner_app(self, path: Path) -> str | None:
+		"""Return the app whose `types` directory holds *path*, None if it is shared
+		(exporting to root) or not resolved yet."""
+		apps = [
+			app_name
+			for app_name, types_path in self._types_paths.items()
+			if types_path and path.is_relative_to(types_path)
+		]
+		return apps[0] if len(apps) == 1 else None
+
+	def get_top_level_entry(self, path: Path) -> Path | None:
+		"""Return the entry of the `types` directory holding *path* that *path* is in,
+		e.g. its module folder, or None if *path* is in no `types` directory."""
+		for types_path in self._types_paths.values():
+			if types_path and path != types_path and path.is_relative_to(types_path):
+				return types_path / path.relative_to(types_path).parts[0]
+		return None
+
+	def get_output_root(self, path: Path) -> Path:
+		"""Return the `types` directory *path* is in, or its parent directory if none."""
+		for types_path in self._types_paths.values():
+			if types_path and path.is_relative_to(types_path):
+				return types_path
+		return path.parent
+
+	def get_module_path(self, app_name: str, module_name: str) -> Path | None:
+		"""Return the directory for type output. If export_to_root is set, always use the root types dir."""
+		types_path = self.get_types_path(app_name)
+		if not types_path:
+			return None
+		return self.ensure_dir(types_path / to_ts_type(module_name))
+
+	def get_doctype_map_path(self, app_name: str) -> Path | None:
+		"""Return the directory `DocTypeMap.d.ts` of *app_name* is written to."""
+		if self.settings.get("export_to_root"):
+			root_path = self.settings.get("root_output_path", "types")
+			base_path = Path(os.path.join(self.base_output_path, root_path))
+			if not base_path.is_absolute():
+				base_path = self.bench_root / root_path
+			return self.ensure_dir(base_path)
+
+		return self.get_types_path(app_name)
+
+	def _resolve_types_path(self, app_name: str) -> Path | None:
+		if self.settings.get("export_to_root"):
+			# Determine root output path
+			root_path = self.settings.get("root_output_path", "types")
+			path_obj = Path(os.path.join(self.base_output_path, root_path, self.app_name))
+
+			# If relative, assume bench root
+			if not path_obj.is_absolute():
+				path_obj = self.bench_root / root_path
+
+			return self.ensure_dir(path_obj)
+
+		app_path = Path(self.base_output_path) / app_name
+		if not app_path.exists():
+			get_logger().warning("App path %s does not exist - ignoring type generation", app_path)
+			return None
+
+		# Look-up path in Type Generation Settings
+		type_setting = next(
+			(ts for ts in self.settings.get("type_settings", []) if ts["app_name"] == app_name), None
+		)
+		if not type_setting:
+			return None
+
+		types_path = self.ensure_dir(app_path / type_setting["app_path"] / "types")
+		self._additional_targets[types_path] = [
+			self.ensure_dir(app_path / target_path / "types")
+			for target_path in (type_setting.get("additional_app_paths") or "").splitlines()
+			if target_path.strip()
+		]
+		return types_path
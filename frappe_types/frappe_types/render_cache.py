@@ -0,0 +1,137 @@
+"""On-disk, content-addressed cache of rendered DocType interfaces.
+
+Entries are keyed by a hash of the DocType's schema record, the resolved child
+table types and the generator version, so that benches and sites running the
+same apps at the same commit can reuse each other's renders. The cache
+directory is shared through the ``frappe_types_render_cache_dir`` key of
+*site_config* / *common_site_config*; its size is bounded by
+``frappe_types_render_cache_max_size`` (MB), evicting least recently used
+entries first.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import frappe
+
+from frappe_types import __version__
+
+# Bump whenever the rendered output changes for an identical schema
+RENDER_FORMAT_VERSION = 2
+DEFAULT_MAX_SIZE_MB = 256
+
+# Fraction of the maximum size the cache is trimmed down to on eviction
+EVICTION_TARGET = 0.8
+
+
+def get_render_key(schema: dict, context: dict) -> str:
+	"""Hash the schema record of a DocType with everything else its render depends on."""
+	payload = json.dumps(
+		{
+			"generator": f"{__version__}/{RENDER_FORMAT_VERSION}",
+			"schema": schema,
+			"context": context,
+		},
+		sort_keys=True,
+		separators=(",", ":"),
+		default=str,
+	)
+	return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class RenderCache:
+	def __init__(self, directory: Path, max_size: int) -> None:
+		self.directory = directory
+		self.max_size = max_size
+		self.hits = 0
+		self.misses = 0
+		self._size: int | None = None
+
+	@classmethod
+	def from_conf(cls) -> "RenderCache | None":
+		"""Return the cache configured in site config, if any."""
+		directory = frappe.conf.get("frappe_types_render_cache_dir")
+		if not directory:
+			return None
+
+		max_size_mb = frappe.conf.get("frappe_types_render_cache_max_size") or DEFAULT_MAX_SIZE_MB
+		return cls(Path(directory).expanduser(), int(max_size_mb) * 1024 * 1024)
+
+	def get_key(self, schema: dict, context: dict) -> str:
+		return get_render_key(schema, context)
+
+	def get(self, key: str) -> tuple[list[str], str] | None:
+		path = self._get_path(key)
+		try:
+			entry = json.loads(path.read_text())
+		except (OSError, ValueError):
+			self.misses += 1
+			return None
+
+		# Refresh the entry's mtime, which eviction uses as its last access time
+		try:
+			os.utime(path)
+		except OSError:
+			pass
+
+		self.hits += 1
+		return entry["imports"], entry["interface"]
+
+	def put(self, key: str, rendered: tuple[list[str], str]):
+		imports, interface = rendered
+		content = json.dumps({"imports": imports, "interface": interface}).encode()
+		path = self._get_path(key)
+		path.parent.mkdir(parents=True, exist_ok=True)
+
+		# Write atomically, other benches may read the same entry concurrently
+		fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+		try:
+			with os.fdopen(fd, "wb") as f:
+				f.write(content)
+			os.replace(tmp_path, path)
+		except OSError:
+			Path(tmp_path).unlink(missing_ok=True)
+			return
+
+		if self._size is None:
+			self._size = self._get_total_size()
+		else:
+			self._size += len(content)
+
+		if self._size > self.max_size:
+			self.evict()
+
+	def evict(self):
+		"""Delete least recently used entries until the cache fits its target size."""
+		entries = []
+		for path in self.directory.glob("*/*.json"):
+			try:
+				stat = path.stat()
+			except OSError:
+				continue
+			entries.append((stat.st_mtime, stat.st_size, path))
+
+		size = sum(entry_size for _, entry_size, _ in entries)
+		target = self.max_size * EVICTION_TARGET
+		for _, entry_size, path in sorted(entries):
+			if size <= target:
+				break
+			path.unlink(missing_ok=True)
+			size -= entry_size
+
+		self._size = size
+
+	def _get_path(self, key: str) -> Path:
+		return self.directory / key[:2] / f"{key}.json"
+
+	def _get_total_size(self) -> int:
+		size = 0
+		for path in self.directory.glob("*/*.json"):
+			try:
+				size += path.stat().st_size
+			except OSError:
+				continue
+		return size
@@ -0,0 +1,207 @@
+"""Logging and progress reporting for type generation runs."""
+
+import logging
+import sys
+import time
+import traceback
+from contextlib import contextmanager
+
+logger = logging.getLogger("frappe_types")
+
+
+def get_logger() -> logging.Logger:
+	"""Return the frappe_types logger, writing plain messages to stdout by default."""
+	if not logger.handlers:
+		handler = logging.StreamHandler(sys.stdout)
+		handler.setFormatter(logging.Formatter("%(message)s"))
+		logger.addHandler(handler)
+		logger.setLevel(logging.INFO)
+		logger.propagate = False
+	return logger
+
+
+def configure_logging(quiet: bool = False, verbose: bool = False):
+	"""Only log warnings and errors when *quiet*; include per-DocType messages when *verbose*."""
+	level = logging.WARNING if quiet else logging.DEBUG if verbose else logging.INFO
+	get_logger().setLevel(level)
+
+
+class GenerationResult:
+	"""Outcome of `TypeGenerator.generate_many`, by DocType."""
+
+	WRITTEN = "written"
+	UNCHANGED = "unchanged"
+	SKIPPED = "skipped"
+	FAILED = "failed"
+
+	def __init__(self) -> None:
+		self.statuses: dict[str, str] = {}
+		self.errors: dict[str, str] = {}
+
+	def add(self, doctype: str, status: str, error: str | None = None):
+		# A child table written on demand is not "unchanged" when its own turn comes
+		if status == self.UNCHANGED and self.statuses.get(doctype) == self.WRITTEN:
+			return
+		self.statuses[doctype] = status
+		if error:
+			self.errors[doctype] = error
+
+	@property
+	def written(self) -> list[str]:
+		"""DocTypes whose declaration file was created or changed."""
+		return self._get(self.WRITTEN)
+
+	@property
+	def unchanged(self) -> list[str]:
+		"""DocTypes whose declaration file already held the generated types."""
+		return self._get(self.UNCHANGED)
+
+	@property
+	def skipped(self) -> list[str]:
+		"""DocTypes types are not generated for, e.g. virtual DocTypes."""
+		return self._get(self.SKIPPED)
+
+	@property
+	def failed(self) -> dict[str, str]:
+		"""Error of each DocType that could not be generated."""
+		return {doctype: self.errors.get(doctype, "") for doctype in self._get(self.FAILED)}
+
+	def _get(self, status: str) -> list[str]:
+		return [doctype for doctype, doctype_status in self.statuses.items() if doctype_status == status]
+
+
+class GenerationReport:
+	"""Progress, throughput and failures of a generation run.
+
+	On interactive terminals a single progress line with DocTypes/sec and ETA is
+	redrawn in place. Failures are collected for an end-of-run summary table
+	instead of printing tracebacks inline; tracebacks are logged at debug level.
+	"""
+
+	# Minimum number of seconds between two redraws of the progress line
+	REDRAW_INTERVAL = 0.1
+
+	def __init__(self, stream=None) -> None:
+		self.stream = stream or sys.stderr
+		self.total = 0
+		self.done = 0
+		self.failures: list[tuple[str, str]] = []
+		# What is being generated, e.g. the app during an export of all apps
+		self.current: str | None = None
+		# Named counters, e.g. render cache hits / misses
+		self.counters: dict[str, int] = {}
+		# Seconds spent in each phase (load, render, write...), excluding nested phases
+		self.timings: dict[str, float] = {}
+		self._phases: list[list] = []
+		self.started_at = time.monotonic()
+		self._last_redraw = 0.0
+		self._progress_drawn = False
+
+	def add_total(self, count: int):
+		self.total += count
+
+	def advance(self, count: int = 1):
+		self.done += count
+		self._draw_progress()
+
+	def set_current(self, name: str | None):
+		self.current = name
+
+	def count(self, name: str, value: int = 1):
+		self.counters[name] = self.counters.get(name, 0) + value
+
+	@contextmanager
+	def measure(self, phase: str):
+		"""Add the time spent in the block to *phase*, minus the time of the phases nested in it."""
+		start = time.perf_counter()
+		if self._phases:
+			outer = self._phases[-1]
+			self._add_timing(outer[0], start - outer[1])
+		self._phases.append([phase, start])
+		try:
+			yield
+		finally:
+			end = time.perf_counter()
+			# The start of a phase is moved forward whenever a nested phase ends
+			_, resumed_at = self._phases.pop()
+			self._add_timing(phase, end - resumed_at)
+			if self._phases:
+				self._phases[-1][1] = end
+
+	def _add_timing(self, phase: str, seconds: float):
+		self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+	def add_failure(self, name: str, exc: BaseException):
+		self.failures.append((name, f"{type(exc).__name__}: {exc}"))
+		get_logger().debug(
+			"Failed to generate types for %s\n%s", name, "".join(traceback.format_exception(exc))
+		)
+
+	@property
+	def elapsed(self) -> float:
+		return time.monotonic() - self.started_at
+
+	def summary(self):
+		"""Log the end-of-run summary, followed by the table of failures if any."""
+		self._clear_progress()
+		elapsed = self.elapsed
+		rate = self.done / elapsed if elapsed else 0.0
+		get_logger().info(
+			"Processed %d DocTypes in %.1fs (%.1f DocTypes/sec), %d failed",
+			self.done,
+			elapsed,
+			rate,
+			len(self.failures),
+		)
+		if "render_cache_hits" in self.counters or "render_cache_misses" in self.counters:
+			get_logger().info(
+				"Render cache: %d hits, %d misses",
+				self.counters.get("render_cache_hits", 0),
+				self.counters.get("render_cache_misses", 0),
+			)
+		self.log_failures()
+
+	def log_failures(self):
+		if not self.failures:
+			return
+
+		self._clear_progress()
+		width = max(len("DocType / Module"), *(len(name) for name, _ in self.failures))
+		lines = [
+			f"{len(self.failures)} failure(s):",
+			f"  {'DocType / Module'.ljust(width)}  Error",
+			f"  {'-' * width}  -----",
+		]
+		lines.extend(f"  {name.ljust(width)}  {error}" for name, error in self.failures)
+		get_logger().error("\n".join(lines))
+
+	def _show_progress(self) -> bool:
+		isatty = getattr(self.stream, "isatty", None)
+		return bool(isatty and isatty()) and get_logger().isEnabledFor(logging.INFO)
+
+	def _draw_progress(self):
+		if not self._show_progress():
+			return
+
+		now = time.monotonic()
+		if now - self._last_redraw < self.REDRAW_INTERVAL and self.done < self.total:
+			return
+		self._last_redraw = now
+
+		elapsed = now - self.started_at
+		rate = self.done / elapsed if elapsed else 0.0
+		line = f"{self.done}/{self.total or '?'} DocTypes  {rate:.1f}/s"
+		if rate and self.total > self.done:
+			line += f"  ETA {(self.total - self.done) / rate:.0f}s"
+		if self.failures:
+			line += f"  {len(self.failures)} failed"
+
+		self.stream.write(f"\r\033[K{line}")
+		self.stream.flush()
+		self._progress_drawn = True
+
+	def _clear_progress(self):
+		if self._progress_drawn:
+			self.stream.write("\r\033[K")
+			self.stream.flush()
+			self._progress_drawn = False
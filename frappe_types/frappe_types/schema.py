@@ -0,0 +1,162 @@
+"""Schema records for type generation, with site customizations overlaid in bulk.
+
+`frappe.get_meta` merges Custom Fields and Property Setters into a full Meta
+object one DocType at a time. For type generation only a handful of
+attributes matter, so `CustomizationOverlay` loads the customizations of many
+DocTypes in a few queries and merges them into lightweight schema records.
+"""
+
+import json
+from collections import defaultdict
+from collections.abc import Iterable
+
+import frappe
+from frappe.utils import cint, flt
+
+# Attributes of a DocType / DocField the type generator relies on
+DOCTYPE_PROPERTIES = ("name", "module", "custom", "istable", "issingle", "is_virtual", "naming_rule")
+FIELD_PROPERTIES = ("fieldname", "fieldtype", "label", "options", "description", "reqd")
+
+# Number of DocType names per `IN (...)` query
+QUERY_BATCH_SIZE = 500
+
+
+def to_schema(doctype) -> frappe._dict:
+	"""Return the schema record of a DocType document (or Meta)."""
+	schema = frappe._dict({prop: doctype.get(prop) for prop in DOCTYPE_PROPERTIES})
+	schema.fields = [to_field_schema(field) for field in doctype.fields]
+	return schema
+
+
+def to_field_schema(field) -> frappe._dict:
+	return frappe._dict({prop: field.get(prop) for prop in FIELD_PROPERTIES})
+
+
+def load_schemas(doctypes: list[str]) -> dict[str, frappe._dict]:
+	"""Return the schema records of *doctypes* (without customizations), loaded with
+	two queries per ``QUERY_BATCH_SIZE`` DocTypes instead of a `frappe.get_doc` each."""
+	schemas: dict[str, frappe._dict] = {}
+	for start in range(0, len(doctypes), QUERY_BATCH_SIZE):
+		batch = doctypes[start : start + QUERY_BATCH_SIZE]
+		for row in frappe.get_all(
+			"DocType", filters={"name": ("in", batch)}, fields=list(DOCTYPE_PROPERTIES)
+		):
+			row.fields = []
+			schemas[row.name] = row
+
+		for field in frappe.get_all(
+			"DocField",
+			filters={"parent": ("in", batch), "parenttype": "DocType"},
+			fields=["parent", *FIELD_PROPERTIES],
+			order_by="idx asc",
+		):
+			schema = schemas.get(field.pop("parent"))
+			if schema:
+				schema.fields.append(field)
+	return schemas
+
+
+class CustomizationOverlay:
+	"""Custom Fields and Property Setters of a set of DocTypes, loaded in bulk."""
+
+	def __init__(self) -> None:
+		self.custom_fields: dict[str, list[frappe._dict]] = defaultdict(list)
+		self.property_setters: dict[str, list[frappe._dict]] = defaultdict(list)
+		self._loaded: set[str] = set()
+
+	def prefetch(self, doctypes: Iterable[str]):
+		"""Load the customizations of every DocType in *doctypes* not loaded yet."""
+		pending = sorted(set(doctypes) - self._loaded)
+		for start in range(0, len(pending), QUERY_BATCH_SIZE):
+			batch = pending[start : start + QUERY_BATCH_SIZE]
+
+			for field in frappe.get_all(
+				"Custom Field",
+				filters={"dt": ("in", batch)},
+				fields=["dt", "insert_after", *FIELD_PROPERTIES],
+				order_by="idx asc, creation asc",
+			):
+				self.custom_fields[field.pop("dt")].append(field)
+
+			for prop in frappe.get_all(
+				"Property Setter",
+				filters={"doc_type": ("in", batch)},
+				fields=["doc_type", "doctype_or_field", "field_name", "property", "property_type", "value"],
+				order_by="creation asc",
+			):
+				self.property_setters[prop.doc_type].append(prop)
+
+		self._loaded.update(pending)
+
+	def invalidate(self, doctype: str):
+		"""Forget the customizations of *doctype*, so they are reloaded on next use."""
+		self._loaded.discard(doctype)
+		self.custom_fields.pop(doctype, None)
+		self.property_setters.pop(doctype, None)
+
+	def clear(self):
+		"""Forget all loaded customizations, e.g. once a module has been generated."""
+		self._loaded.clear()
+		self.custom_fields.clear()
+		self.property_setters.clear()
+
+	def apply(self, doctype) -> frappe._dict:
+		"""Return the schema record of *doctype* with its customizations merged in."""
+		self.prefetch([doctype.name])
+		schema = to_schema(doctype)
+
+		# Like frappe.get_meta, place the fields over several passes, so that a field can be
+		# inserted after a custom field placed later in the list; the others go at the end
+		pending = list(self.custom_fields.get(doctype.name, []))
+		while pending:
+			remaining = []
+			for custom_field in pending:
+				position = _get_field_index(schema.fields, custom_field.insert_after)
+				if position is None:
+					remaining.append(custom_field)
+				else:
+					schema.fields.insert(position + 1, to_field_schema(custom_field))
+			if len(remaining) == len(pending):
+				schema.fields.extend(to_field_schema(custom_field) for custom_field in remaining)
+				break
+			pending = remaining
+
+		for prop in self.property_setters.get(doctype.name, []):
+			value = _cast_property_value(prop)
+			if prop.doctype_or_field == "DocType":
+				if prop.property == "field_order":
+					schema.fields = _sort_fields(schema.fields, value)
+				else:
+					schema[prop.property] = value
+				continue
+
+			index = _get_field_index(schema.fields, prop.field_name)
+			if index is not None:
+				schema.fields[index][prop.property] = value
+
+		return schema
+
+
+def _get_field_index(fields: list[frappe._dict], fieldname: str | None) -> int | None:
+	if not fieldname:
+		return None
+	return next((i for i, field in enumerate(fields) if field.fieldname == fieldname), None)
+
+
+def _cast_property_value(prop: frappe._dict):
+	if prop.property_type in {"Check", "Int"}:
+		return cint(prop.value)
+	if prop.property_type in {"Float", "Currency", "Percent"}:
+		return flt(prop.value)
+	if prop.property == "field_order":
+		try:
+			return json.loads(prop.value or "[]")
+		except ValueError:
+			return []
+	return prop.value
+
+
+def _sort_fields(fields: list[frappe._dict], field_order: list[str]) -> list[frappe._dict]:
+	"""Order fields like the `field_order` Property Setter, keeping unlisted ones at the end."""
+	positions = {fieldname: i for i, fieldname in enumerate(field_order)}
+	return sorted(fields, key=lambda field: positions.get(field.fieldname, len(positions)))
@@ -0,0 +1,142 @@
+"""Select the DocTypes to generate from names and patterns.
+
+A selector is either a DocType name, a glob pattern (``Sales *``) or a
+regular expression prefixed with ``re:`` (``re:^(Sales|Purchase) Invoice``).
+All selectors are resolved against a single query of the DocType names.
+
+The selection can then be extended with the DocTypes its Link and Table
+fields point to (`expand_link_targets`), so that they are generated too.
+"""
+
+import fnmatch
+import re
+from collections.abc import Callable
+from pathlib import Path
+
+import frappe
+
+from .schema import QUERY_BATCH_SIZE
+
+REGEX_PREFIX = "re:"
+GLOB_CHARACTERS = frozenset("*?[")
+
+# Field types whose options name another DocType
+LINK_FIELD_TYPES = ("Link", "Table", "Table MultiSelect")
+
+
+def read_selectors(path: Path) -> list[str]:
+	"""Read one selector per line from *path*, ignoring blank lines and ``#`` comments."""
+	selectors = []
+	for line in path.read_text().splitlines():
+		line = line.strip()
+		if line and not line.startswith("#"):
+			selectors.append(line)
+	return selectors
+
+
+def resolve_doctypes(selectors: list[str]) -> tuple[list[str], list[str]]:
+	"""Return the DocTypes matching any of *selectors*, child tables first, and
+	the selectors that matched none."""
+	if not selectors:
+		return [], []
+
+	names: set[str] = set()
+	matchers: list[tuple[str, Callable]] = []
+	for selector in selectors:
+		if selector.startswith(REGEX_PREFIX):
+			matchers.append((selector, re.compile(selector[len(REGEX_PREFIX) :]).search))
+		elif GLOB_CHARACTERS & set(selector):
+			matchers.append((selector, re.compile(fnmatch.translate(selector)).match))
+		else:
+			names.add(selector)
+
+	filters = None if matchers else {"name": ("in", sorted(names))}
+	doctypes = frappe.get_all("DocType", filters=filters, pluck="name", order_by="istable desc, name asc")
+
+	matched: set[str] = set()
+	selected = []
+	for doctype in doctypes:
+		hits = [selector for selector, match in matchers if match(doctype)]
+		if doctype in names:
+			hits.append(doctype)
+		if hits:
+			matched.update(hits)
+			selected.append(doctype)
+
+	unmatched = [selector for selector in selectors if selector not in matched]
+	return selected, unmatched
+
+
+def expand_link_targets(
+	doctypes: list[str], depth: int, custom_fields: bool = False, modules: list[str] | None = None
+) -> list[str]:
+	"""Return the DocTypes reachable from *doctypes* through Link and Table fields in at most *depth* steps.
+
+	The closure is expanded breadth first: the targets of a whole level are
+	fetched with one query per ``QUERY_BATCH_SIZE`` DocTypes (plus one for
+	their Custom Fields, with *custom_fields*), and DocTypes reached before are
+	not expanded again. Targets are returned level by level, without
+	*doctypes*; they may not exist, e.g. Links to DocTypes of apps not installed.
+
+	With *modules*, targets outside them (e.g. core DocTypes such as User) are
+	neither returned nor expanded, and neither are those that do not exist,
+	at the cost of one more query per level.
+	"""
+	visited = set(doctypes)
+	targets: list[str] = []
+	level = sorted(visited)
+	for _ in range(depth):
+		found: set[str] = set()
+		for start in range(0, len(level), QUERY_BATCH_SIZE):
+			batch = level[start : start + QUERY_BATCH_SIZE]
+			found.update(
+				frappe.get_all(
+					"DocField",
+					filters={
+						"parent": ("in", batch),
+						"parenttype": "DocType",
+						"fieldtype": ("in", LINK_FIELD_TYPES),
+					},
+					pluck="options",
+					distinct=True,
+				)
+			)
+			if custom_fields:
+				found.update(
+					frappe.get_all(
+						"Custom Field",
+						filters={"dt": ("in", batch), "fieldtype": ("in", LINK_FIELD_TYPES)},
+						pluck="options",
+						distinct=True,
+					)
+				)
+
+		level = sorted({target.strip() for target in found if target} - visited)
+		visited.update(level)
+		if modules is not None:
+			level = _filter_by_module(level, modules)
+		if not level:
+			break
+		targets.extend(level)
+	return targets
+
+
+def _filter_by_module(doctypes: list[str], modules: list[str]) -> list[str]:
+	"""Return the DocTypes of *doctypes* that belong to one of *modules*."""
+	if not modules:
+		return []
+
+	selected = []
+	for start in range(0, len(doctypes), QUERY_BATCH_SIZE):
+		selected.extend(
+			frappe.get_all(
+				"DocType",
+				filters={
+					"name": ("in", doctypes[start : start + QUERY_BATCH_SIZE]),
+					"module": ("in", modules),
+				},
+				pluck="name",
+				order_by="name asc",
+			)
+		)
+	return selected
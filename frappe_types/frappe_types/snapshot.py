@@ -0,0 +1,224 @@
+"""Schema snapshots, to generate types without a connection to the site.
+
+`export_schema` dumps the schema records of the DocTypes of every configured
+app, with their Custom Fields and Property Setters merged in, to a gzipped
+JSON lines file: a header line with the Type Generation Settings and an index
+of all DocTypes, then one line per DocType. Child tables come first, so that
+`generate_from_snapshot` renders the whole file in a single streaming pass.
+"""
+
+import gzip
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import frappe
+from frappe.utils import get_bench_path
+
+from .reporting import GenerationReport
+from .schema import QUERY_BATCH_SIZE, CustomizationOverlay, load_schemas
+from .type_generator import TypeGenerationMethod, TypeGenerator
+
+SNAPSHOT_FORMAT = "frappe-types-schema"
+SNAPSHOT_VERSION = 1
+
+# Type Generation Settings that affect the output, and so are part of a snapshot
+SNAPSHOT_SETTINGS = (
+	"include_custom_doctypes",
+	"export_to_root",
+	"root_output_path",
+	"output_layout",
+	"generate_tsconfig",
+)
+SNAPSHOT_APP_SETTINGS = ("app_name", "app_path", "additional_app_paths", "python_types")
+
+
+def export_schema(path: Path) -> int:
+	"""Write the schema snapshot of the configured apps to *path*. Returns the number of DocTypes."""
+	settings = frappe.get_doc("Type Generation Settings").as_dict()
+	type_settings = [
+		{key: ts.get(key) for key in SNAPSHOT_APP_SETTINGS} for ts in settings.get("type_settings", [])
+	]
+	modules = {
+		module.name: module.app_name
+		for module in frappe.get_all(
+			"Module Def",
+			filters={"app_name": ("in", [ts["app_name"] for ts in type_settings])},
+			fields=["name", "app_name"],
+			order_by="name asc",
+		)
+	}
+	doctypes = []
+	if modules:
+		doctypes = frappe.get_all(
+			"DocType",
+			filters={"module": ("in", list(modules))},
+			fields=["name", "module"],
+			order_by="istable desc, name asc",
+		)
+
+	header = {
+		"format": SNAPSHOT_FORMAT,
+		"version": SNAPSHOT_VERSION,
+		"site": frappe.local.site,
+		"settings": {key: settings.get(key) for key in SNAPSHOT_SETTINGS} | {"type_settings": type_settings},
+		"modules": modules,
+		"doctypes": {doctype.name: doctype.module for doctype in doctypes},
+	}
+
+	# Written next to the target and moved into place, so a failed export leaves no partial snapshot
+	path.parent.mkdir(parents=True, exist_ok=True)
+	tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+	customizations = CustomizationOverlay()
+	try:
+		with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+			_write_line(f, header)
+			for start in range(0, len(doctypes), QUERY_BATCH_SIZE):
+				batch = doctypes[start : start + QUERY_BATCH_SIZE]
+				schemas = load_schemas([doctype.name for doctype in batch])
+				customizations.prefetch(schemas)
+				for doctype in batch:
+					schema = customizations.apply(schemas.pop(doctype.name))
+					_write_line(f, {"app": modules[doctype.module], "schema": schema})
+				customizations.clear()
+		os.replace(tmp_path, path)
+	finally:
+		tmp_path.unlink(missing_ok=True)
+
+	return len(doctypes)
+
+
+def _write_line(f, record: dict):
+	f.write(json.dumps(record, separators=(",", ":"), default=str))
+	f.write("\n")
+
+
+class SchemaSnapshot:
+	"""A schema snapshot written by `export_schema`. Only the header is held in memory."""
+
+	def __init__(self, path: Path) -> None:
+		self.path = path
+		with gzip.open(path, "rt", encoding="utf-8") as f:
+			header = json.loads(f.readline() or "{}")
+
+		if header.get("format") != SNAPSHOT_FORMAT:
+			raise ValueError(f"{path} is not a schema snapshot")
+		if header.get("version") != SNAPSHOT_VERSION:
+			raise ValueError(
+				f"Schema snapshot {path} has version {header.get('version')}, "
+				f"expected {SNAPSHOT_VERSION}: export it again"
+			)
+
+		self.site: str | None = header.get("site")
+		self.settings: dict = header["settings"]
+		# Module name → app name
+		self.modules: dict[str, str] = header["modules"]
+		# DocType name → module name
+		self.doctypes: dict[str, str] = header["doctypes"]
+
+	def iter_doctypes(self) -> Iterator[tuple[str, frappe._dict]]:
+		"""Yield the `(app_name, schema)` of every DocType, child tables first."""
+		with gzip.open(self.path, "rt", encoding="utf-8") as f:
+			f.readline()
+			for line in f:
+				record = json.loads(line)
+				schema = frappe._dict(record["schema"])
+				schema.fields = [frappe._dict(field) for field in schema.fields]
+				yield record["app"], schema
+
+
+class SnapshotTypeGenerator(TypeGenerator):
+	"""Type generator reading DocTypes and settings from a `SchemaSnapshot`
+	instead of the database.
+
+	DocTypes are fed one at a time by `generate_from_snapshot`. Child tables
+	are never generated on demand: they come first in the snapshot, so their
+	files exist by the time a DocType imports them.
+	"""
+
+	def __init__(self, app_name: str, snapshot: SchemaSnapshot, **kwargs) -> None:
+		self.snapshot = snapshot
+		self._current: frappe._dict | None = None
+		super().__init__(app_name, **kwargs)
+		self.generate_child_tables = False
+		# The apps of a snapshot may not be installed on this bench
+		self.paths._bench_root = Path(get_bench_path())
+
+	def generate_schema(self, schema: frappe._dict):
+		"""Generate the type definition file of the DocType *schema*."""
+		self._current = schema
+		try:
+			self.generate_doctype(schema.name)
+		finally:
+			self._current = None
+
+	def _get_type_generation_settings(self) -> dict:
+		return self.snapshot.settings
+
+	def _can_generate(self, doctype) -> bool:
+		# Nothing can change under a snapshot, so developer mode and the pause flag do not apply
+		return self._is_valid_doctype(doctype)
+
+	def _load_doctype(self, doctype: str) -> frappe._dict:
+		if not self._current or self._current.name != doctype:
+			raise frappe.DoesNotExistError(f"DocType {doctype} is not being generated from the snapshot")
+		return self._current
+
+	def _get_imports_for_table_fields(self, field, doctype, module_path: Path) -> tuple[str, str | None]:
+		# Child tables of other apps (e.g. frappe's Has Role) are not in the snapshot, and never
+		# generated from it: they are typed `any`, as when generating from the database
+		if field.fieldtype in {"Table", "Table MultiSelect"} and field.options not in self.snapshot.doctypes:
+			return "any", ""
+		return super()._get_imports_for_table_fields(field, doctype, module_path)
+
+	def _get_doctype_info(self, doctype: str) -> frappe._dict:
+		module = self.snapshot.doctypes.get(doctype)
+		if not module:
+			raise frappe.DoesNotExistError(f"DocType {doctype} is not in the schema snapshot")
+		return frappe._dict(name=doctype, module=module)
+
+
+def generate_from_snapshot(
+	path: Path, base_output_path: str | None = None, report: GenerationReport | None = None
+) -> GenerationReport:
+	"""Generate the types of every app of the snapshot at *path*, like `export_all_apps`,
+	without connecting to a site."""
+	snapshot = SchemaSnapshot(path)
+	report = report or GenerationReport()
+	settings = snapshot.settings
+	root = SnapshotTypeGenerator("", snapshot, report=report, base_output_path=base_output_path)
+	if root._is_bundled():
+		# Bundles hold whole modules, which a single pass over the DocTypes cannot provide
+		raise ValueError(
+			"Generating from a schema snapshot is only supported with the Per DocType layout, "
+			f"not {root.output_layout.value}"
+		)
+
+	report.add_total(len(snapshot.doctypes))
+	generators: dict[str, SnapshotTypeGenerator] = {}
+	for app_name, schema in snapshot.iter_doctypes():
+		report.set_current(app_name)
+		generator = generators.get(app_name)
+		if not generator:
+			generator = SnapshotTypeGenerator(
+				app_name, snapshot, report=report, base_output_path=base_output_path
+			)
+			generator.type_generation_method = TypeGenerationMethod.ALL_APPS
+			# Apps exported to root share one `types` directory, and so one manifest
+			generator._manifests = root._manifests
+			generators[app_name] = generator
+		generator.generate_schema(schema)
+
+	for generator in generators.values():
+		if settings.get("export_to_root"):
+			root.doctype_map.extend(generator.doctype_map)
+			for module_dir, references in generator._module_references.items():
+				root._module_references.setdefault(module_dir, set()).update(references)
+		else:
+			generator._write_doctype_map()
+	if settings.get("export_to_root"):
+		root._write_doctype_map()
+
+	root._save_manifests()
+	return report
@@ -0,0 +1,86 @@
+"""TypeScript project references for the generated `types/<Module>/` folders.
+
+Every module folder becomes a `composite` project that references the modules
+its child-table imports point to, and the `types` folder gets a solution
+config referencing every module, so that `tsc --build` only re-checks the
+modules whose declarations changed.
+"""
+
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+from .utils import create_file
+
+TSCONFIG_FILE = "tsconfig.json"
+TSCONFIG_BASE_FILE = "tsconfig.base.json"
+
+BASE_COMPILER_OPTIONS = {
+	"composite": True,
+	"declaration": True,
+	"emitDeclarationOnly": True,
+}
+
+
+def write_module_tsconfig(module_dir: Path, references: set[Path], write: Callable = create_file) -> bool:
+	"""Write the project config of a single module folder.
+
+	References already present in an existing config are kept, since a
+	single-DocType run only sees the imports of the DocTypes it rendered.
+	Files are written with *write*, which takes the same arguments as ``create_file``.
+	"""
+	config_path = module_dir / TSCONFIG_FILE
+	reference_paths = _get_existing_references(config_path)
+	reference_paths.update(_relative_path(module_dir, ref) for ref in references if ref != module_dir)
+
+	config = {
+		"extends": f"../{TSCONFIG_BASE_FILE}",
+		"compilerOptions": {"composite": True},
+		"include": ["*.d.ts"],
+		"references": [{"path": path} for path in sorted(reference_paths)],
+	}
+	return write(config_path, _dump(config))
+
+
+def write_solution_tsconfig(types_dir: Path, module_dirs: set[Path], write: Callable = create_file) -> bool:
+	"""Write the root solution config of a `types` folder, referencing every module project."""
+	base_path = types_dir / TSCONFIG_BASE_FILE
+	# The base config is only created once, so that it can be customised (e.g. `types`, `lib`)
+	write(base_path, _dump({"compilerOptions": BASE_COMPILER_OPTIONS}), overwrite=False)
+
+	config_path = types_dir / TSCONFIG_FILE
+	reference_paths = _get_existing_references(config_path)
+	reference_paths.update(_relative_path(types_dir, module_dir) for module_dir in module_dirs)
+
+	config = {
+		"files": [],
+		"references": [{"path": path} for path in sorted(reference_paths)],
+	}
+	return write(config_path, _dump(config))
+
+
+def _get_existing_references(config_path: Path) -> set[str]:
+	if not config_path.exists():
+		return set()
+
+	try:
+		config = json.loads(config_path.read_text())
+	except ValueError:
+		return set()
+
+	# Drop references to module folders that no longer exist
+	return {
+		ref["path"]
+		for ref in config.get("references", [])
+		if ref.get("path") and (config_path.parent / ref["path"]).is_dir()
+	}
+
+
+def _relative_path(from_dir: Path, to_dir: Path) -> str:
+	path = Path(os.path.relpath(to_dir, from_dir)).as_posix()
+	return path if path.startswith(".") else f"./{path}"
+
+
+def _dump(config: dict) -> str:
+	return json.dumps(config, indent="\t") + "\n"
@@ -1,5 +1,9 @@
+import logging
 import os
+import re
 import subprocess
+import time
+from collections.abc import Iterable
 from enum import Enum
 from pathlib import Path
 
@@ -7,15 +11,45 @@ import frappe
 from frappe.core.doctype.docfield.docfield import DocField
 from frappe.core.doctype.doctype.doctype import DocType
 
-from .utils import create_file, get_bench_root_path, is_developer_mode_enabled, to_ts_type
+from .api_types import WhitelistScanner, render_api_types
+from .checkpoint import ExportCheckpoint
+from .emitters import EMITTERS, Emitter
+from .hook_guards import get_configured_apps, is_configured_module, is_generation_enabled
+from .latency import timed_hook
+from .locking import FileLock, get_lock, get_stamp, get_striped_lock
+from .manifest import Manifest
+from .metrics import record_run
+from .packages import (
+	CORE_APPS,
+	CorePackage,
+	PackagePathResolver,
+	link_package_entry,
+	unlink_package_entry,
+)
+from .paths import OutputPathResolver
+from .render_cache import RenderCache, get_render_key
+from .reporting import GenerationReport, GenerationResult, get_logger
+from .schema import QUERY_BATCH_SIZE, CustomizationOverlay, load_schemas, to_schema
+from .selection import expand_link_targets
+from .tsconfig import write_module_tsconfig, write_solution_tsconfig
+from .utils import create_file, is_developer_mode_enabled, to_ts_type
 
 
 class TypeGenerationMethod(Enum):
 	DOCTYPES = "doctypes"
+	DOCTYPE_BATCH = "doctype_batch"
 	MODULES = "modules"
 	ALL_APPS = "all_apps"
 
 
+class OutputLayout(Enum):
+	"""How generated interfaces are grouped into declaration files."""
+
+	PER_DOCTYPE = "Per DocType"
+	PER_MODULE = "Per Module"
+	PER_APP = "Per App"
+
+
 class TypeGenerator:
 	"""Generator for TypeScript type definitions for DocTypes
 
@@ -30,7 +64,18 @@ class TypeGenerator:
 	    DocTypes encountered while processing the given DocType / module.
 	custom_fields: bool, default False
 	    When *True* the generator will include custom fields together with
-	    standard ones
+	    standard ones. Custom Fields and Property Setters are loaded in bulk
+	    per module / app and merged into the schema (see ``CustomizationOverlay``).
+	prune: bool, default False
+	    When *True*, module and all-apps runs delete the files generated by
+	    earlier runs that are no longer produced (deleted / renamed DocTypes),
+	    as recorded in each `types` directory's manifest.
+	report: GenerationReport, optional
+	    Progress and failure report of the run, shared by the per-app
+	    generators of ``export_all_apps``.
+	base_output_path: str, optional
+	    Overrides the (hidden) Base Output Path of Type Generation Settings,
+	    e.g. ``""`` to ignore a path left behind by tests.
 	"""
 
 	def __init__(
@@ -39,26 +84,66 @@ class TypeGenerator:
 		*,
 		generate_child_tables: bool = False,
 		custom_fields: bool = False,
+		prune: bool = False,
+		report: GenerationReport | None = None,
+		base_output_path: str | None = None,
 	) -> None:
 		self.app_name = app_name
+		self.prune = prune
+		self.report = report or GenerationReport()
+		self.logger = get_logger()
+		# Messages logged at most once per generator (e.g. developer mode disabled)
+		self._logged_once: set[str] = set()
 		self.generate_child_tables = generate_child_tables
 		self.custom_fields = custom_fields
 		self.doctype_map = []
 		self.type_generation_method = None
+		self.customizations = CustomizationOverlay()
+		self.render_cache = RenderCache.from_conf()
+		# Bundles already written during this run, keyed by (app_name, module_name | None)
+		self._generated_bundles: set[tuple[str, str | None]] = set()
+		# Names of the DocTypes rendered into the bundle currently being written
+		self._bundle_doctypes: set[str] = set()
+		# Number of bundles being written, nested ones included (child tables of other bundles)
+		self._bundle_depth = 0
+		# Module folders written during this run → module folders they import child tables from
+		self._module_references: dict[Path, set[Path]] = {}
+		# Manifests of the `types` directories written to, keyed by directory
+		self._manifests: dict[Path, Manifest] = {}
+		# DocTypes left out of bundles, e.g. while they are being deleted
+		self._excluded_doctypes: set[str] = set()
+		# Modules that failed as a whole during this run (not just some of their DocTypes)
+		self._failed_modules: set[str] = set()
+		self._settings: dict | None = None
+		# Checkpoints of the export of all apps this generator is part of
+		self.checkpoint: ExportCheckpoint | None = None
+		# Outcome by DocType of the current `generate_many` call
+		self.result: GenerationResult | None = None
+		# Name, module and istable of the DocTypes looked up during this run, e.g. child tables
+		self._doctype_info: dict[str, frappe._dict] = {}
+		# Module name → app name
+		self._module_apps: dict[str, str | None] = {}
+		# Schema records of the current batch of `generate_many`, by DocType
+		self._schemas: dict[str, frappe._dict] = {}
 
 		settings = self._get_type_generation_settings()
-		base_output_path = settings.get("base_output_path")
+		self.output_layout = OutputLayout(settings.get("output_layout") or OutputLayout.PER_DOCTYPE.value)
+		self.generate_tsconfig = bool(settings.get("generate_tsconfig"))
+		if base_output_path is None:
+			base_output_path = settings.get("base_output_path")
 		if base_output_path:
 			self.base_output_path = base_output_path
 
 		should_export_to_root = settings.get("export_to_root")
 		if not should_export_to_root and not base_output_path:
-			print("Setting base output path to '../apps'")
+			self.logger.debug("Setting base output path to '../apps'")
 			self.base_output_path = "../apps"
 
 		if not hasattr(self, "base_output_path"):
 			self.base_output_path = ""
 
+		self.paths = OutputPathResolver(settings, self.base_output_path, app_name)
+
 	# ---------------------------------------------------------------------
 	# Public API
 	# ---------------------------------------------------------------------
@@ -68,102 +153,313 @@ class TypeGenerator:
 			self.type_generation_method = TypeGenerationMethod.DOCTYPES
 
 		try:
-			# custom_fields True means that the generate .d.ts file for custom fields with original fields
-			doc = frappe.get_meta(doctype) if self.custom_fields else frappe.get_doc("DocType", doctype)
+			doc = self._load_doctype(doctype)
 
 			if not self._can_generate(doc):
+				if self.result:
+					self.result.add(doc.name, GenerationResult.SKIPPED)
 				return
 
-			print("Generating type definition file for " + doc.name)
 			module_name = doc.module
 
+			if self._is_bundled():
+				# A bundle always holds every DocType of its module / app, so rewrite it whole
+				self._generate_bundle(self.app_name, module_name)
+				if self.type_generation_method == TypeGenerationMethod.DOCTYPES:
+					self._write_doctype_map()
+					self._save_manifests()
+				return
+
+			self.logger.debug("Generating type definition file for %s", doc.name)
+
 			module_path = self._get_module_path(self.app_name, module_name)
 			if module_path:
 				self._generate_type_definition_file(doc, module_path)
 				# Accumulate this DocType for the map
 				ts_name = to_ts_type(doc.name)
 				module_dir = to_ts_type(module_name)
-				self.doctype_map.append((doc.name, ts_name, module_dir))
+				self._add_doctype_map_entry((doc.name, ts_name, f"{module_dir}/{ts_name}"))
 				if self.type_generation_method == TypeGenerationMethod.DOCTYPES:
 					self._write_doctype_map()
+					self._save_manifests()
 
 		except Exception as e:
-			err_msg = f": {e!s}\n{frappe.get_traceback()}"
-			print(f"An error occurred while generating type for {doctype} {err_msg}")
+			self._add_failure(doctype, e)
+		finally:
+			# Bundles report their own progress, one step per DocType rendered
+			if not self._is_bundled():
+				self.report.advance()
+
+	def generate_many(self, doctypes: Iterable[str], link_depth: int = 0) -> GenerationResult:
+		"""Generate type definition files for several DocTypes in one run.
+
+		Use this rather than calling `generate_doctype` in a loop: the DocTypes
+		are looked up with one query per ``QUERY_BATCH_SIZE`` names and generated
+		child tables first, the schemas (DocType and DocField rows) and
+		customizations of each batch are loaded in bulk, child table and module
+		lookups are shared, and the DocTypeMap and manifests are written once at
+		the end.
+
+		With *link_depth*, the DocTypes that Link and Table fields point to are
+		generated too, up to that many links away from *doctypes* (see
+		`expand_link_targets`). Only targets of the apps in Type Generation
+		Settings are followed, so that e.g. the core DocTypes are not declared
+		again in every app.
+
+		Returns a `GenerationResult` listing the DocTypes whose files were
+		written, left unchanged, skipped or failed.
+		"""
+		self.type_generation_method = TypeGenerationMethod.DOCTYPE_BATCH
+		self.result = result = GenerationResult()
+		requested = list(dict.fromkeys(doctypes))
+		names = requested
+		if link_depth > 0:
+			configured_apps = sorted(get_configured_apps())
+			configured_modules = configured_apps and frappe.get_all(
+				"Module Def", filters={"app_name": ("in", configured_apps)}, pluck="name"
+			)
+			names = [
+				*requested,
+				*expand_link_targets(requested, link_depth, self.custom_fields, configured_modules),
+			]
+
+		# Child tables of the whole selection first, so that they are written before the
+		# DocTypes importing them, whichever batch they are in
+		rows = []
+		for start in range(0, len(names), QUERY_BATCH_SIZE):
+			rows.extend(
+				frappe.get_all(
+					"DocType",
+					filters={"name": ("in", names[start : start + QUERY_BATCH_SIZE])},
+					fields=["name", "module", "istable"],
+				)
+			)
+		rows.sort(key=lambda row: (not row.istable, row.name))
+		for row in rows:
+			self._doctype_info[row.name] = row
+		ordered = [row.name for row in rows]
+		# Unknown DocTypes that were asked for are still generated, to be reported as failed
+		ordered.extend(name for name in requested if name not in self._doctype_info)
+		if not self._is_bundled():
+			self.report.add_total(len(ordered))
+
+		try:
+			for start in range(0, len(ordered), QUERY_BATCH_SIZE):
+				batch = ordered[start : start + QUERY_BATCH_SIZE]
+				# Bundles load the schemas and customizations of their own DocTypes
+				if not self._is_bundled():
+					with self.report.measure("load"):
+						self._schemas = load_schemas(batch)
+					if self.custom_fields:
+						self.customizations.prefetch(batch)
+				# A bundle is written at most once per run, whatever the number of its DocTypes selected
+				for name in batch:
+					# e.g. a child table already written for a DocType importing it
+					if name in result.statuses:
+						if not self._is_bundled():
+							self.report.advance()
+						continue
+					self.generate_doctype(name)
+				self._schemas = {}
+				self.customizations.clear()
+
+			self._write_doctype_map()
+			self._save_manifests()
+		finally:
+			self.result = None
+			self._schemas = {}
+		return result
 
 	def generate_module(self, module: str):
 		"""Generate type definition files for *all* DocTypes inside *module*."""
 		if not self.type_generation_method:
 			self.type_generation_method = TypeGenerationMethod.MODULES
 		try:
-			child_tables = [
-				doctype["name"]
-				for doctype in frappe.get_list("DocType", filters={"module": module, "istable": 1})
-			]
-			if len(child_tables) > 0:
-				for child_table in child_tables:
-					self.generate_doctype(child_table)
+			if self._is_bundled():
+				self._generate_bundle(self.app_name, module)
+				if self.type_generation_method == TypeGenerationMethod.MODULES:
+					self._write_doctype_map()
+					self._save_manifests(prune=True, prune_scope=to_ts_type(module))
+				return
 
-			doctypes = [
-				doctype["name"]
-				for doctype in frappe.get_list("DocType", filters={"module": module, "istable": 0})
-			]
+			if self.type_generation_method == TypeGenerationMethod.MODULES:
+				self.report.add_total(frappe.db.count("DocType", {"module": module}))
 
-			if len(doctypes) > 0:
-				for doctype in doctypes:
-					self.generate_doctype(doctype)
+			# Child tables first. Each DocType is loaded, written and released in turn,
+			# so memory does not grow with the size of the module
+			for batch in self._iter_doctype_batches({"module": module}, "istable desc, name asc"):
+				names = [row.name for row in batch]
+				if self.custom_fields:
+					self.customizations.prefetch(names)
+				for name in names:
+					self.generate_doctype(name)
+			self.customizations.clear()
 
-				if self.type_generation_method == TypeGenerationMethod.MODULES:
-					self._write_doctype_map()
+			if self.type_generation_method == TypeGenerationMethod.MODULES and self.doctype_map:
+				self._write_doctype_map()
+
+			if self.type_generation_method == TypeGenerationMethod.MODULES:
+				self._save_manifests(prune=True, prune_scope=to_ts_type(module))
 		except Exception as e:
-			err_msg = f": {e!s}\n{frappe.get_traceback()}"
-			print(f"An error occurred while generating type for {module} {err_msg}")
+			self._failed_modules.add(module)
+			self.report.add_failure(module, e)
 
 	def update_type_definition_file(self, doctype: DocType):
 		"""Update a `.d.ts` type definition file for a single DocType.
 		Called when a DocType is updated.
 		"""
 		if self._is_migrating_or_installing():
-			print("Skipping type generation in patch, migrate, install or setup wizard")
+			self.logger.debug("Skipping type generation in patch, migrate, install or setup wizard")
 			return
 
 		if not self._can_generate(doctype):
 			return
 
 		# Ignore core apps
-		if self.app_name in {"frappe", "erpnext"}:
-			print("Ignoring core app DocTypes")
+		if self.app_name in CORE_APPS:
+			self.logger.debug("Ignoring core app DocTypes")
 			return
 
-		print("Generating type definition file for " + doctype.name)
 		module_name = doctype.module
 		app_name = frappe.db.get_value("Module Def", module_name, "app_name")
 
-		module_path = self._get_module_path(app_name, module_name)
-		if module_path:
-			self._generate_type_definition_file(doctype, module_path)
+		if self._is_bundled():
+			self._generate_bundle(app_name, module_name)
+		else:
+			self.logger.debug("Generating type definition file for %s", doctype.name)
+			module_path = self._get_module_path(app_name, module_name)
+			if module_path:
+				if self.custom_fields:
+					doctype = self.customizations.apply(doctype)
+				self._generate_type_definition_file(doctype, module_path)
+
+		self._write_project_references()
+		self._save_manifests()
+
+	def remove_type_definition_file(self, doctype: DocType):
+		"""Remove the declaration of a DocType and its DocTypeMap entry.
+		Called when a DocType is deleted.
+		"""
+		if self._is_migrating_or_installing() or not self._can_generate(doctype):
+			return
+
+		module_name = doctype.module
+		app_name = frappe.db.get_value("Module Def", module_name, "app_name")
+		types_path = self._get_types_path(app_name) if app_name else None
+		if not types_path:
+			return
+
+		if self._is_bundled():
+			# The DocType is still in the database while it is being deleted
+			self._excluded_doctypes.add(doctype.name)
+			self._generate_bundle(app_name, module_name)
+		else:
+			self._remove_doctype_files(types_path, module_name, doctype.name)
+
+		self._update_doctype_map(app_name, remove={doctype.name})
+		self._save_manifests()
+
+	def rename_type_definition_file(self, doctype: DocType, old_name: str):
+		"""Move the declaration of a renamed DocType and its DocTypeMap entry.
+		Called after a DocType is renamed.
+		"""
+		if self._is_migrating_or_installing() or not self._can_generate(doctype):
+			return
+
+		module_name = doctype.module
+		app_name = frappe.db.get_value("Module Def", module_name, "app_name")
+		types_path = self._get_types_path(app_name) if app_name else None
+		if not types_path:
+			return
+
+		# Bundles are re-rendered whole, from the already renamed DocType
+		if not self._is_bundled():
+			self._remove_doctype_files(types_path, module_name, old_name)
+		self.update_type_definition_file(doctype)
+
+		ts_name = to_ts_type(doctype.name)
+		if self._is_bundled():
+			import_path = self._get_bundle_import_path(app_name, module_name)
+		else:
+			import_path = f"{to_ts_type(module_name)}/{ts_name}"
+		self._update_doctype_map(app_name, remove={old_name}, add=[(doctype.name, ts_name, import_path)])
+
+	def update_customized_doctype(self, doctype: str):
+		"""Update the `.d.ts` type definition file of a DocType after its Custom
+		Fields or Property Setters changed. Requires ``custom_fields=True``.
+		"""
+		self.customizations.invalidate(doctype)
+		self.update_type_definition_file(frappe.get_doc("DocType", doctype))
+
+	def export_all_apps(self, resume: bool = False):
+		"""Generate type definitions for all configured apps.
 
-	def export_all_apps(self):
-		"""Generate type definitions for all configured apps."""
+		Progress is checkpointed after every DocType and module. With *resume*,
+		the DocTypes that failed during the last export are retried first, then
+		only the modules it did not complete are generated; the DocTypeMap is
+		rebuilt from the checkpointed DocTypes plus the new ones.
+		"""
 		settings = self._get_type_generation_settings()
 		type_settings = settings.get("type_settings", [])
 		export_to_root = settings.get("export_to_root")
+		checkpoint = ExportCheckpoint(self._get_checkpoint_path())
+		if not (resume and checkpoint.load()):
+			checkpoint.reset()
 		for ts in type_settings:
 			app_name = ts["app_name"]
-			print(f"Generating type definitions for app {app_name}")
+			self.logger.info("Generating type definitions for app %s", app_name)
+			self.report.set_current(app_name)
 			generator = type(self)(
 				app_name,
 				generate_child_tables=self.generate_child_tables,
 				custom_fields=self.custom_fields,
+				report=self.report,
+				base_output_path=self.base_output_path,
 			)
 			generator.type_generation_method = TypeGenerationMethod.ALL_APPS
-			modules = [m["name"] for m in frappe.get_list("Module Def", filters={"app_name": app_name})]
+			generator.checkpoint = checkpoint
+			# Apps exported to root share one `types` directory, and so one manifest
+			generator._manifests = self._manifests
+			generator._failed_modules = self._failed_modules
+			if generator._link_core_package():
+				modules = []
+			else:
+				modules = [m["name"] for m in frappe.get_list("Module Def", filters={"app_name": app_name})]
+
+			completed = checkpoint.get_app(app_name)
+			retry = [name for name in sorted(completed.failed) if frappe.db.exists("DocType", name)]
+			if completed.modules:
+				self.logger.info(
+					"Resuming %s: %d module(s) already generated, retrying %d failed DocType(s)",
+					app_name,
+					len(completed.modules),
+					len(retry),
+				)
+				generator.doctype_map.extend(completed.entries.values())
+				# Files of completed modules are not generated again, but must not be pruned
+				types_path = generator._get_types_path(app_name)
+				if types_path:
+					generator._get_manifest(types_path).mark_produced(set(completed.entries))
+			modules = [module for module in modules if module not in completed.modules]
+
+			self.report.add_total(len(retry))
+			if modules:
+				self.report.add_total(frappe.db.count("DocType", {"module": ("in", modules)}))
+			for name in retry:
+				generator.generate_doctype(name)
 			for module in modules:
 				generator.generate_module(module)
+				# DocTypes that failed are retried on resume, a module that failed as a whole is redone
+				if module not in self._failed_modules:
+					checkpoint.add_module(app_name, module)
+					generator._save_manifests()
+			generator._generate_api_types()
 
 			if export_to_root:
 				# accumulate doctypes for root map
 				self.doctype_map.extend(generator.doctype_map)
+				for module_dir, references in generator._module_references.items():
+					self._module_references.setdefault(module_dir, set()).update(references)
 			else:
 				# write per-app map
 				generator._write_doctype_map()
@@ -171,16 +467,33 @@ class TypeGenerator:
 			# write combined root map
 			self._write_doctype_map()
 
+		self._save_manifests(prune=True)
+		if not self.report.failures:
+			checkpoint.reset()
+
+	def get_declaration_file(self, doctype: str, module: str) -> Path | None:
+		"""Return the TypeScript declaration file of *doctype* (its bundle, with bundled
+		layouts), as recorded in the manifest. None if the app has no `types` directory."""
+		types_path = self._get_types_path(self.app_name)
+		if not types_path:
+			return None
+
+		# Files of the other emitters (e.g. `.pyi` stubs) declare the DocType too
+		files = [key for key in self._get_manifest(types_path).find(doctype) if key.endswith(".d.ts")]
+		if files:
+			return types_path / files[0]
+		return types_path / to_ts_type(module) / f"{to_ts_type(doctype)}.d.ts"
+
 	# ---------------------------------------------------------------------
 	# Private methods
 	# ---------------------------------------------------------------------
 	def _can_generate(self, doctype: DocType) -> bool:
 		if self._is_generation_paused():
-			print("Frappe Types is paused")
+			self._log_once(logging.WARNING, "Frappe Types is paused - ignoring type generation")
 			return False
 
 		if not is_developer_mode_enabled():
-			print("Developer mode is not enabled")
+			self._log_once(logging.WARNING, "Developer mode not enabled - ignoring type generation")
 			return False
 
 		if not self._is_valid_doctype(doctype):
@@ -188,6 +501,11 @@ class TypeGenerator:
 
 		return True
 
+	def _log_once(self, level: int, message: str):
+		if message not in self._logged_once:
+			self._logged_once.add(message)
+			self.logger.log(level, message)
+
 	def _is_migrating_or_installing(self) -> bool:
 		return (
 			frappe.flags.in_patch
@@ -203,54 +521,344 @@ class TypeGenerator:
 		return bool(is_paused_config)
 
 	def _get_module_path(self, app_name: str, module_name: str) -> Path | None:
-		"""Return the directory for type output. If export_to_root is set, always use the root types dir."""
-		settings = self._get_type_generation_settings()
-		if settings.get("export_to_root"):
-			# Determine root output path
-			root_path = settings.get("root_output_path", "types")
-			path_obj = Path(os.path.join(self.base_output_path, root_path, self.app_name))
+		return self.paths.get_module_path(app_name, module_name)
+
+	def _get_types_path(self, app_name: str) -> Path | None:
+		return self.paths.get_types_path(app_name)
 
-			# If relative, assume bench root
-			if not path_obj.is_absolute():
-				bench_root = get_bench_root_path()
-				path_obj = Path(os.path.join(bench_root, root_path))
+	def _link_core_package(self) -> bool:
+		"""Link the prebuilt types of a core app into its output, building them first
+		if there is no package for this version of the app yet.
 
-			path_obj.mkdir(parents=True, exist_ok=True)
-			module_path = path_obj / to_ts_type(module_name)
-			module_path.mkdir(exist_ok=True)
+		Returns False if the app's types have to be generated like any other app's:
+		for non-core apps, with ``custom_fields`` (customizations are per site), or
+		when the app's sources have local changes.
+		"""
+		if self.app_name not in CORE_APPS or self.custom_fields:
+			return False
 
-			return module_path
+		types_path = self._get_types_path(self.app_name)
+		if not types_path:
+			return False
 
-		app_path = Path(self.base_output_path) / app_name
-		if not app_path.exists():
-			print("App path does not exist - ignoring type generation")
-			return None
+		options = {
+			"generate_child_tables": self.generate_child_tables,
+			"output_layout": self.output_layout.value,
+			"generate_tsconfig": self.generate_tsconfig,
+			"emitters": [emitter.option for emitter in self._get_emitters(self.app_name)],
+		}
+		package = CorePackage.for_app(self.app_name, options, self._get_package_cache_dir())
+		if not package:
+			return False
+
+		if not package.exists():
+			self.logger.info("Building the type package of %s (%s)", self.app_name, package.key)
+			if not package.build(self._build_core_package):
+				return False
+
+		self.logger.info("Linking the type package of %s (%s)", self.app_name, package.key)
+		manifest = self._get_manifest(types_path)
+		# Apps exported to root share their module folders: only link those of this app, not the
+		# child tables of other apps the package holds, which are linked from their own package
+		modules = None
+		if self._get_type_generation_settings().get("export_to_root"):
+			modules = frappe.get_list("Module Def", filters={"app_name": self.app_name}, pluck="name")
+		for name, doctypes in package.get_contents(modules).items():
+			# Replace the files generated for the module by earlier runs
+			manifest.remove_files([key for key in manifest.files if key.startswith(f"{name}/")])
+			linked = [
+				link_package_entry(package.types_path / name, target_path)
+				for target_path in self.paths.get_target_paths(types_path / name)
+			]
+			if all(linked):
+				manifest.record(types_path / name, doctypes)
 
-		# Look-up path in Type Generation Settings
-		type_generation_settings = self._get_type_generation_settings()["type_settings"]
-		type_setting = next((ts for ts in type_generation_settings if ts["app_name"] == app_name), None)
-		if not type_setting:
+		self.doctype_map.extend(package.get_entries())
+		return True
+
+	def _build_core_package(self, types_path: Path) -> list[tuple[str, str, str]] | None:
+		generator = type(self)(
+			self.app_name,
+			generate_child_tables=self.generate_child_tables,
+			report=self.report,
+		)
+		generator.type_generation_method = TypeGenerationMethod.ALL_APPS
+		generator.paths = PackagePathResolver(types_path)
+		# Packages are shared by every site of the bench, so never include a site's custom DocTypes
+		generator._settings = {**self._get_type_generation_settings(), "include_custom_doctypes": 0}
+
+		modules = frappe.get_list("Module Def", filters={"app_name": self.app_name}, pluck="name")
+		if modules:
+			self.report.add_total(frappe.db.count("DocType", {"module": ("in", modules)}))
+		failures = len(self.report.failures)
+		for module in modules:
+			generator.generate_module(module)
+		if len(self.report.failures) > failures:
+			# An incomplete package would be reused by every site
 			return None
 
-		# Ensure directories exist
-		type_path: Path = app_path / type_setting["app_path"] / "types"
-		type_path.mkdir(parents=True, exist_ok=True)
+		generator._write_project_references()
+		generator._save_manifests()
+		return generator.doctype_map
+
+	def _get_package_cache_dir(self) -> Path:
+		cache_dir = frappe.conf.get("frappe_types_package_cache_dir")
+		if cache_dir:
+			return Path(cache_dir).expanduser()
+		return self.paths.bench_root / ".frappe-types" / "packages"
+
+	def _generate_api_types(self):
+		"""Write the signatures of the app's whitelisted methods to `api/<app_name>.d.ts`."""
+		if not self._get_type_generation_settings().get("generate_api_types"):
+			return
+
+		output_path = self.paths.get_doctype_map_path(self.app_name)
+		if not output_path:
+			return
+
+		try:
+			scanner = WhitelistScanner(
+				self.app_name,
+				Path(frappe.get_app_path(self.app_name)),
+				self.paths.bench_root / ".frappe-types" / "api" / f"{self.app_name}.json",
+			)
+			methods = scanner.scan()
+			scanner.save()
+		except Exception as e:
+			self.report.add_failure(f"{self.app_name} API", e)
+			return
 
-		module_path: Path = type_path / to_ts_type(module_name)
-		module_path.mkdir(exist_ok=True)
-		return module_path
+		self.logger.debug("Found %d whitelisted methods in %s", len(methods), self.app_name)
+		api_path = self.paths.ensure_dir(output_path / "api") / f"{self.app_name}.d.ts"
+		self._write_file(api_path, render_api_types(methods))
+		self._get_manifest(output_path).record(api_path, [])
+
+	def _get_checkpoint_path(self) -> Path:
+		return Path(frappe.get_site_path("private", "frappe_types", "export_checkpoint.jsonl"))
 
 	def _get_type_generation_settings(self) -> dict:
-		return frappe.get_doc("Type Generation Settings").as_dict()
+		# Loaded once per generator, settings do not change during a run
+		if self._settings is None:
+			self._settings = frappe.get_doc("Type Generation Settings").as_dict()
+		return self._settings
+
+	def _iter_doctype_batches(self, filters: dict, order_by: str, fields: list[str] | None = None):
+		"""Yield the DocTypes matching *filters* in pages of ``QUERY_BATCH_SIZE`` rows."""
+		start = 0
+		while True:
+			batch = frappe.get_list(
+				"DocType",
+				filters=filters,
+				fields=fields or ["name"],
+				order_by=order_by,
+				limit_start=start,
+				limit_page_length=QUERY_BATCH_SIZE,
+			)
+			if batch:
+				yield batch
+			if len(batch) < QUERY_BATCH_SIZE:
+				return
+			start += QUERY_BATCH_SIZE
+
+	def _load_doctype(self, doctype: str) -> DocType:
+		with self.report.measure("load"):
+			# Schema records prefetched by generate_many are used once, then released
+			doc = self._schemas.pop(doctype, None) or frappe.get_doc("DocType", doctype)
+			# custom_fields True means that the generate .d.ts file for custom fields with original fields
+			return self.customizations.apply(doc) if self.custom_fields else doc
+
+	def _get_doctype_info(self, doctype: str) -> frappe._dict:
+		"""Return the name, module and istable of *doctype*, looked up once per run."""
+		if doctype not in self._doctype_info:
+			info = frappe.db.get_value("DocType", doctype, ["name", "module", "istable"], as_dict=True)
+			if not info:
+				raise frappe.DoesNotExistError(f"DocType {doctype} not found")
+			self._doctype_info[doctype] = info
+		return self._doctype_info[doctype]
+
+	def _get_module_app(self, module_name: str) -> str | None:
+		if module_name not in self._module_apps:
+			self._module_apps[module_name] = frappe.db.get_value("Module Def", module_name, "app_name")
+		return self._module_apps[module_name]
+
+	def _is_bundled(self) -> bool:
+		return self.output_layout != OutputLayout.PER_DOCTYPE
+
+	def _get_bundle_path(self, app_name: str, module_name: str) -> Path | None:
+		"""Return the declaration file that bundles *module_name*'s DocTypes.
+
+		Per module: ``types/<Module>/index.d.ts``; per app: ``types/<app_name>.d.ts``.
+		"""
+		if self.output_layout == OutputLayout.PER_MODULE:
+			module_path = self._get_module_path(app_name, module_name)
+			return module_path / "index.d.ts" if module_path else None
+
+		types_path = self._get_types_path(app_name)
+		return types_path / f"{app_name}.d.ts" if types_path else None
+
+	def _get_bundle_import_path(self, app_name: str, module_name: str) -> str:
+		"""Return the import path of a bundle, relative to the `types` directory."""
+		if self.output_layout == OutputLayout.PER_MODULE:
+			return f"{to_ts_type(module_name)}/index"
+		return app_name
+
+	def _generate_bundle(self, app_name: str, module_name: str):
+		"""Write every DocType of *module_name* (or of its whole app, for the
+		per-app layout) into a single declaration file.
+
+		Interfaces that live in the same bundle reference each other directly,
+		so only child tables from other bundles need an import.
+		"""
+		bundle_module = module_name if self.output_layout == OutputLayout.PER_MODULE else None
+		bundle_key = (app_name, bundle_module)
+		if bundle_key in self._generated_bundles:
+			return
+		self._generated_bundles.add(bundle_key)
+
+		bundle_path = self._get_bundle_path(app_name, module_name)
+		if not bundle_path:
+			return
+
+		if bundle_module:
+			self._add_module_reference(bundle_path.parent)
+			modules = [bundle_module]
+		else:
+			modules = frappe.get_list("Module Def", filters={"app_name": app_name}, pluck="name")
+
+		# Only the names of the bundled DocTypes are collected up front (child tables
+		# first, like generate_module); their schemas are then loaded in bulk, one batch
+		# at a time, and each DocType is rendered and released in turn
+		names: list[str] = []
+		skipped = 0
+		for batch in self._iter_doctype_batches(
+			{"module": ("in", modules)},
+			"module asc, istable desc, name asc",
+			fields=["name", "custom", "is_virtual"],
+		):
+			for row in batch:
+				if row.name in self._excluded_doctypes:
+					continue
+				if self._can_generate(row):
+					names.append(row.name)
+				else:
+					skipped += 1
+		if self.type_generation_method != TypeGenerationMethod.ALL_APPS:
+			self.report.add_total(len(names) + skipped)
+		self.report.advance(skipped)
+
+		# Bundles of other modules / apps may be generated while rendering this one
+		parent_bundle_doctypes = self._bundle_doctypes
+		self._bundle_doctypes = set(names)
+		import_lines: set[str] = set()
+		interface_blocks: list[str] = []
+		emitters = self._get_emitters(app_name)
+		# Import lines and declaration blocks of each emitter
+		emitted: list[tuple[list[str], list[str]]] = [([], []) for _ in emitters]
+		self._bundle_depth += 1
+		try:
+			for start in range(0, len(names), QUERY_BATCH_SIZE):
+				batch = names[start : start + QUERY_BATCH_SIZE]
+				# Released by _load_doctype as each DocType is rendered
+				with self.report.measure("load"):
+					self._schemas.update(load_schemas(batch))
+				if self.custom_fields:
+					self.customizations.prefetch(batch)
+				for name in batch:
+					self.logger.debug("Generating type definition for %s", name)
+					try:
+						doc = self._load_doctype(name)
+						table_fields = self._resolve_table_fields(doc, bundle_path.parent)
+						doc_imports, interface_block = self._render_interface(
+							doc, bundle_path.parent, table_fields
+						)
+						emitter_blocks = self._render_emitters(
+							emitters, doc, table_fields, bundle_path.parent
+						)
+					except Exception as e:
+						self._add_failure(name, e)
+						self._bundle_doctypes.discard(name)
+						continue
+					finally:
+						self.report.advance()
+					import_lines.update(doc_imports)
+					interface_blocks.append(interface_block)
+					for (emitter_imports, blocks), (doc_imports, block) in zip(
+						emitted, emitter_blocks, strict=True
+					):
+						emitter_imports.extend(doc_imports)
+						blocks.append(block)
+			bundled = self._bundle_doctypes
+		finally:
+			# e.g. the schemas of a batch left unrendered by an error
+			for name in names:
+				self._schemas.pop(name, None)
+			self._bundle_doctypes = parent_bundle_doctypes
+			self._bundle_depth -= 1
+			# A nested bundle keeps the customizations prefetched for the bundle it is rendered for
+			if not self._bundle_depth:
+				self.customizations.clear()
+
+		content = "".join(sorted(import_lines)) + "\n" + "\n\n".join(interface_blocks) + "\n"
+		written = self._write_file(bundle_path, content)
+		types_path = bundle_path.parent.parent if bundle_module else bundle_path.parent
+		self._get_manifest(types_path).record(bundle_path, list(bundled))
+		for emitter, (emitter_imports, blocks) in zip(emitters, emitted, strict=True):
+			emitter_path = emitter.get_path(bundle_path)
+			written |= self._write_file(emitter_path, emitter.join(emitter_imports, blocks))
+			self._get_manifest(types_path).record(emitter_path, list(bundled))
+		if self.result:
+			for name in bundled:
+				self.result.add(name, GenerationResult.WRITTEN if written else GenerationResult.UNCHANGED)
+
+		import_path = self._get_bundle_import_path(app_name, module_name)
+		for name in names:
+			if name in bundled:
+				self._add_doctype_map_entry((name, to_ts_type(name), import_path))
 
 	def _generate_type_definition_file(self, doctype: DocType, module_path: Path):
 		doctype_name = to_ts_type(doctype.name)
 		type_file_path = module_path / (doctype_name + ".d.ts")
-		type_file_content = self._generate_type_definition_content(doctype, module_path)
-
-		create_file(type_file_path, type_file_content)
-
-	def _generate_type_definition_content(self, doctype: DocType, module_path: Path):
+		self._add_module_reference(module_path)
+		table_fields = self._resolve_table_fields(doctype, module_path)
+		key = get_render_key(to_schema(doctype), table_fields)
+		# Files of the other languages enabled for the app, rendered from the same schema
+		# Hooks run with no app_name: the emitters are those of the app owning the folder
+		owner_app = self.paths.get_owner_app(module_path) or self._get_module_app(doctype.module)
+		emitters = self._get_emitters(owner_app)
+		file_paths = [type_file_path, *(emitter.get_path(type_file_path) for emitter in emitters)]
+
+		# Generators of the same file wait for each other, and the files generated from an identical
+		# schema while waiting (e.g. by another web worker saving the same DocType) are reused
+		stamp = get_stamp(type_file_path, key, *(emitter.option for emitter in emitters))
+		waiting_since = time.time_ns()
+		with self._get_file_lock(type_file_path) as lock:
+			if lock.generated_since(stamp, waiting_since):
+				written = False
+				self.report.count("files_unchanged", len(file_paths))
+			else:
+				type_file_content = self._generate_type_definition_content(
+					doctype, module_path, table_fields, key
+				)
+				written = self._write_file(type_file_path, type_file_content)
+				emitter_blocks = self._render_emitters(emitters, doctype, table_fields, module_path)
+				for emitter, path, (import_lines, block) in zip(
+					emitters, file_paths[1:], emitter_blocks, strict=True
+				):
+					written |= self._write_file(path, emitter.join(import_lines, [block]))
+				lock.mark_generated(stamp)
+		manifest = self._get_manifest(module_path.parent)
+		for file_path in file_paths:
+			manifest.record(file_path, [doctype.name])
+		if self.result:
+			self.result.add(doctype.name, GenerationResult.WRITTEN if written else GenerationResult.UNCHANGED)
+
+	def _generate_type_definition_content(
+		self,
+		doctype: DocType,
+		module_path: Path,
+		table_fields: dict[str, tuple[str, str | None]] | None = None,
+		key: str | None = None,
+	):
 		"""Return the TypeScript interface for a DocType.
 
 		The generated string contains:
@@ -258,6 +866,74 @@ class TypeGenerator:
 		2. The `export interface` block with core document fields and
 		   any custom fields from the DocType definition.
 		"""
+		import_lines, interface_block = self._render_interface(doctype, module_path, table_fields, key)
+		import_block = "".join(import_lines)  # each statement already ends with \n
+
+		# Ensure a blank line between imports and interface (even if no imports)
+		return f"{import_block}\n{interface_block}"
+
+	def _render_interface(
+		self,
+		doctype: DocType,
+		module_path: Path,
+		table_fields: dict[str, tuple[str, str | None]] | None = None,
+		key: str | None = None,
+	) -> tuple[list[str], str]:
+		"""Return the import statements needed by a DocType and its `export interface` block.
+
+		Child tables are resolved first (unless *table_fields* already are), since
+		they may need to be generated. The rest of the render only depends on the
+		schema, so it is served from the render cache when one is configured.
+		"""
+		if table_fields is None:
+			table_fields = self._resolve_table_fields(doctype, module_path)
+		self.report.count("doctypes_rendered")
+		with self.report.measure("render"):
+			if not self.render_cache:
+				return self._render_interface_content(doctype, module_path, table_fields)
+
+			key = key or self.render_cache.get_key(to_schema(doctype), table_fields)
+			rendered = self.render_cache.get(key)
+			if rendered:
+				self.report.count("render_cache_hits")
+				return rendered
+
+			self.report.count("render_cache_misses")
+			rendered = self._render_interface_content(doctype, module_path, table_fields)
+			self.render_cache.put(key, rendered)
+			return rendered
+
+	def _get_emitters(self, app_name: str) -> list[Emitter]:
+		"""Return the emitters enabled for *app_name* in Type Generation Settings, besides TypeScript."""
+		type_settings = self._get_type_generation_settings().get("type_settings", [])
+		type_setting = next((ts for ts in type_settings if ts["app_name"] == app_name), {})
+		return [emitter for option, emitter in EMITTERS.items() if type_setting.get(option)]
+
+	def _render_emitters(
+		self,
+		emitters: list[Emitter],
+		doctype: DocType,
+		table_fields: dict[str, tuple[str, str | None]],
+		directory: Path,
+	) -> list[tuple[list[str], str]]:
+		"""Render *doctype* with each emitter, from the schema and child tables resolved for TypeScript."""
+		if not emitters:
+			return []
+		with self.report.measure("render"):
+			schema = to_schema(doctype)
+			return [emitter.render(schema, table_fields, directory) for emitter in emitters]
+
+	def _resolve_table_fields(self, doctype: DocType, module_path: Path) -> dict[str, tuple[str, str | None]]:
+		"""Return the `(ts_type, import_stmt)` of each child table field of *doctype*."""
+		return {
+			field.fieldname: self._get_imports_for_table_fields(field, doctype, module_path)
+			for field in doctype.fields
+			if field.fieldtype in {"Table", "Table MultiSelect"}
+		}
+
+	def _render_interface_content(
+		self, doctype: DocType, module_path: Path, table_fields: dict[str, tuple[str, str | None]]
+	) -> tuple[list[str], str]:
 		# Collect import lines without duplicates while preserving order
 		import_lines: list[str] = []
 
@@ -292,18 +968,19 @@ class TypeGenerator:
 			lines.append(self._get_field_comment(field).rstrip())
 
 			# Add field definition and track needed imports
-			field_def, import_stmt = self._get_field_type_definition(field, doctype, module_path)
+			if field.fieldname in table_fields:
+				field_type, import_stmt = table_fields[field.fieldname]
+				field_def = field.fieldname + self._get_required(field) + ": " + field_type
+			else:
+				field_def, import_stmt = self._get_field_type_definition(field, doctype, module_path)
 			if import_stmt and import_stmt not in import_lines:
 				import_lines.append(import_stmt)
 			lines.append(f"\t{field_def}")
 
 		lines.append("}")
 
-		import_block = "".join(import_lines)  # each statement already ends with \n
-		interface_block = "\n".join(lines)
-
-		# Ensure a blank line between imports and interface (even if no imports)
-		return f"{import_block}\n{interface_block}"
+		# Sorted, so that the output only changes when the schema does
+		return sorted(import_lines), "\n".join(lines)
 
 	def _get_field_comment(self, field: DocField) -> str:
 		"""Return a single-line JSDoc comment for the given field.
@@ -397,7 +1074,10 @@ class TypeGenerator:
 			return "", None  # Not a child-table field
 
 		# -- Identify child table DocType & locations
-		table_doc = frappe.get_doc("DocType", field.options)
+		table_doc = self._get_doctype_info(field.options)
+		if self._is_bundled():
+			return self._get_bundle_imports_for_table(table_doc, module_path)
+
 		same_module = table_doc.module == doctype.module
 
 		ts_module_name = to_ts_type(table_doc.module)
@@ -408,8 +1088,7 @@ class TypeGenerator:
 			target_dir = module_path
 			import_path = f"./{ts_doc_name}"
 		else:
-			target_dir = module_path.parent / ts_module_name
-			target_dir.mkdir(exist_ok=True)
+			target_dir = self.paths.ensure_dir(module_path.parent / ts_module_name)
 			import_path = f"../{ts_module_name}/{ts_doc_name}"
 
 		ts_file_path = target_dir / f"{ts_doc_name}.d.ts"
@@ -418,15 +1097,45 @@ class TypeGenerator:
 		if not ts_file_path.exists():
 			if self.generate_child_tables:
 				# Generate the missing child type definition
-				self._generate_type_definition_file(table_doc, target_dir)
+				self._generate_type_definition_file(self._load_doctype(table_doc.name), target_dir)
 			else:
 				# No file & not allowed to generate → treat as `any`
 				return "any", ""
 
+		if not same_module:
+			self._add_module_reference(module_path, target_dir)
+
 		# At this point the file exists (either previously or just generated)
 		import_stmt = f"import {{ {ts_doc_name} }} from '{import_path}'\n"
 		return f"{ts_doc_name}[]", import_stmt
 
+	def _get_bundle_imports_for_table(self, table_doc: DocType, bundle_dir: Path) -> tuple[str, str | None]:
+		"""Bundled counterpart of `_get_imports_for_table_fields`."""
+		ts_doc_name = to_ts_type(table_doc.name)
+
+		# Same bundle → the interface is declared alongside, no import needed
+		if table_doc.name in self._bundle_doctypes:
+			return f"{ts_doc_name}[]", None
+
+		table_app = self._get_module_app(table_doc.module)
+		target_path = self._get_bundle_path(table_app, table_doc.module) if table_app else None
+		if not target_path:
+			return "any", ""
+
+		if not target_path.exists():
+			if not self.generate_child_tables:
+				return "any", ""
+			self._generate_bundle(table_app, table_doc.module)
+
+		if self.output_layout == OutputLayout.PER_MODULE:
+			self._add_module_reference(bundle_dir, target_path.parent)
+
+		import_path = Path(os.path.relpath(str(target_path)[: -len(".d.ts")], bundle_dir)).as_posix()
+		if not import_path.startswith("."):
+			import_path = f"./{import_path}"
+
+		return f"{ts_doc_name}[]", f"import {{ {ts_doc_name} }} from '{import_path}'\n"
+
 	def _get_required(self, field):
 		if field.reqd:
 			return ""
@@ -436,47 +1145,50 @@ class TypeGenerator:
 	def _is_valid_doctype(self, doctype: DocType) -> bool:
 		type_generation_settings = self._get_type_generation_settings()
 		if not type_generation_settings.get("include_custom_doctypes", False) and (doctype.custom):
-			print("Custom DocType - ignoring type generation")
+			self.logger.debug("Custom DocType %s - ignoring type generation", doctype.name)
 			return False
 
 		if doctype.is_virtual:
-			print("Virtual DocType - ignoring type generation")
+			self.logger.debug("Virtual DocType %s - ignoring type generation", doctype.name)
 			return False
 
 		return True
 
 	def _write_doctype_map(self):
 		"""Generate a TypeScript type mapping DocType names to TS interfaces."""
-		settings = self._get_type_generation_settings()
-		export_to_root = settings.get("export_to_root")
-		if export_to_root:
-			root_path = settings.get("root_output_path", "types")
-			base_path = Path(os.path.join(self.base_output_path, root_path))
-			if not base_path.is_absolute():
-				bench_root = get_bench_root_path()
-				base_path = Path(os.path.join(bench_root, root_path))
-			output_base = base_path
-		else:
-			app_path = Path(self.base_output_path) / self.app_name
-			type_settings = settings.get("type_settings", [])
-			type_setting = next((ts for ts in type_settings if ts["app_name"] == self.app_name), None)
-			if not type_setting:
-				print(f"No type setting found for app {self.app_name} - skipping DocTypeMap")
-				return
-			output_base = app_path / type_setting["app_path"] / "types"
+		output_base = self.paths.get_doctype_map_path(self.app_name)
+		if not output_base:
+			self.logger.warning("No type setting found for app %s - skipping DocTypeMap", self.app_name)
+			return
+
+		# Write file
+		map_file = output_base / "DocTypeMap.d.ts"
+		with self.report.measure("doctype_map"):
+			self._write_file(map_file, self._render_doctype_map(self.doctype_map))
+		self.doctype_map = []
 
-		# Collect doctypes generated so far
-		dt_map = self.doctype_map
-		# Ensure unique entries
-		dt_map = list(set(dt_map))
+		self._write_project_references()
 
-		# Build import statements
+	def _render_doctype_map(self, dt_map: list[tuple[str, str, str]]) -> str:
+		"""Render `DocTypeMap.d.ts` from `(doctype, ts_name, import_path)` entries.
+
+		Entries are deduplicated by DocType (the last one wins) and everything is
+		sorted, so the file is byte-identical whatever order the DocTypes were
+		generated in.
+		"""
+		dt_map = sorted({doctype: (doctype, ts_name, path) for doctype, ts_name, path in dt_map}.values())
+
+		# Build import statements, one per declaration file
 		seen = set()
-		imports = []
-		for _, ts_name, module_dir in dt_map:
+		imports_by_path: dict[str, list[str]] = {}
+		for _, ts_name, import_path in dt_map:
 			if ts_name not in seen:
-				imports.append(f"import {{ {ts_name} }} from './{module_dir}/{ts_name}';\n")
+				imports_by_path.setdefault(import_path, []).append(ts_name)
 				seen.add(ts_name)
+		imports = [
+			f"import {{ {', '.join(sorted(imports_by_path[import_path]))} }} from './{import_path}';\n"
+			for import_path in sorted(imports_by_path)
+		]
 
 		# Build DocTypeMap type
 		lines = ["declare global {\n  interface DocTypeMap {"]
@@ -484,23 +1196,233 @@ class TypeGenerator:
 			lines.append(f'    "{orig}": {ts_name};')
 		lines.append("  }\n}\n")
 		lines.append("export {};")
-		content = "".join(imports) + "\n" + "\n".join(lines)
+		return "".join(imports) + "\n" + "\n".join(lines)
+
+	def _read_doctype_map(self, map_file: Path) -> list[tuple[str, str, str]]:
+		"""Parse the `(doctype, ts_name, import_path)` entries of an existing `DocTypeMap.d.ts`."""
+		if not map_file.exists():
+			return []
+
+		content = map_file.read_text()
+		import_paths = {}
+		for ts_names, import_path in re.findall(r"^import \{ (.+) \} from '\./(.+)';$", content, re.M):
+			for ts_name in ts_names.split(", "):
+				import_paths[ts_name] = import_path
+
+		return [
+			(doctype, ts_name, import_paths[ts_name])
+			for doctype, ts_name in re.findall(r'^\s+"(.+)": (\w+);$', content, re.M)
+			if ts_name in import_paths
+		]
 
-		# Write file
-		map_file = output_base / "DocTypeMap.d.ts"
-		create_file(map_file, content)
-		self.doctype_map = []
+	def _update_doctype_map(
+		self,
+		app_name: str,
+		remove: set[str] | None = None,
+		add: list[tuple[str, str, str]] | None = None,
+	):
+		"""Remove / add entries of an existing `DocTypeMap.d.ts` in place."""
+		output_base = self.paths.get_doctype_map_path(app_name)
+		map_file = output_base / "DocTypeMap.d.ts" if output_base else None
+		if not map_file or not map_file.exists():
+			return
+
+		remove = (remove or set()) | {doctype for doctype, _, _ in add or []}
+		dt_map = [entry for entry in self._read_doctype_map(map_file) if entry[0] not in remove]
+		dt_map.extend(add or [])
+		self._write_file(map_file, self._render_doctype_map(dt_map))
+
+	def _add_doctype_map_entry(self, entry: tuple[str, str, str]):
+		self.doctype_map.append(entry)
+		if self.checkpoint:
+			self.checkpoint.add_doctype(self.app_name, entry)
+
+	def _add_failure(self, doctype: str, exc: BaseException):
+		self.report.add_failure(doctype, exc)
+		if self.result:
+			self.result.add(doctype, GenerationResult.FAILED, f"{type(exc).__name__}: {exc}")
+		if self.checkpoint:
+			self.checkpoint.add_failure(self.app_name, doctype)
+
+	def _write_file(self, path: Path, content: str, overwrite: bool = True) -> bool:
+		"""Write *content* to *path* and to its copy in every additional output target.
+
+		Each target skips the write on its own when its file is unchanged. Writes
+		into the same output root are serialized between processes.
+		"""
+		written = False
+		with self.report.measure("write"), self._get_output_lock(self.paths.get_output_root(path)):
+			self._unlink_core_package(path)
+			for target_path in self.paths.get_target_paths(path):
+				written |= create_file(target_path, content, overwrite=overwrite)
+		self.report.count("files_written" if written else "files_unchanged")
+		return written
+
+	def _unlink_core_package(self, path: Path):
+		"""Replace the link to a core package that *path* is in (see `_link_core_package`) by
+		a copy of the linked folder / file, in every output target.
+
+		Core apps are also generated the usual way, e.g. by the DocType hooks or with
+		``custom_fields``: their files must never be written to the package shared
+		by every site. The output lock must be held.
+		"""
+		entry = self.paths.get_top_level_entry(path)
+		if not entry or not entry.is_symlink():
+			return
+
+		self.logger.debug("Unlinking %s from its type package", entry)
+		package_types_path = unlink_package_entry(entry)
+		for target_entry in self.paths.get_target_paths(entry)[1:]:
+			unlink_package_entry(target_entry)
+		self._get_manifest(entry.parent).expand(entry.name, Manifest(package_types_path).files)
+
+	def _get_lock(self, name: str) -> FileLock:
+		return get_lock(self.paths.bench_root, name)
+
+	def _get_output_lock(self, output_root: Path) -> FileLock:
+		return self._get_lock(f"output:{output_root}")
+
+	def _get_file_lock(self, path: Path) -> FileLock:
+		return get_striped_lock(self.paths.bench_root, f"file:{path}")
+
+	def _get_manifest(self, types_path: Path) -> Manifest:
+		if types_path not in self._manifests:
+			self._manifests[types_path] = Manifest(
+				types_path, self.paths.get_additional_targets(types_path), self._get_output_lock(types_path)
+			)
+		return self._manifests[types_path]
+
+	def _remove_doctype_files(self, types_path: Path, module_name: str, doctype: str):
+		manifest = self._get_manifest(types_path)
+		files = manifest.find(doctype) or [f"{to_ts_type(module_name)}/{to_ts_type(doctype)}.d.ts"]
+		with self._get_output_lock(types_path):
+			for key in files:
+				self._unlink_core_package(types_path / key)
+			# Records of files unlinked from a package replace the record of their folder
+			files = manifest.find(doctype) or files
+			manifest.remove_files(files)
+
+	def _save_manifests(self, prune: bool = False, prune_scope: str | None = None):
+		"""Save the manifests written to in this run.
+
+		With *prune* (and the generator's ``prune`` option), files recorded by
+		earlier runs that this run did not produce are deleted first, limited to
+		*prune_scope* (a module folder) when given.
+		"""
+		# Never prune when nothing could be generated, nor the files of DocTypes that failed
+		prune = prune and self.prune and not self._is_generation_paused() and is_developer_mode_enabled()
+		if prune and self._failed_modules:
+			# The files of a module that failed as a whole are not tied to any failed DocType
+			self.logger.warning(
+				"Not pruning: module(s) %s could not be generated", ", ".join(sorted(self._failed_modules))
+			)
+			prune = False
+		failed = {name for name, _ in self.report.failures}
+		with self.report.measure("manifest"):
+			for manifest in self._manifests.values():
+				if prune:
+					removed = manifest.prune(prune_scope, keep=failed)
+					if removed:
+						self.logger.info(
+							"Pruned %d orphaned file(s) from %s", len(removed), manifest.types_dir
+						)
+				manifest.save()
+
+	def _add_module_reference(self, module_dir: Path, referenced_dir: Path | None = None):
+		references = self._module_references.setdefault(module_dir, set())
+		if referenced_dir and referenced_dir != module_dir:
+			references.add(referenced_dir)
+
+	def _write_project_references(self):
+		"""Write a composite `tsconfig.json` for every module folder written in this
+		run, plus a solution config in each `types` folder referencing them."""
+		if not self.generate_tsconfig:
+			self._module_references = {}
+			return
+
+		solutions: dict[Path, set[Path]] = {}
+		for module_dir, references in self._module_references.items():
+			write_module_tsconfig(module_dir, references, write=self._write_file)
+			solutions.setdefault(module_dir.parent, set()).add(module_dir)
+
+		for types_dir, module_dirs in solutions.items():
+			write_solution_tsconfig(types_dir, module_dirs, write=self._write_file)
+
+		self._module_references = {}
+
+
+# The document hooks run on every save of every site: they return before any database
+# access (see hook_guards) unless types can be generated for the document's app.
+# They all render the site's Custom Fields and Property Setters, so that a file is the
+# same whether a DocType save or a customization regenerated it last
 
 
 # Should probably be renamed to `update_type_definition_file`
+@timed_hook("doctype_on_update")
 def create_type_definition_file(doc, method=None):
-	# Flag meant only to be used in testing and development
-	if frappe.flags.type_generator_disable_update:
+	if not is_generation_enabled() or not is_configured_module(doc.module):
 		return
 
 	# App name is not needed for updating the definition file
-	generator = TypeGenerator(app_name="")
+	generator = TypeGenerator(app_name="", custom_fields=True)
 	generator.update_type_definition_file(doc)
+	record_run("hook", generator.report)
+
+
+@timed_hook("doctype_on_trash")
+def delete_type_definition_file(doc, method=None):
+	if not is_generation_enabled() or not is_configured_module(doc.module):
+		return
+
+	generator = TypeGenerator(app_name="", custom_fields=True)
+	generator.remove_type_definition_file(doc)
+	record_run("hook", generator.report)
+
+
+@timed_hook("doctype_after_rename")
+def rename_type_definition_file(doc, method=None, old=None, new=None, merge=False):
+	if not old or not is_generation_enabled() or not is_configured_module(doc.module):
+		return
+
+	generator = TypeGenerator(app_name="", custom_fields=True)
+	generator.rename_type_definition_file(doc, old)
+	record_run("hook", generator.report)
+
+
+@timed_hook("customization_on_update")
+def update_customized_type_definition_file(doc, method=None):
+	"""Queue the DocType a Custom Field / Property Setter belongs to for regeneration.
+
+	All customizations saved in one transaction (e.g. a single Customize Form
+	save) are coalesced, and each affected DocType is written once after commit.
+	"""
+	# The app of the DocType is only checked after commit, with the DocType loaded
+	if not is_generation_enabled():
+		return
+
+	doctype = doc.dt if doc.doctype == "Custom Field" else doc.doc_type
+	if not doctype:
+		return
+
+	pending = frappe.flags.setdefault("type_generator_customized_doctypes", set())
+	if not pending:
+		frappe.db.after_commit.add(_regenerate_customized_doctypes)
+		frappe.db.after_rollback.add(lambda: frappe.flags.pop("type_generator_customized_doctypes", None))
+	pending.add(doctype)
+
+
+def _regenerate_customized_doctypes():
+	doctypes = frappe.flags.pop("type_generator_customized_doctypes", None) or set()
+	generator = TypeGenerator(app_name="", custom_fields=True)
+	for doctype in sorted(doctypes):
+		try:
+			module = frappe.db.get_value("DocType", doctype, "module")
+			if is_configured_module(module):
+				generator.update_customized_doctype(doctype)
+		except Exception as e:
+			generator.report.add_failure(doctype, e)
+	generator.report.log_failures()
+	record_run("hook", generator.report)
 
 
 def before_migrate():
@@ -539,20 +1461,49 @@ def generate_types_for_doctype(doctype, app_name, generate_child_tables=False, c
 		custom_fields=custom_fields,
 	)
 	generator.generate_doctype(doctype)
+	generator.report.summary()
+	record_run("doctype", generator.report)
 
 
 @frappe.whitelist()
-def generate_types_for_module(module, app_name, generate_child_tables=False):
-	generator = TypeGenerator(app_name, generate_child_tables=generate_child_tables)
+def generate_types_for_module(
+	module, app_name, generate_child_tables=False, custom_fields=False, prune=False
+):
+	generator = TypeGenerator(
+		app_name,
+		generate_child_tables=generate_child_tables,
+		custom_fields=custom_fields,
+		prune=prune,
+	)
 	generator.generate_module(module)
+	generator.report.summary()
+	record_run("module", generator.report)
 
 
 @frappe.whitelist()
-def export_all_apps():
-	type_settings = frappe.get_single("Type Generation Settings")
-	type_settings.base_output_path = ""
-	type_settings.save()
-	generator = TypeGenerator(app_name="")
-	generator.export_all_apps()
-
-	return "Success"
+def export_all_apps(generate_child_tables=False, custom_fields=False, prune=False, resume=False):
+	"""Queue an export of all configured apps and return its status.
+
+	Only one export runs at a time per bench; while one is queued or running,
+	its status is returned instead. Poll ``get_export_status`` for progress.
+	With *resume*, the export continues from the checkpoints of the last one.
+	"""
+	# Imported here, `export_job` depends on this module
+	from .export_job import enqueue_export_all_apps
+
+	return enqueue_export_all_apps(
+		generate_child_tables=frappe.utils.cint(generate_child_tables),
+		custom_fields=frappe.utils.cint(custom_fields),
+		prune=frappe.utils.cint(prune),
+		resume=frappe.utils.cint(resume),
+		# Ignore the Base Output Path used by tests
+		base_output_path="",
+	)
+
+
+@frappe.whitelist()
+def get_export_status():
+	"""Return the status of the current (or last) export of all apps, if any."""
+	from .export_job import get_export_status
+
+	return get_export_status()
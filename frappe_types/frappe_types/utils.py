@@ -3,22 +3,34 @@ from pathlib import Path
 import frappe
 
 
-def create_file(path: Path, content: str | None = None):
+def create_file(path: Path, content: str | None = None, overwrite: bool = True) -> bool:
+	"""Create *path* and write *content* to it.
+
+	A file that already holds exactly *content* is left untouched, so that
+	mtime-based tools (tsc --build, dev-server watchers) do not see a change,
+	and so is any existing file unless *overwrite*.
+	Returns True if the file was created or written.
+	"""
 	# Create the file if not exists
 	if not path.exists():
 		path.touch()
+		created = True
+	elif not overwrite or (content and path.read_text() == content):
+		return False
+	else:
+		created = False
 
 	# Write the contents (if any)
 	if content:
 		with path.open("w") as f:
 			f.write(content)
+		return True
+
+	return created
 
 
 def is_developer_mode_enabled():
-	if not frappe.conf.get("developer_mode"):
-		print("Developer mode not enabled - ignoring type generation")
-		return False
-	return True
+	return bool(frappe.conf.get("developer_mode"))
 
 
 def to_ts_type(fieldtype: str) -> str:
@@ -107,7 +107,19 @@ after_migrate = "frappe_types.frappe_types.type_generator.after_migrate"
 
 
 doc_events = {
-	"DocType": {"on_update": "frappe_types.frappe_types.type_generator.create_type_definition_file"}
+	"DocType": {
+		"on_update": "frappe_types.frappe_types.type_generator.create_type_definition_file",
+		"on_trash": "frappe_types.frappe_types.type_generator.delete_type_definition_file",
+		"after_rename": "frappe_types.frappe_types.type_generator.rename_type_definition_file",
+	},
+	"Custom Field": {
+		"on_update": "frappe_types.frappe_types.type_generator.update_customized_type_definition_file",
+		"on_trash": "frappe_types.frappe_types.type_generator.update_customized_type_definition_file",
+	},
+	"Property Setter": {
+		"on_update": "frappe_types.frappe_types.type_generator.update_customized_type_definition_file",
+		"on_trash": "frappe_types.frappe_types.type_generator.update_customized_type_definition_file",
+	},
 }
 
 # Scheduled Tasks
@@ -0,0 +1,87 @@
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+from frappe_types.frappe_types.api_types import WhitelistScanner, render_api_types
+
+API_MODULE = """
+import frappe
+from frappe import whitelist
+
+
+@frappe.whitelist()
+def get_items(item_group: str, limit: int = 20, fields: list[str] | None = None) -> list[dict]:
+	pass
+
+
+@whitelist(allow_guest=True)
+def ping():
+	return "pong"
+
+
+def not_whitelisted(name: str) -> str:
+	pass
+
+
+class Controller:
+	@frappe.whitelist()
+	def method(self):
+		pass
+"""
+
+
+class TestWhitelistScanner(unittest.TestCase):
+	def setUp(self) -> None:
+		self.tmp_dir = tempfile.TemporaryDirectory()
+		self.app_path = Path(self.tmp_dir.name) / "my_app"
+		(self.app_path / "api").mkdir(parents=True)
+		(self.app_path / "api" / "__init__.py").write_text(textwrap.dedent(API_MODULE))
+		(self.app_path / "hooks.py").write_text("app_name = 'my_app'\n")
+		self.cache_path = Path(self.tmp_dir.name) / "cache" / "my_app.json"
+		return super().setUp()
+
+	def tearDown(self) -> None:
+		self.tmp_dir.cleanup()
+		return super().tearDown()
+
+	def test_scan(self):
+		methods = WhitelistScanner("my_app", self.app_path, self.cache_path).scan()
+
+		self.assertEqual(
+			methods,
+			[
+				{
+					"method": "my_app.api.get_items",
+					"args": [
+						["item_group", "string", False],
+						["limit", "number", True],
+						["fields", "string[] | null", True],
+					],
+					"returns": "Record<string, any>[]",
+				},
+				{"method": "my_app.api.ping", "args": [], "returns": "any"},
+			],
+		)
+		self.assertIn(
+			'    "my_app.api.get_items": { args: { item_group: string; limit?: number; '
+			"fields?: string[] | null }; returns: Record<string, any>[] };",
+			render_api_types(methods),
+		)
+
+	def test_unchanged_files_are_not_parsed_again(self):
+		scanner = WhitelistScanner("my_app", self.app_path, self.cache_path)
+		methods = scanner.scan()
+		scanner.save()
+		self.assertEqual(scanner.parsed, 2)
+
+		scanner = WhitelistScanner("my_app", self.app_path, self.cache_path)
+		self.assertEqual(scanner.scan(), methods)
+		self.assertEqual(scanner.parsed, 0)
+
+		(self.app_path / "hooks.py").write_text(
+			"app_name = 'my_app'\n\n\n@frappe.whitelist()\ndef hook(): ...\n"
+		)
+		methods = scanner.scan()
+		self.assertEqual(scanner.parsed, 1)
+		self.assertEqual(methods[-1]["method"], "my_app.hooks.hook")
@@ -0,0 +1,46 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# Modules bench has already imported before it loads the commands of an app
+PRELOADED = "import click, frappe, frappe.commands"
+# Loose bound on the import of the commands module, which takes a few ms
+MAX_IMPORT_SECONDS = 0.1
+
+IMPORT_SCRIPT = f"""
+import json, sys, time
+{PRELOADED}
+before = set(sys.modules)
+start = time.perf_counter()
+import frappe_types.commands
+elapsed = time.perf_counter() - start
+print(json.dumps({{"modules": sorted(set(sys.modules) - before), "elapsed": elapsed}}))
+"""
+
+
+class TestCommands(unittest.TestCase):
+	def test_commands_import_is_lightweight(self):
+		"""Importing the commands module must not pull in the type generator, since
+		bench imports it on every invocation, whatever the command."""
+		result = subprocess.run(
+			[sys.executable, "-c", IMPORT_SCRIPT], capture_output=True, text=True, check=True
+		)
+		benchmark = json.loads(result.stdout.strip().splitlines()[-1])
+
+		self.assertLessEqual(set(benchmark["modules"]), {"frappe_types", "frappe_types.commands"})
+		self.assertLess(benchmark["elapsed"], MAX_IMPORT_SECONDS)
+
+	def test_commands_are_registered(self):
+		from frappe_types.commands import commands
+
+		self.assertEqual(
+			{command.name for command in commands},
+			{
+				"generate-types-for-doctype",
+				"generate-types-for-module",
+				"generate-types-for-all-apps",
+				"export-type-schema",
+				"generate-types-from-schema",
+			},
+		)
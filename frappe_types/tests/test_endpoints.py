@@ -0,0 +1,77 @@
+import io
+import zipfile
+from pathlib import Path
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request
+
+from frappe_types.frappe_types.endpoints import get_app_types, get_doctype_map, get_doctype_types
+from frappe_types.frappe_types.type_generator import TypeGenerator
+from frappe_types.tests.utils import TestTypeGeneratorUtils
+
+
+class TestEndpoints(FrappeTestCase):
+	def setUp(self) -> None:
+		TestTypeGeneratorUtils.setup()
+		TypeGenerator(app_name=TestTypeGeneratorUtils.app_name).generate_module(TestTypeGeneratorUtils.module)
+		self.set_request()
+		return super().setUp()
+
+	def tearDown(self) -> None:
+		frappe.local.request = None
+		TestTypeGeneratorUtils.cleanup()
+		return super().tearDown()
+
+	def set_request(self, if_none_match: str | None = None):
+		headers = {"If-None-Match": if_none_match} if if_none_match else {}
+		frappe.local.request = Request(EnvironBuilder(method="GET", headers=headers).get_environ())
+
+	def test_get_doctype_types(self):
+		response = get_doctype_types(TestTypeGeneratorUtils.test_doctype_name)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertEqual(
+			response.get_data(as_text=True),
+			Path(TestTypeGeneratorUtils.get_generated_typescript_file_path()).read_text(),
+		)
+		etag, weak = response.get_etag()
+		self.assertFalse(weak)
+
+		self.set_request(f'"{etag}"')
+		response = get_doctype_types(TestTypeGeneratorUtils.test_doctype_name)
+		self.assertEqual(response.status_code, 304)
+		self.assertEqual(response.get_data(), b"")
+
+	def test_get_doctype_types_bundled_with_python_stubs(self):
+		settings = frappe.get_single("Type Generation Settings")
+		settings.output_layout = "Per Module"
+		settings.type_settings[0].python_types = 1
+		settings.save()
+		TypeGenerator(app_name=TestTypeGeneratorUtils.app_name).generate_module(TestTypeGeneratorUtils.module)
+
+		# `__init__.pyi` declares the DocType too, and sorts before `index.d.ts`
+		response = get_doctype_types(TestTypeGeneratorUtils.test_doctype_name)
+		bundle_path = Path(TestTypeGeneratorUtils.get_types_module_path()) / "index.d.ts"
+		self.assertEqual(response.get_data(as_text=True), bundle_path.read_text())
+
+	def test_get_doctype_map(self):
+		response = get_doctype_map(TestTypeGeneratorUtils.app_name)
+
+		self.assertEqual(response.status_code, 200)
+		self.assertIn("interface DocTypeMap", response.get_data(as_text=True))
+
+	def test_get_app_types(self):
+		response = get_app_types(TestTypeGeneratorUtils.app_name)
+
+		self.assertEqual(response.status_code, 200)
+		with zipfile.ZipFile(io.BytesIO(response.get_data())) as archive:
+			self.assertIn("DocTypeMap.d.ts", archive.namelist())
+
+		# Identical trees give identical archives and ETags
+		etag, _ = response.get_etag()
+		self.assertEqual(get_app_types(TestTypeGeneratorUtils.app_name).get_etag()[0], etag)
+
+		self.set_request(f'"{etag}"')
+		self.assertEqual(get_app_types(TestTypeGeneratorUtils.app_name).status_code, 304)
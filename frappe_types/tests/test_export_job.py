@@ -0,0 +1,63 @@
+import os
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from frappe_types.frappe_types import export_job
+from frappe_types.tests.utils import TestTypeGeneratorUtils
+
+
+def run_in_foreground(job_id, generator_kwargs, resume):
+	export_job.run_export_all_apps(job_id, generator_kwargs, resume)
+
+
+class TestExportJob(FrappeTestCase):
+	def setUp(self) -> None:
+		TestTypeGeneratorUtils.setup()
+		frappe.cache.delete(export_job._lock_key())
+		frappe.cache.delete_value(export_job.EXPORT_STATUS_KEY, shared=True)
+		return super().setUp()
+
+	def tearDown(self) -> None:
+		TestTypeGeneratorUtils.cleanup()
+		frappe.cache.delete(export_job._lock_key())
+		return super().tearDown()
+
+	@patch.object(export_job, "_has_workers", return_value=False)
+	@patch.object(export_job, "_start_local_worker", side_effect=run_in_foreground)
+	def test_export_all_apps_in_process(self, _start_local_worker, _has_workers):
+		status = export_job.enqueue_export_all_apps()
+		_start_local_worker.assert_called_once()
+
+		for file_path in TestTypeGeneratorUtils.get_all_apps_output_file_paths():
+			self.assertTrue(os.path.exists(file_path))
+
+		status = export_job.get_export_status()
+		self.assertEqual(status["state"], "Finished")
+		self.assertEqual(status["done"], status["total"])
+		self.assertFalse(frappe.cache.get(export_job._lock_key()))
+
+	@patch.object(export_job, "_has_workers", return_value=False)
+	@patch.object(export_job, "_start_local_worker")
+	def test_single_export_per_bench(self, _start_local_worker, _has_workers):
+		status = export_job.enqueue_export_all_apps()
+		self.assertEqual(status["state"], "Queued")
+
+		self.assertEqual(export_job.enqueue_export_all_apps()["job_id"], status["job_id"])
+		_start_local_worker.assert_called_once()
+
+	@patch.object(export_job, "_has_workers", return_value=False)
+	@patch.object(export_job, "_start_local_worker")
+	def test_foreground_export_takes_the_lock(self, _start_local_worker, _has_workers):
+		status = export_job.enqueue_export_all_apps()
+
+		# Refused while the queued export holds the lock
+		self.assertIsNone(export_job.run_export_all_apps_now())
+		self.assertEqual(export_job.get_export_status()["job_id"], status["job_id"])
+
+		export_job._release_lock(status["job_id"])
+		report = export_job.run_export_all_apps_now()
+		self.assertFalse(report.failures)
+		self.assertEqual(export_job.get_export_status()["state"], "Finished")
+		self.assertFalse(frappe.cache.get(export_job._lock_key()))
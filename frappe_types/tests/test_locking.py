@@ -0,0 +1,123 @@
+import multiprocessing
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from frappe_types.frappe_types.locking import LOCK_STRIPES, LOCKS_DIR, get_lock, get_stamp, get_striped_lock
+from frappe_types.frappe_types.utils import create_file
+
+PROCESSES = 8
+ITERATIONS = 25
+
+
+def increment(bench_root: str, counter: str):
+	"""Increment the counter file, without any atomicity of its own."""
+	for _ in range(ITERATIONS):
+		with get_lock(Path(bench_root), "output:counter"):
+			path = Path(counter)
+			value = int(path.read_text() or 0)
+			time.sleep(0.0005)
+			path.write_text(str(value + 1))
+
+
+def write_declaration(bench_root: str, target: str, index: int):
+	content = f"export interface Generated{index} {{\n" + "    field?: string\n" * 5000 + "}\n"
+	for _ in range(ITERATIONS // 5):
+		with get_lock(Path(bench_root), f"output:{target}"):
+			create_file(Path(target), content)
+
+
+def generate(bench_root: str, target: str, log: str, key: str, barrier):
+	"""Generate *target* from the schema *key* unless a concurrent process did while waiting,
+	like TypeGenerator._generate_type_definition_file."""
+	barrier.wait()
+	stamp = get_stamp(Path(target), key, "python_types")
+	waiting_since = time.time_ns()
+	with get_striped_lock(Path(bench_root), f"file:{target}") as lock:
+		if lock.generated_since(stamp, waiting_since):
+			return
+		time.sleep(0.05)
+		Path(target).write_text(key)
+		with open(log, "a") as f:
+			f.write(f"{key}\n")
+		lock.mark_generated(stamp)
+
+
+class TestLocking(unittest.TestCase):
+	def setUp(self):
+		self.tmp = tempfile.TemporaryDirectory()
+		self.root = Path(self.tmp.name)
+		self.context = multiprocessing.get_context("spawn")
+
+	def tearDown(self):
+		self.tmp.cleanup()
+
+	def run_processes(self, target, args_list):
+		processes = [self.context.Process(target=target, args=args) for args in args_list]
+		for process in processes:
+			process.start()
+		for process in processes:
+			process.join(60)
+			self.assertEqual(process.exitcode, 0)
+
+	def test_lock_is_exclusive_between_processes(self):
+		counter = self.root / "counter"
+		counter.write_text("0")
+		self.run_processes(increment, [(str(self.root), str(counter))] * PROCESSES)
+
+		self.assertEqual(int(counter.read_text()), PROCESSES * ITERATIONS)
+
+	def test_concurrent_writes_are_not_interleaved(self):
+		target = self.root / "DocTypeMap.d.ts"
+		self.run_processes(write_declaration, [(str(self.root), str(target), i) for i in range(PROCESSES)])
+
+		content = target.read_text()
+		self.assertEqual(content.count("export interface"), 1)
+		self.assertTrue(content.endswith("}\n"))
+
+	def test_concurrent_generations_are_coalesced(self):
+		target = self.root / "ToDo.d.ts"
+		log = self.root / "generations.log"
+		log.touch()
+		barrier = self.context.Barrier(PROCESSES)
+		self.run_processes(
+			generate, [(str(self.root), str(target), str(log), "schema-1", barrier)] * PROCESSES
+		)
+
+		# One process generated the file, the others waited for it and reused it
+		self.assertEqual(log.read_text().splitlines(), ["schema-1"])
+
+		# A later run generates the file again, whether the schema changed or not
+		barrier = self.context.Barrier(1)
+		self.run_processes(generate, [(str(self.root), str(target), str(log), "schema-2", barrier)])
+		self.run_processes(generate, [(str(self.root), str(target), str(log), "schema-2", barrier)])
+		self.assertEqual(log.read_text().splitlines(), ["schema-1", "schema-2", "schema-2"])
+
+	def test_stamps_of_other_files_are_not_reused(self):
+		note_stamp = get_stamp(Path("types/Module/Note.d.ts"), "schema-1")
+		todo_stamp = get_stamp(Path("types/Module/ToDo.d.ts"), "schema-1")
+		lock = get_striped_lock(self.root, "file:types/Module/ToDo.d.ts")
+		waiting_since = time.time_ns()
+		with lock:
+			lock.mark_generated(note_stamp)
+			# Striped locks are shared by several files, generated from the same schema or not
+			self.assertTrue(lock.generated_since(note_stamp, waiting_since))
+			self.assertFalse(lock.generated_since(todo_stamp, waiting_since))
+
+			time.sleep(0.001)
+			self.assertFalse(lock.generated_since(note_stamp, time.time_ns()))
+
+	def test_striped_locks_are_bounded(self):
+		for index in range(LOCK_STRIPES * 4):
+			with get_striped_lock(self.root, f"file:types/Module/DocType{index}.d.ts"):
+				pass
+
+		self.assertLessEqual(len(list((self.root / LOCKS_DIR).iterdir())), LOCK_STRIPES)
+
+	def test_lock_is_reentrant(self):
+		lock = get_lock(self.root, "output:types")
+		with lock, get_lock(self.root, "output:types"):
+			lock.write_value("key")
+		with lock:
+			self.assertEqual(lock.read_value(), "key")
@@ -0,0 +1,91 @@
+import tracemalloc
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from frappe_types.frappe_types.type_generator import TypeGenerator
+from frappe_types.tests.utils import TestTypeGeneratorUtils
+
+FIELDS_PER_DOCTYPE = 30
+# Loaded DocTypes take well over 10 KB each; what remains per DocType after
+# generating it (DocTypeMap and manifest entries) is a few hundred bytes
+MAX_BYTES_PER_DOCTYPE = 2048
+
+
+def make_doctype(name: str) -> frappe._dict:
+	doctype = frappe._dict(
+		name=name,
+		module=TestTypeGeneratorUtils.module,
+		custom=0,
+		istable=0,
+		issingle=0,
+		is_virtual=0,
+		naming_rule="",
+	)
+	doctype.fields = [
+		frappe._dict(
+			fieldname=f"field_{i}",
+			fieldtype="Data",
+			label=f"Field {i}",
+			options=None,
+			description="Field of a benchmark DocType",
+			reqd=i % 2,
+		)
+		for i in range(FIELDS_PER_DOCTYPE)
+	]
+	return doctype
+
+
+class TestMemory(FrappeTestCase):
+	def setUp(self) -> None:
+		TestTypeGeneratorUtils.setup()
+		return super().setUp()
+
+	def tearDown(self) -> None:
+		TestTypeGeneratorUtils.cleanup()
+		return super().tearDown()
+
+	def test_generate_module_memory_is_bounded(self):
+		"""Generating a module of 250 and 1250 DocTypes: memory must not grow with the
+		DocTypes loaded, only with the (small) entries kept for the map."""
+		peak_small = self._measure_generate_module(250)
+		peak_large = self._measure_generate_module(1_250)
+
+		self.assertLess((peak_large - peak_small) / 1_000, MAX_BYTES_PER_DOCTYPE)
+
+	def _measure_generate_module(self, count: int) -> int:
+		"""Return the peak of the traced Python allocations, in bytes.
+
+		The DocTypes of the module are served by `frappe.get_list` / `frappe.get_doc`,
+		so that no real DocType (and table) has to be created for them.
+		"""
+		names = [f"Benchmark DocType {i:05}" for i in range(count)]
+		benchmark_names = set(names)
+		original_get_list, original_get_doc = frappe.get_list, frappe.get_doc
+
+		def get_list(doctype, *args, **kwargs):
+			if doctype != "DocType":
+				return original_get_list(doctype, *args, **kwargs)
+			start = kwargs.get("limit_start", 0)
+			return [
+				frappe._dict(name=name, custom=0, is_virtual=0)
+				for name in names[start : start + kwargs["limit_page_length"]]
+			]
+
+		def get_doc(doctype, name=None, *args, **kwargs):
+			if doctype == "DocType" and name in benchmark_names:
+				return make_doctype(name)
+			return original_get_doc(doctype, name, *args, **kwargs)
+
+		generator = TypeGenerator(app_name=TestTypeGeneratorUtils.app_name)
+		with patch.object(frappe, "get_list", get_list), patch.object(frappe, "get_doc", get_doc):
+			tracemalloc.start()
+			try:
+				generator.generate_module(TestTypeGeneratorUtils.module)
+				peak = tracemalloc.get_traced_memory()[1]
+			finally:
+				tracemalloc.stop()
+
+		self.assertFalse(generator.report.failures)
+		return peak
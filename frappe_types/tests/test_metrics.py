@@ -0,0 +1,71 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from frappe_types.frappe_types.metrics import MetricsFile
+from frappe_types.frappe_types.reporting import GenerationReport
+
+HOOK_LATENCY = {
+	"doctype_on_update": {"buckets": [[0.00001, 3], [0.000025, 4], ["+Inf", 4]], "sum": 0.00005, "count": 4}
+}
+
+
+class TestMetricsFile(unittest.TestCase):
+	def setUp(self):
+		self.tmp = tempfile.TemporaryDirectory()
+		self.metrics = MetricsFile(Path(self.tmp.name) / "frappe_types.prom")
+
+	def tearDown(self):
+		self.tmp.cleanup()
+
+	def get_report(self, written: int, failures: int = 0) -> GenerationReport:
+		report = GenerationReport()
+		report.add_total(written)
+		report.advance(written)
+		report.count("files_written", written)
+		report.count("files_unchanged")
+		with report.measure("render"):
+			pass
+		for i in range(failures):
+			report.add_failure(f"DocType {i}", ValueError("Invalid"))
+		return report
+
+	def test_counters_are_cumulative(self):
+		with patch.object(MetricsFile, "_get_hook_latency", return_value=HOOK_LATENCY):
+			self.metrics.add_run("all_apps", self.get_report(10, failures=1), "site1.local")
+			self.metrics.add_run("all_apps", self.get_report(5), "site1.local")
+			self.metrics.add_run("hook", self.get_report(1), "site1.local")
+
+		samples = self.metrics.read()
+		labels = '{site="site1.local",run="all_apps"}'
+		self.assertEqual(samples[f"frappe_types_runs_total{labels}"], 2)
+		self.assertEqual(samples[f"frappe_types_files_written_total{labels}"], 15)
+		self.assertEqual(samples[f"frappe_types_files_unchanged_total{labels}"], 2)
+		self.assertEqual(samples[f"frappe_types_failures_total{labels}"], 1)
+		self.assertEqual(samples[f"frappe_types_last_run_failures{labels}"], 0)
+		self.assertIn(
+			'frappe_types_phase_seconds_total{site="site1.local",run="all_apps",phase="render"}', samples
+		)
+		self.assertEqual(samples['frappe_types_runs_total{site="site1.local",run="hook"}'], 1)
+
+		# The hook histogram comes from the site's cache, already cumulative
+		hook_labels = 'site="site1.local",hook="doctype_on_update"'
+		self.assertEqual(samples[f'frappe_types_hook_duration_seconds_bucket{{{hook_labels},le="1e-05"}}'], 3)
+		self.assertEqual(samples[f'frappe_types_hook_duration_seconds_bucket{{{hook_labels},le="+Inf"}}'], 4)
+		self.assertEqual(samples[f"frappe_types_hook_duration_seconds_count{{{hook_labels}}}"], 4)
+
+	def test_file_format(self):
+		with patch.object(MetricsFile, "_get_hook_latency", return_value=HOOK_LATENCY):
+			self.metrics.add_run("module", self.get_report(1), "site1.local")
+
+		lines = self.metrics.path.read_text().splitlines()
+		self.assertIn("# TYPE frappe_types_runs_total counter", lines)
+		self.assertIn("# TYPE frappe_types_hook_duration_seconds histogram", lines)
+		self.assertEqual(lines.count("# TYPE frappe_types_hook_duration_seconds histogram"), 1)
+		self.assertIn('frappe_types_runs_total{site="site1.local",run="module"} 1', lines)
+		# Written atomically, nothing is left next to the file but its lock
+		self.assertEqual(
+			sorted(path.name for path in self.metrics.path.parent.iterdir()),
+			[".frappe_types.prom.lock", "frappe_types.prom"],
+		)
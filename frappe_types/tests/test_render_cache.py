@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from frappe_types.frappe_types.render_cache import RenderCache
+
+
+class TestRenderCache(unittest.TestCase):
+	def setUp(self) -> None:
+		self.tmp_dir = tempfile.TemporaryDirectory()
+		self.cache = RenderCache(Path(self.tmp_dir.name), max_size=1024 * 1024)
+		return super().setUp()
+
+	def tearDown(self) -> None:
+		self.tmp_dir.cleanup()
+		return super().tearDown()
+
+	def test_key_is_content_addressed(self):
+		schema = {"name": "ToDo", "fields": [{"fieldname": "status", "fieldtype": "Select"}]}
+		key = self.cache.get_key(schema, {})
+
+		self.assertEqual(key, self.cache.get_key(dict(reversed(schema.items())), {}))
+		self.assertNotEqual(key, self.cache.get_key({**schema, "name": "Note"}, {}))
+		self.assertNotEqual(key, self.cache.get_key(schema, {"items": ["ToDoItem[]", None]}))
+
+	def test_get_and_put(self):
+		key = self.cache.get_key({"name": "ToDo"}, {})
+		self.assertIsNone(self.cache.get(key))
+
+		rendered = (["import { Item } from './Item'"], "export interface ToDo extends DocType {\n}")
+		self.cache.put(key, rendered)
+
+		self.assertEqual(self.cache.get(key), (list(rendered[0]), rendered[1]))
+		self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+	def test_evicts_least_recently_used(self):
+		interface = "x" * 350
+		cache = RenderCache(Path(self.tmp_dir.name), max_size=1000)
+		keys = [cache.get_key({"name": str(i)}, {}) for i in range(3)]
+
+		for i, key in enumerate(keys[:2]):
+			cache.put(key, ([], interface))
+			path = cache._get_path(key)
+			os.utime(path, (i, i))
+
+		# Accessing the oldest entry makes the second one the eviction candidate
+		cache.get(keys[0])
+		cache.put(keys[2], ([], interface))
+
+		self.assertIsNotNone(cache.get(keys[0]))
+		self.assertIsNone(cache.get(keys[1]))
+		self.assertIsNotNone(cache.get(keys[2]))
@@ -0,0 +1,64 @@
+import io
+import logging
+import unittest
+from unittest.mock import patch
+
+from frappe_types.frappe_types.reporting import GenerationReport, configure_logging, get_logger
+
+
+class TTYStream(io.StringIO):
+	def isatty(self) -> bool:
+		return True
+
+
+class TestGenerationReport(unittest.TestCase):
+	def tearDown(self) -> None:
+		configure_logging()
+		return super().tearDown()
+
+	def test_summary_lists_failures(self):
+		report = GenerationReport(stream=io.StringIO())
+		report.add_total(2)
+		report.advance()
+		try:
+			raise ValueError("Invalid options")
+		except ValueError as e:
+			report.add_failure("Sales Invoice", e)
+		report.advance()
+
+		with self.assertLogs(get_logger(), level=logging.INFO) as logs:
+			report.summary()
+
+		output = "\n".join(logs.output)
+		self.assertIn("Processed 2 DocTypes", output)
+		self.assertIn("1 failed", output)
+		self.assertIn("Sales Invoice", output)
+		self.assertIn("ValueError: Invalid options", output)
+		self.assertNotIn("Traceback", output)
+
+	def test_measure_excludes_nested_phases(self):
+		report = GenerationReport(stream=io.StringIO())
+		with patch("frappe_types.frappe_types.reporting.time.perf_counter", side_effect=[0.0, 1.0, 3.0, 4.0]):
+			with report.measure("render"):
+				with report.measure("write"):
+					pass
+
+		self.assertEqual(report.timings, {"render": 2.0, "write": 2.0})
+
+	def test_progress_line(self):
+		stream = TTYStream()
+		report = GenerationReport(stream=stream)
+		report.add_total(2)
+		report.advance()
+		report.advance()
+
+		self.assertIn("2/2 DocTypes", stream.getvalue())
+
+	def test_quiet_hides_progress(self):
+		configure_logging(quiet=True)
+		stream = TTYStream()
+		report = GenerationReport(stream=stream)
+		report.add_total(1)
+		report.advance()
+
+		self.assertEqual(stream.getvalue(), "")
@@ -0,0 +1,98 @@
+import gzip
+import json
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from frappe_types.frappe_types.snapshot import SNAPSHOT_VERSION, export_schema, generate_from_snapshot
+from frappe_types.tests.utils import TestTypeGeneratorUtils, sanitize_content
+
+
+class TestSnapshot(FrappeTestCase):
+	def setUp(self) -> None:
+		TestTypeGeneratorUtils.setup()
+		self.snapshot_path = Path(TestTypeGeneratorUtils.temp_dir) / "schema.jsonl.gz"
+		return super().setUp()
+
+	def tearDown(self) -> None:
+		TestTypeGeneratorUtils.cleanup()
+		return super().tearDown()
+
+	def test_export_schema(self):
+		with patch.object(frappe, "get_doc", wraps=frappe.get_doc) as get_doc:
+			count = export_schema(self.snapshot_path)
+
+		# Schemas are loaded in bulk, not one document at a time
+		self.assertFalse([call for call in get_doc.call_args_list if call.args[0] == "DocType"])
+
+		with gzip.open(self.snapshot_path, "rt") as f:
+			header, *records = [json.loads(line) for line in f]
+
+		self.assertEqual(header["version"], SNAPSHOT_VERSION)
+		self.assertEqual(count, len(records))
+		self.assertEqual(
+			header["doctypes"][TestTypeGeneratorUtils.test_doctype_name], TestTypeGeneratorUtils.module
+		)
+		# Child tables first, so they are generated before the DocTypes importing them
+		self.assertEqual(records[0]["schema"]["name"], TestTypeGeneratorUtils.doctype_child_name)
+
+	def test_generate_from_snapshot_without_database(self):
+		frappe.get_doc(
+			{
+				"doctype": "Custom Field",
+				"dt": TestTypeGeneratorUtils.test_doctype_name,
+				"fieldname": "custom_note",
+				"fieldtype": "Data",
+				"label": "Custom Note",
+				"insert_after": "data_field",
+			}
+		).insert()
+		export_schema(self.snapshot_path)
+
+		db = frappe.local.db
+		frappe.local.db = None
+		try:
+			report = generate_from_snapshot(
+				self.snapshot_path, base_output_path=TestTypeGeneratorUtils.temp_dir
+			)
+		finally:
+			frappe.local.db = db
+
+		self.assertEqual(report.failures, [])
+		for file_path in TestTypeGeneratorUtils.get_all_apps_output_file_paths():
+			self.assertTrue(os.path.exists(file_path))
+		self.assertTrue(
+			os.path.exists(
+				os.path.join(TestTypeGeneratorUtils.get_types_output_base_path(), "DocTypeMap.d.ts")
+			)
+		)
+
+		with open(TestTypeGeneratorUtils.get_generated_typescript_file_path()) as f:
+			content = sanitize_content(f.read())
+		self.assertIn(
+			"data_field?: string\n    /**	Custom Note : Data	*/\n    custom_note?: string", content
+		)
+		self.assertIn(TestTypeGeneratorUtils._render_import_child_table(), content)
+
+	def test_generate_from_snapshot_with_child_table_of_other_app(self):
+		frappe.get_doc(
+			{
+				"doctype": "Custom Field",
+				"dt": TestTypeGeneratorUtils.test_doctype_name_2,
+				"fieldname": "custom_roles",
+				"fieldtype": "Table",
+				"options": "Has Role",
+				"label": "Custom Roles",
+			}
+		).insert()
+		export_schema(self.snapshot_path)
+
+		report = generate_from_snapshot(self.snapshot_path, base_output_path=TestTypeGeneratorUtils.temp_dir)
+
+		# Like generating from the database, the table is typed `any` instead of failing the DocType
+		self.assertEqual(report.failures, [])
+		with open(TestTypeGeneratorUtils.get_types_module_files_paths()[0]) as f:
+			self.assertIn("custom_roles?: any", f.read())
@@ -1,10 +1,18 @@
+import json
 import os
 import shutil
+import time
+from pathlib import Path
+from unittest.mock import patch
 
 import frappe
 from frappe.tests.utils import FrappeTestCase
 
-from frappe_types.frappe_types.type_generator import TypeGenerator
+from frappe_types.frappe_types.hook_guards import get_configured_apps
+from frappe_types.frappe_types.latency import get_hook_latency
+from frappe_types.frappe_types.schema import CustomizationOverlay
+from frappe_types.frappe_types.selection import expand_link_targets, resolve_doctypes
+from frappe_types.frappe_types.type_generator import TypeGenerator, create_type_definition_file
 from frappe_types.tests.utils import TestTypeGeneratorUtils, sanitize_content, to_ts_type
 
 
@@ -82,6 +90,78 @@ class TestTypeGenerator(FrappeTestCase):
 				TestTypeGeneratorUtils.get_expected_ts_file(with_child_table=True),
 			)
 
+	def test_generate_many_from_patterns(self):
+		names, unmatched = resolve_doctypes(
+			[f"{self.doctype_name} [0-9]", f"re:^{self.doctype_name} Child", "Missing DocType"]
+		)
+		self.assertEqual(
+			names,
+			[
+				TestTypeGeneratorUtils.doctype_child_name,
+				TestTypeGeneratorUtils.test_doctype_name_2,
+				TestTypeGeneratorUtils.test_doctype_name_3,
+			],
+		)
+		self.assertEqual(unmatched, ["Missing DocType"])
+
+		generator = self.instantiate_type_generator()
+		with patch.object(generator, "_write_doctype_map", wraps=generator._write_doctype_map) as write_map:
+			result = generator.generate_many([*names, self.doctype_name, "Missing DocType"])
+
+		write_map.assert_called_once()
+		self.assertEqual(generator.report.done, 5)
+		self.assertEqual(set(result.written), {*names, self.doctype_name})
+		self.assertEqual(list(result.failed), ["Missing DocType"])
+		with open(self.generated_typescript_file_path) as f:
+			self.assertEqual(
+				sanitize_content(f.read()),
+				TestTypeGeneratorUtils.get_expected_ts_file(with_child_table=True),
+			)
+
+		# Nothing changed since, so nothing is written again
+		result = self.instantiate_type_generator().generate_many([self.doctype_name])
+		self.assertEqual((result.written, result.unchanged), ([], [self.doctype_name]))
+
+	def test_generate_many_loads_schemas_in_bulk(self):
+		names = [
+			TestTypeGeneratorUtils.doctype_child_name,
+			self.doctype_name,
+			TestTypeGeneratorUtils.test_doctype_name_2,
+		]
+		with patch.object(frappe, "get_doc", wraps=frappe.get_doc) as get_doc:
+			result = self.instantiate_type_generator().generate_many(names)
+
+		self.assertEqual(set(result.written), set(names))
+		self.assertFalse([call for call in get_doc.call_args_list if call.args[:1] == ("DocType",)])
+
+	def test_generate_many_with_link_targets(self):
+		child_name = TestTypeGeneratorUtils.doctype_child_name
+		# Level 1: the child table and the DocType of `link_field`, level 2: the child tables of DocType
+		self.assertEqual(expand_link_targets([self.doctype_name], 1), sorted([child_name, "DocType"]))
+		with patch.object(frappe, "get_all", wraps=frappe.get_all) as get_all:
+			targets = expand_link_targets([self.doctype_name], 2)
+		self.assertEqual(targets[:2], sorted([child_name, "DocType"]))
+		self.assertIn("DocField", targets)
+		self.assertEqual(len(set(targets)), len(targets))
+		self.assertEqual(get_all.call_count, 2)
+
+		# Only the DocTypes of the configured apps are followed
+		self.assertEqual(
+			expand_link_targets([self.doctype_name], 2, modules=[TestTypeGeneratorUtils.module]), [child_name]
+		)
+
+		result = self.instantiate_type_generator().generate_many([self.doctype_name], link_depth=2)
+
+		# DocType belongs to frappe, whose declarations are not copied into the app's types
+		self.assertEqual(set(result.written), {self.doctype_name, child_name})
+		types_path = Path(TestTypeGeneratorUtils.get_types_output_base_path())
+		self.assertFalse((types_path / "Core").exists())
+		with open(self.generated_typescript_file_path) as f:
+			self.assertEqual(
+				sanitize_content(f.read()),
+				TestTypeGeneratorUtils.get_expected_ts_file(with_child_table=True),
+			)
+
 	def test_generate_types_for_module(self):
 		generator = self.instantiate_type_generator()
 
@@ -110,6 +190,93 @@ class TestTypeGenerator(FrappeTestCase):
 			],
 		)
 
+	def test_doctype_map_is_byte_stable(self):
+		generator = self.instantiate_type_generator()
+		generator.generate_module(TestTypeGeneratorUtils.module)
+
+		map_path = Path(TestTypeGeneratorUtils.get_types_output_base_path()) / "DocTypeMap.d.ts"
+		content = map_path.read_text()
+		entries = generator._read_doctype_map(map_path)
+
+		self.assertEqual(entries, sorted(entries))
+		# Neither order nor duplicates of the entries change the rendered map
+		self.assertEqual(generator._render_doctype_map([*reversed(entries), *entries]), content)
+
+	def test_additional_output_targets(self):
+		settings = frappe.get_single("Type Generation Settings")
+		settings.type_settings[0].additional_app_paths = "portal\nmobile/src"
+		settings.save()
+
+		generator = self.instantiate_type_generator()
+		generator.generate_module(TestTypeGeneratorUtils.module)
+
+		types_path = Path(TestTypeGeneratorUtils.get_types_output_base_path())
+		app_path = Path(TestTypeGeneratorUtils.temp_dir) / TestTypeGeneratorUtils.app_name
+		target_paths = [app_path / "portal" / "types", app_path / "mobile" / "src" / "types"]
+		generated_files = [path.relative_to(types_path) for path in types_path.rglob("*.d.ts")]
+		self.assertTrue(generated_files)
+		for target_path in target_paths:
+			for relative_path in generated_files:
+				self.assertEqual(
+					(target_path / relative_path).read_text(), (types_path / relative_path).read_text()
+				)
+
+		# Each target skips unchanged files on its own
+		ts_file = Path(self.generated_typescript_file_path).relative_to(types_path)
+		(target_paths[0] / ts_file).write_text("// edited")
+		mtime = (types_path / ts_file).stat().st_mtime_ns
+
+		generator = self.instantiate_type_generator()
+		generator.generate_module(TestTypeGeneratorUtils.module)
+
+		self.assertEqual((types_path / ts_file).stat().st_mtime_ns, mtime)
+		self.assertEqual((target_paths[0] / ts_file).read_text(), (types_path / ts_file).read_text())
+
+	def test_python_type_stubs(self):
+		def count_queries() -> int:
+			with patch.object(frappe.db, "sql", wraps=frappe.db.sql) as sql:
+				self.instantiate_type_generator(generate_child_tables=True).generate_doctype(
+					self.doctype_name
+				)
+			return sql.call_count
+
+		queries = count_queries()
+		self.assertFalse(os.path.exists(self.generated_typescript_file_path.replace(".d.ts", ".pyi")))
+
+		settings = frappe.get_single("Type Generation Settings")
+		settings.type_settings[0].python_types = 1
+		settings.save()
+		shutil.rmtree(TestTypeGeneratorUtils.get_types_output_base_path())
+
+		# The stubs are rendered from the metadata loaded for the TypeScript interfaces
+		self.assertEqual(count_queries(), queries)
+
+		child_ts = to_ts_type(TestTypeGeneratorUtils.doctype_child_name)
+		with open(self.generated_typescript_file_path.replace(".d.ts", ".pyi")) as f:
+			content = f.read()
+		self.assertIn(f"from .{child_ts} import {child_ts}\n", content)
+		self.assertIn(f"class {to_ts_type(self.doctype_name)}(TypedDict):\n    name: str\n", content)
+		self.assertIn("    int_field: NotRequired[int]\n", content)
+		self.assertIn("    check_field: NotRequired[Literal[0, 1]]\n", content)
+		self.assertIn(f"    table_field: NotRequired[list[{child_ts}]]\n", content)
+		self.assertTrue(os.path.exists(self.child_table_typescript_file_path.replace(".d.ts", ".pyi")))
+
+		manifest = json.loads(
+			(
+				Path(TestTypeGeneratorUtils.get_types_output_base_path()) / ".frappe-types-manifest.json"
+			).read_text()
+		)
+		module_dir = to_ts_type(TestTypeGeneratorUtils.module)
+		self.assertEqual(
+			manifest["files"][f"{module_dir}/{to_ts_type(self.doctype_name)}.pyi"], [self.doctype_name]
+		)
+
+		# The hooks run without an app, the stubs follow the app owning the module
+		stub_path = Path(self.generated_typescript_file_path.replace(".d.ts", ".pyi"))
+		stub_path.unlink()
+		TypeGenerator(app_name="").update_type_definition_file(frappe.get_doc("DocType", self.doctype_name))
+		self.assertEqual(stub_path.read_text(), content)
+
 	def test_updates_types(self):
 		doc = frappe.get_doc("DocType", self.doctype_name)
 		doc.append(
@@ -129,6 +296,31 @@ class TestTypeGenerator(FrappeTestCase):
 				TestTypeGeneratorUtils.get_expected_ts_file(with_updated_fields=True),
 			)
 
+	def test_hook_returns_before_database_access(self):
+		doctype = frappe.get_doc("DocType", self.doctype_name)
+		standard_doctype = frappe.get_doc("DocType", "ToDo")
+		get_configured_apps()
+		count = get_hook_latency().get("doctype_on_update")
+		count = count.count if count else 0
+
+		db = frappe.local.db
+		frappe.local.db = None
+		try:
+			# Not in developer mode
+			with patch.dict(frappe.conf, {"developer_mode": 0}):
+				start = time.perf_counter()
+				for _ in range(1000):
+					create_type_definition_file(doctype)
+				elapsed = time.perf_counter() - start
+			# Not an app of Type Generation Settings
+			create_type_definition_file(standard_doctype)
+		finally:
+			frappe.local.db = db
+
+		self.assertLess(elapsed / 1000, 0.001)
+		self.assertFalse(os.path.exists(self.generated_typescript_file_path))
+		self.assertEqual(get_hook_latency()["doctype_on_update"].count, count + 1001)
+
 	def test_generation_paused(self):
 		frappe.conf["frappe_types_pause_generation"] = 1
 		generator = self.instantiate_type_generator()
@@ -187,6 +379,79 @@ class TestTypeGenerator(FrappeTestCase):
 			TestTypeGeneratorUtils.module_2,
 		)
 
+	def test_export_all_apps_links_core_app_package(self):
+		package_cache_dir = Path(TestTypeGeneratorUtils.temp_dir) / "packages"
+		with (
+			patch("frappe_types.frappe_types.type_generator.CORE_APPS", {TestTypeGeneratorUtils.app_name_2}),
+			patch.dict(frappe.conf, {"frappe_types_package_cache_dir": str(package_cache_dir)}),
+			# Test DocTypes are custom, which packages leave out
+			patch.object(TypeGenerator, "_is_valid_doctype", return_value=True),
+			patch.object(
+				TypeGenerator,
+				"_build_core_package",
+				autospec=True,
+				side_effect=TypeGenerator._build_core_package,
+			) as build_core_package,
+		):
+			for _ in range(2):
+				TypeGenerator(app_name="").export_all_apps()
+
+		# Built once, then reused
+		build_core_package.assert_called_once()
+		module_path = Path(TestTypeGeneratorUtils.get_types_module_2_path())
+		self.assertTrue(module_path.is_symlink())
+		self.assertTrue(module_path.resolve().is_relative_to(package_cache_dir.resolve()))
+		for file_path in TestTypeGeneratorUtils.get_app_2_output_file_paths():
+			self.assertTrue(os.path.exists(file_path))
+
+		self._assert_doctype_map(
+			os.path.join(
+				TestTypeGeneratorUtils.get_types_output_base_path(TestTypeGeneratorUtils.app_name_2),
+				"DocTypeMap.d.ts",
+			),
+			[TestTypeGeneratorUtils.test_doctype_name_3],
+			TestTypeGeneratorUtils.module_2,
+		)
+
+	def test_custom_fields_of_core_app_unlink_package(self):
+		package_cache_dir = Path(TestTypeGeneratorUtils.temp_dir) / "packages"
+		with (
+			patch("frappe_types.frappe_types.type_generator.CORE_APPS", {TestTypeGeneratorUtils.app_name_2}),
+			patch.dict(frappe.conf, {"frappe_types_package_cache_dir": str(package_cache_dir)}),
+			patch.object(TypeGenerator, "_is_valid_doctype", return_value=True),
+		):
+			TypeGenerator(app_name="").export_all_apps()
+			module_path = Path(TestTypeGeneratorUtils.get_types_module_2_path())
+			package_file_path = (
+				module_path.resolve() / f"{to_ts_type(TestTypeGeneratorUtils.test_doctype_name_3)}.d.ts"
+			)
+
+			frappe.get_doc(
+				{
+					"doctype": "Custom Field",
+					"dt": TestTypeGeneratorUtils.test_doctype_name_3,
+					"fieldname": "custom_note",
+					"fieldtype": "Data",
+					"label": "Custom Note",
+				}
+			).insert()
+			generator = TypeGenerator(app_name=TestTypeGeneratorUtils.app_name_2, custom_fields=True)
+			generator.generate_module(TestTypeGeneratorUtils.module_2)
+
+		# The site's customizations are written to a copy of the module, never to the shared package
+		self.assertFalse(module_path.is_symlink())
+		file_path = TestTypeGeneratorUtils.get_app_2_output_file_paths()[0]
+		with open(file_path) as f:
+			self.assertIn("custom_note?: string", f.read())
+		self.assertNotIn("custom_note", package_file_path.read_text())
+
+		manifest_path = Path(
+			TestTypeGeneratorUtils.get_types_output_base_path(TestTypeGeneratorUtils.app_name_2)
+		)
+		with open(manifest_path / ".frappe-types-manifest.json") as f:
+			manifest = json.load(f)
+		self.assertNotIn(to_ts_type(TestTypeGeneratorUtils.module_2), manifest["files"])
+
 	def test_export_all_apps_to_root(self):
 		settings = frappe.get_single("Type Generation Settings")
 		settings.export_to_root = 1
@@ -216,6 +481,388 @@ class TestTypeGenerator(FrappeTestCase):
 			TestTypeGeneratorUtils.module_2,
 		)
 
+	def test_generate_module_bundled_per_module(self):
+		settings = frappe.get_single("Type Generation Settings")
+		settings.output_layout = "Per Module"
+		settings.save()
+
+		generator = self.instantiate_type_generator()
+		generator.generate_module(TestTypeGeneratorUtils.module)
+
+		self.assertFalse(os.path.exists(self.generated_typescript_file_path))
+		self.assertFalse(os.path.exists(self.child_table_typescript_file_path))
+
+		bundle_path = os.path.join(self.types_module_path, "index.d.ts")
+		with open(bundle_path) as f:
+			content = f.read()
+
+		child_ts = to_ts_type(TestTypeGeneratorUtils.doctype_child_name)
+		self.assertNotIn("import", content)
+		for doctype in (
+			TestTypeGeneratorUtils.doctype_child_name,
+			TestTypeGeneratorUtils.test_doctype_name,
+			TestTypeGeneratorUtils.test_doctype_name_2,
+		):
+			self.assertIn(f"export interface {to_ts_type(doctype)} extends DocType {{", content)
+		self.assertIn(f"table_field?: {child_ts}[]", content)
+
+		map_path = os.path.join(TestTypeGeneratorUtils.get_types_output_base_path(), "DocTypeMap.d.ts")
+		map_content = sanitize_content(open(map_path).read())
+		module_dir = to_ts_type(TestTypeGeneratorUtils.module)
+		self.assertEqual(map_content.count(f"from './{module_dir}/index';"), 1)
+		self.assertIn(f'"{TestTypeGeneratorUtils.doctype_child_name}": {child_ts};', map_content)
+
+	def test_generate_module_bundled_per_app(self):
+		settings = frappe.get_single("Type Generation Settings")
+		settings.output_layout = "Per App"
+		settings.save()
+
+		generator = self.instantiate_type_generator()
+		with patch.object(frappe, "get_doc", wraps=frappe.get_doc) as get_doc:
+			generator.generate_module(TestTypeGeneratorUtils.module)
+
+		# Schemas are loaded in bulk, not one document per DocType
+		self.assertFalse([call for call in get_doc.call_args_list if call.args[0] == "DocType"])
+		self.assertFalse(os.path.exists(os.path.join(self.types_module_path, "index.d.ts")))
+
+		types_path = TestTypeGeneratorUtils.get_types_output_base_path()
+		with open(os.path.join(types_path, f"{TestTypeGeneratorUtils.app_name}.d.ts")) as f:
+			content = f.read()
+		for doctype in (
+			TestTypeGeneratorUtils.doctype_child_name,
+			TestTypeGeneratorUtils.test_doctype_name,
+			TestTypeGeneratorUtils.test_doctype_name_2,
+		):
+			self.assertIn(f"export interface {to_ts_type(doctype)} extends DocType {{", content)
+
+		map_content = sanitize_content(open(os.path.join(types_path, "DocTypeMap.d.ts")).read())
+		self.assertEqual(map_content.count(f"from './{TestTypeGeneratorUtils.app_name}';"), 1)
+
+	def test_bundle_imports_child_table_of_other_bundle(self):
+		# A child table of the first app's module, in a DocType of the second app
+		frappe.flags.type_generator_disable_update = 1
+		doctype_3 = frappe.get_doc("DocType", TestTypeGeneratorUtils.test_doctype_name_3)
+		doctype_3.append(
+			"fields",
+			{
+				"fieldname": "table_field",
+				"fieldtype": "Table",
+				"label": "Table Field",
+				"options": TestTypeGeneratorUtils.doctype_child_name,
+			},
+		)
+		doctype_3.save()
+		frappe.flags.type_generator_disable_update = 0
+
+		child_ts = to_ts_type(TestTypeGeneratorUtils.doctype_child_name)
+		# The `types` directory of the first app, relative to the base output path
+		types_path = (
+			f"{TestTypeGeneratorUtils.app_name}/{TestTypeGeneratorUtils.app_path_output_setting}/types"
+		)
+		for layout, bundle, import_path in (
+			(
+				"Per Module",
+				os.path.join(TestTypeGeneratorUtils.get_types_module_2_path(), "index.d.ts"),
+				f"../../../../{types_path}/{to_ts_type(TestTypeGeneratorUtils.module)}/index",
+			),
+			(
+				"Per App",
+				os.path.join(
+					TestTypeGeneratorUtils.get_types_output_base_path(TestTypeGeneratorUtils.app_name_2),
+					f"{TestTypeGeneratorUtils.app_name_2}.d.ts",
+				),
+				f"../../../{types_path}/{TestTypeGeneratorUtils.app_name}",
+			),
+		):
+			with self.subTest(layout=layout):
+				settings = frappe.get_single("Type Generation Settings")
+				settings.output_layout = layout
+				settings.save()
+
+				generator = TypeGenerator(
+					app_name=TestTypeGeneratorUtils.app_name_2, generate_child_tables=True
+				)
+				generator.generate_module(TestTypeGeneratorUtils.module_2)
+
+				with open(bundle) as f:
+					content = f.read()
+				self.assertIn(f"import {{ {child_ts} }} from '{import_path}'\n", content)
+				self.assertIn(f"table_field?: {child_ts}[]", content)
+				# The bundle of the child table was generated along
+				self.assertTrue(os.path.exists(os.path.join(os.path.dirname(bundle), f"{import_path}.d.ts")))
+
+	def test_generate_tsconfig_project_references(self):
+		settings = frappe.get_single("Type Generation Settings")
+		settings.generate_tsconfig = 1
+		settings.save()
+
+		generator = self.instantiate_type_generator()
+		generator.generate_module(TestTypeGeneratorUtils.module)
+
+		module_dir = to_ts_type(TestTypeGeneratorUtils.module)
+		with open(os.path.join(self.types_module_path, "tsconfig.json")) as f:
+			module_config = json.load(f)
+		self.assertTrue(module_config["compilerOptions"]["composite"])
+		self.assertEqual(module_config["include"], ["*.d.ts"])
+		self.assertEqual(module_config["references"], [])
+
+		types_path = TestTypeGeneratorUtils.get_types_output_base_path()
+		with open(os.path.join(types_path, "tsconfig.json")) as f:
+			solution_config = json.load(f)
+		self.assertEqual(solution_config["files"], [])
+		self.assertEqual(solution_config["references"], [{"path": f"./{module_dir}"}])
+		self.assertTrue(os.path.exists(os.path.join(types_path, "tsconfig.base.json")))
+
+		# Unchanged output is not rewritten, so tsc --build can skip the module
+		mtime = os.path.getmtime(self.generated_typescript_file_path)
+		generator.generate_module(TestTypeGeneratorUtils.module)
+		self.assertEqual(os.path.getmtime(self.generated_typescript_file_path), mtime)
+
+	def test_generate_module_with_custom_fields(self):
+		frappe.get_doc(
+			{
+				"doctype": "Custom Field",
+				"dt": self.doctype_name,
+				"fieldname": "custom_note",
+				"fieldtype": "Data",
+				"label": "Custom Note",
+				"insert_after": "data_field",
+			}
+		).insert()
+		frappe.make_property_setter(
+			{
+				"doctype": self.doctype_name,
+				"fieldname": "int_field",
+				"property": "reqd",
+				"value": 1,
+				"property_type": "Check",
+			}
+		)
+
+		generator = TypeGenerator(app_name=TestTypeGeneratorUtils.app_name, custom_fields=True)
+		generator.generate_module(TestTypeGeneratorUtils.module)
+
+		with open(self.generated_typescript_file_path) as f:
+			content = sanitize_content(f.read())
+
+		self.assertIn(
+			"data_field?: string\n    /**	Custom Note : Data	*/\n    custom_note?: string",
+			content,
+		)
+		self.assertIn("\n    int_field: number", content)
+
+	def test_custom_fields_inserted_after_later_custom_fields(self):
+		# Saved first, custom_remark is placed after a custom field that is only loaded after it
+		for fieldname, insert_after in (("custom_remark", "custom_note"), ("custom_note", "data_field")):
+			frappe.get_doc(
+				{
+					"doctype": "Custom Field",
+					"dt": self.doctype_name,
+					"fieldname": fieldname,
+					"fieldtype": "Data",
+					"label": fieldname,
+					"insert_after": insert_after,
+				}
+			).insert()
+
+		schema = CustomizationOverlay().apply(frappe.get_doc("DocType", self.doctype_name))
+
+		fieldnames = [field.fieldname for field in schema.fields]
+		position = fieldnames.index("data_field")
+		self.assertEqual(fieldnames[position : position + 3], ["data_field", "custom_note", "custom_remark"])
+
+	def test_nested_bundle_keeps_prefetched_customizations(self):
+		settings = frappe.get_single("Type Generation Settings")
+		settings.output_layout = "Per Module"
+		settings.save()
+
+		generator = TypeGenerator(app_name=TestTypeGeneratorUtils.app_name, custom_fields=True)
+		resolve_table_fields = generator._resolve_table_fields
+
+		# A child table from another bundle, generated while rendering the first DocType
+		def resolve_with_nested_bundle(doctype, module_path):
+			generator._generate_bundle(TestTypeGeneratorUtils.app_name_2, TestTypeGeneratorUtils.module_2)
+			return resolve_table_fields(doctype, module_path)
+
+		with (
+			patch.object(generator, "_resolve_table_fields", side_effect=resolve_with_nested_bundle),
+			patch.object(frappe, "get_all", wraps=frappe.get_all) as get_all,
+		):
+			generator.generate_module(TestTypeGeneratorUtils.module)
+
+		# One query per bundle, none per DocType of the outer bundle
+		custom_field_queries = [call for call in get_all.call_args_list if call.args[0] == "Custom Field"]
+		self.assertEqual(len(custom_field_queries), 2)
+
+	def test_updates_types_on_customization(self):
+		for fieldname in ("custom_note", "custom_remark"):
+			frappe.get_doc(
+				{
+					"doctype": "Custom Field",
+					"dt": self.doctype_name,
+					"fieldname": fieldname,
+					"fieldtype": "Data",
+					"label": fieldname,
+				}
+			).insert()
+
+		# Both customizations are coalesced into a single regeneration after commit
+		self.assertEqual(frappe.flags.type_generator_customized_doctypes, {self.doctype_name})
+		frappe.db.after_commit.run()
+
+		with open(self.generated_typescript_file_path) as f:
+			content = f.read()
+		self.assertIn("custom_note?: string", content)
+		self.assertIn("custom_remark?: string", content)
+
+	def test_doctype_save_keeps_custom_fields(self):
+		frappe.get_doc(
+			{
+				"doctype": "Custom Field",
+				"dt": self.doctype_name,
+				"fieldname": "custom_note",
+				"fieldtype": "Data",
+				"label": "Custom Note",
+			}
+		).insert()
+		frappe.db.after_commit.run()
+
+		# The DocType hook renders the customizations too, so saving does not drop them
+		doc = frappe.get_doc("DocType", self.doctype_name)
+		doc.append("fields", {"fieldname": "data_field_new", "fieldtype": "Data", "label": "Data Field New"})
+		doc.save()
+
+		with open(self.generated_typescript_file_path) as f:
+			content = f.read()
+		self.assertIn("custom_note?: string", content)
+		self.assertIn("data_field_new?: string", content)
+
+	def test_output_paths_resolved_once(self):
+		settings = frappe.get_single("Type Generation Settings")
+		settings.export_to_root = 1
+		settings.root_output_path = "types"
+		settings.base_output_path = ""
+		settings.save()
+
+		generator = self.instantiate_type_generator()
+		with patch(
+			"frappe_types.frappe_types.paths.get_bench_root_path",
+			return_value=Path(TestTypeGeneratorUtils.temp_dir),
+		) as get_bench_root_path:
+			module_path = generator.paths.get_module_path(
+				TestTypeGeneratorUtils.app_name, TestTypeGeneratorUtils.module
+			)
+			for _ in range(3):
+				self.assertEqual(
+					generator.paths.get_module_path(
+						TestTypeGeneratorUtils.app_name, TestTypeGeneratorUtils.module
+					),
+					module_path,
+				)
+			map_path = generator.paths.get_doctype_map_path(TestTypeGeneratorUtils.app_name)
+
+		get_bench_root_path.assert_called_once()
+		self.assertEqual(map_path, Path(TestTypeGeneratorUtils.temp_dir) / "types")
+		self.assertEqual(module_path, map_path / to_ts_type(TestTypeGeneratorUtils.module))
+		self.assertTrue(module_path.is_dir())
+
+	def test_prune_orphaned_files(self):
+		generator = self.instantiate_type_generator()
+		generator.generate_module(TestTypeGeneratorUtils.module)
+
+		doctype_2_path = TestTypeGeneratorUtils.get_types_module_files_paths()[0]
+		self.assertTrue(os.path.exists(doctype_2_path))
+
+		frappe.flags.type_generator_disable_update = 1
+		frappe.delete_doc("DocType", TestTypeGeneratorUtils.test_doctype_name_2, force=True)
+		frappe.flags.type_generator_disable_update = 0
+
+		# Without --prune the orphaned file is kept
+		self.instantiate_type_generator().generate_module(TestTypeGeneratorUtils.module)
+		self.assertTrue(os.path.exists(doctype_2_path))
+
+		generator = TypeGenerator(app_name=TestTypeGeneratorUtils.app_name, prune=True)
+		generator.generate_module(TestTypeGeneratorUtils.module)
+		self.assertFalse(os.path.exists(doctype_2_path))
+		self.assertTrue(os.path.exists(self.generated_typescript_file_path))
+
+		manifest_path = os.path.join(
+			TestTypeGeneratorUtils.get_types_output_base_path(), ".frappe-types-manifest.json"
+		)
+		with open(manifest_path) as f:
+			manifest = json.load(f)
+		self.assertNotIn(TestTypeGeneratorUtils.test_doctype_name_2, json.dumps(manifest["files"]))
+
+	def test_prune_keeps_files_of_failed_modules(self):
+		TypeGenerator(app_name="").export_all_apps()
+		iter_doctype_batches = TypeGenerator._iter_doctype_batches
+
+		def fail_module(generator, filters, order_by, fields=None):
+			if filters == {"module": TestTypeGeneratorUtils.module}:
+				raise ValueError("Interrupted")
+			return iter_doctype_batches(generator, filters, order_by, fields)
+
+		with patch.object(TypeGenerator, "_iter_doctype_batches", autospec=True, side_effect=fail_module):
+			generator = TypeGenerator(app_name="", prune=True)
+			generator.export_all_apps()
+
+		# The module failed as a whole, so none of its files were produced, yet none is an orphan
+		self.assertEqual([name for name, _ in generator.report.failures], [TestTypeGeneratorUtils.module])
+		for file_path in TestTypeGeneratorUtils.get_all_apps_output_file_paths():
+			self.assertTrue(os.path.exists(file_path))
+
+	def test_delete_doctype_removes_types(self):
+		generator = self.instantiate_type_generator()
+		generator.generate_module(TestTypeGeneratorUtils.module)
+
+		doctype_2_path = TestTypeGeneratorUtils.get_types_module_files_paths()[0]
+		frappe.delete_doc("DocType", TestTypeGeneratorUtils.test_doctype_name_2, force=True)
+
+		self.assertFalse(os.path.exists(doctype_2_path))
+		map_path = os.path.join(TestTypeGeneratorUtils.get_types_output_base_path(), "DocTypeMap.d.ts")
+		with open(map_path) as f:
+			content = f.read()
+		self.assertNotIn(to_ts_type(TestTypeGeneratorUtils.test_doctype_name_2), content)
+		self.assertIn(f'"{self.doctype_name}": {to_ts_type(self.doctype_name)};', content)
+
+	def test_export_all_apps_resume(self):
+		failing_doctype = TestTypeGeneratorUtils.test_doctype_name_2
+		load_doctype = TypeGenerator._load_doctype
+
+		def interrupt_doctype_2(generator, doctype):
+			if doctype == failing_doctype:
+				raise ValueError("Interrupted")
+			return load_doctype(generator, doctype)
+
+		with patch.object(TypeGenerator, "_load_doctype", interrupt_doctype_2):
+			generator = TypeGenerator(app_name="")
+			generator.export_all_apps()
+
+		self.assertEqual([name for name, _ in generator.report.failures], [failing_doctype])
+		checkpoint_path = generator._get_checkpoint_path()
+		self.assertTrue(checkpoint_path.exists())
+
+		with patch.object(TypeGenerator, "generate_module") as generate_module:
+			generator = TypeGenerator(app_name="")
+			generator.export_all_apps(resume=True)
+
+		# Both modules were completed, only the DocType that failed is generated again
+		generate_module.assert_not_called()
+		self.assertFalse(generator.report.failures)
+		self.assertFalse(checkpoint_path.exists())
+		for file_path in TestTypeGeneratorUtils.get_all_apps_output_file_paths():
+			self.assertTrue(os.path.exists(file_path))
+
+		map_path = os.path.join(TestTypeGeneratorUtils.get_types_output_base_path(), "DocTypeMap.d.ts")
+		self._assert_doctype_map(
+			map_path,
+			[
+				TestTypeGeneratorUtils.test_doctype_name_2,
+				TestTypeGeneratorUtils.test_doctype_name,
+				TestTypeGeneratorUtils.doctype_child_name,
+			],
+		)
+
 	def _assert_doctype_map(
 		self, map_path: str, doctypes: list[str], module: str = TestTypeGeneratorUtils.module
 	):
@@ -203,11 +203,19 @@ class TestTypeGeneratorUtils:
 
 	@classmethod
 	def _cleanup_db(cls):
-		frappe.delete_doc("DocType", cls.test_doctype_name, force=True, delete_permanently=True)
-		frappe.delete_doc("DocType", cls.test_doctype_name_2, force=True, delete_permanently=True)
-		frappe.delete_doc("DocType", cls.doctype_child_name, force=True, delete_permanently=True)
-		frappe.delete_doc("DocType", cls.test_doctype_name_3, force=True, delete_permanently=True)
+		# Deleting the test DocTypes must not trigger the on_trash type generation hook
+		disable_update = frappe.flags.type_generator_disable_update
+		frappe.flags.type_generator_disable_update = 1
+		try:
+			frappe.delete_doc("DocType", cls.test_doctype_name, force=True, delete_permanently=True)
+			frappe.delete_doc("DocType", cls.test_doctype_name_2, force=True, delete_permanently=True)
+			frappe.delete_doc("DocType", cls.doctype_child_name, force=True, delete_permanently=True)
+			frappe.delete_doc("DocType", cls.test_doctype_name_3, force=True, delete_permanently=True)
+		finally:
+			frappe.flags.type_generator_disable_update = disable_update
 		frappe.db.delete("App Type Generation Paths")
+		frappe.db.delete("Custom Field", {"dt": ("like", f"{cls.test_doctype_name}%")})
+		frappe.db.delete("Property Setter", {"doc_type": ("like", f"{cls.test_doctype_name}%")})
 
 	@classmethod
 	def _prepare_temp_dir(cls):